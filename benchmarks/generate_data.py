@@ -0,0 +1,177 @@
+# benchmarks/generate_data.py
+"""Fill a database with synthetic cricket data at a chosen scale.
+
+--rows sets the size of player_stats (10^3 .. 10^7); the other tables are
+sized from it: one player per three stat rows (one per format), one match
+per ten stat rows, one series per fifty matches and one venue per hundred
+matches. Data is drawn from a seeded RNG, so the same arguments always
+produce the same database.
+
+    python benchmarks/generate_data.py --rows 1000000 --db bench_1e6.db
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.migrations import migrate
+
+CHUNK_SIZE = 50_000
+
+FORMATS = ("Test", "ODI", "T20")
+COUNTRIES = ("India", "Australia", "England", "New Zealand", "Pakistan", "South Africa",
+             "Sri Lanka", "West Indies", "Bangladesh", "Afghanistan", "Ireland", "Zimbabwe")
+ROLES = ("Batsman", "Bowler", "Allrounder", "Wicketkeeper")
+ROLE_WEIGHTS = (40, 35, 15, 10)
+BATTING_STYLES = ("Right-hand bat", "Left-hand bat")
+BOWLING_STYLES = (None, "Right-arm fast", "Right-arm medium", "Right-arm offbreak", "Right-arm legbreak",
+                  "Left-arm fast", "Left-arm orthodox")
+FIRST_NAMES = ("Aarav", "Ben", "Chris", "Dinesh", "Ethan", "Faf", "Glenn", "Hashim", "Imam", "Joe",
+               "Kane", "Liam", "Mitchell", "Nathan", "Ollie", "Pat", "Quinton", "Rohit", "Steve", "Tom")
+LAST_NAMES = ("Sharma", "Smith", "Root", "Williamson", "Khan", "Starc", "Taylor", "Singh", "Brown",
+              "Patel", "Perera", "Holder", "Hasan", "Rashid", "Stirling", "Raza", "Ali", "Boult")
+
+
+def _chunks(rows, size=CHUNK_SIZE):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _players(rng, count):
+    born_from = date(1975, 1, 1)
+    for i in range(count):
+        role = rng.choices(ROLES, ROLE_WEIGHTS)[0]
+        yield (
+            f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {i}",
+            role,
+            rng.choice(BATTING_STYLES),
+            None if role in ("Batsman", "Wicketkeeper") else rng.choice(BOWLING_STYLES[1:]),
+            rng.choice(COUNTRIES),
+            (born_from + timedelta(days=rng.randrange(365 * 30))).isoformat(),
+        )
+
+
+def _player_stats(rng, first_player_id, player_count, roles, count):
+    for i in range(count):
+        player_offset = i // len(FORMATS)
+        if player_offset >= player_count:
+            player_offset = rng.randrange(player_count)
+        fmt = FORMATS[i % len(FORMATS)]
+        role = roles[player_offset]
+        bats = role != "Bowler"
+        bowls = role in ("Bowler", "Allrounder")
+
+        matches = rng.randint(1, 250 if fmt == "ODI" else 150)
+        innings = max(1, int(matches * rng.uniform(0.6, 1.0)))
+        batting_avg = round(rng.uniform(20, 58) if bats else rng.uniform(3, 18), 2)
+        runs = int(batting_avg * innings * rng.uniform(0.7, 1.0))
+        strike_rate = round((rng.uniform(110, 190) if fmt == "T20" else rng.uniform(40, 110)) if bats
+                            else rng.uniform(30, 120), 2)
+        centuries = runs // 1500 if bats else 0
+        wickets = int(matches * rng.uniform(0.8, 2.2)) if bowls else rng.randint(0, 5)
+        yield (
+            first_player_id + player_offset,
+            fmt,
+            matches,
+            runs,
+            batting_avg,
+            strike_rate,
+            centuries,
+            runs // 400,
+            rng.randint(10, 264) if bats else rng.randint(0, 60),
+            int(runs * rng.uniform(0.002, 0.03)) if fmt != "Test" else int(runs * 0.004),
+            wickets,
+            round(rng.uniform(19, 40), 2) if wickets else 0,
+            round(rng.uniform(3.0, 9.5), 2) if bowls else None,
+            wickets // 25,
+            int(matches * rng.uniform(0.2, 1.5 if role == "Wicketkeeper" else 0.6)),
+        )
+
+
+def generate(db_path, rows, seed=42):
+    """Create db_path at the latest schema version and fill it; returns {table: rows added}"""
+    rng = random.Random(seed)
+    players = max(1, -(-rows // len(FORMATS)))
+    match_count = max(10, rows // 10)
+    series_count = max(3, match_count // 50)
+    venue_count = max(5, match_count // 100)
+
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    migrate(db_path)
+    conn = sqlite3.connect(db_path)
+    # Bulk load settings: the file is rebuilt from scratch if this is interrupted
+    conn.execute("PRAGMA journal_mode = OFF")
+    conn.execute("PRAGMA synchronous = OFF")
+
+    with conn:
+        conn.executemany(
+            "INSERT INTO venues (venue_name, city, country, capacity) VALUES (?, ?, ?, ?)",
+            ((f"Ground {i}", f"City {i % 97}", rng.choice(COUNTRIES), rng.randint(5_000, 100_000))
+             for i in range(venue_count)),
+        )
+        start = date(2000, 1, 1)
+        conn.executemany(
+            "INSERT INTO series (series_name, host_country, match_type, start_date, end_date, total_matches) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            ((f"Series {i}", rng.choice(COUNTRIES), rng.choice(FORMATS),
+              (start + timedelta(days=i % 9000)).isoformat(), (start + timedelta(days=i % 9000 + 40)).isoformat(),
+              rng.randint(1, 50)) for i in range(series_count)),
+        )
+
+    first_series = conn.execute("SELECT MIN(series_id) FROM series WHERE series_name LIKE 'Series %'").fetchone()[0]
+    first_venue = conn.execute("SELECT MIN(venue_id) FROM venues WHERE venue_name LIKE 'Ground %'").fetchone()[0]
+    matches = (
+        (first_series + rng.randrange(series_count), a, b, first_venue + rng.randrange(venue_count),
+         (start + timedelta(days=rng.randrange(9000))).isoformat(), f"Match {i}", f"{a} Win")
+        for i, (a, b) in enumerate((tuple(rng.sample(COUNTRIES, 2)) for _ in range(match_count)))
+    )
+    for chunk in _chunks(matches):
+        with conn:
+            conn.executemany(
+                "INSERT INTO matches (series_id, team1, team2, venue_id, match_date, match_desc, result) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)", chunk)
+
+    first_player = conn.execute("SELECT COALESCE(MAX(player_id), 0) + 1 FROM players").fetchone()[0]
+    roles = []
+    for chunk in _chunks(_players(rng, players)):
+        roles.extend(r[1] for r in chunk)
+        with conn:
+            conn.executemany(
+                "INSERT INTO players (full_name, playing_role, batting_style, bowling_style, country, date_of_birth) "
+                "VALUES (?, ?, ?, ?, ?, ?)", chunk)
+
+    for chunk in _chunks(_player_stats(rng, first_player, players, roles, rows)):
+        with conn:
+            conn.executemany(
+                "INSERT INTO player_stats (player_id, format, matches, total_runs, batting_avg, strike_rate, "
+                "centuries, fifties, highest_score, sixes, wickets, bowling_avg, economy, five_wkts, catches) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", chunk)
+
+    conn.execute("ANALYZE")
+    conn.close()
+    return {"player_stats": rows, "players": players, "matches": match_count,
+            "series": series_count, "venues": venue_count}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic cricbuzz database")
+    parser.add_argument("--rows", type=int, default=100_000, help="player_stats rows (10^3 .. 10^7)")
+    parser.add_argument("--db", default="bench.db", help="output database (overwritten)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    counts = generate(args.db, args.rows, args.seed)
+    print(f"✅ Generated {args.db} in {time.perf_counter() - started:.1f}s: {counts}")
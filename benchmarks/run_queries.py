@@ -0,0 +1,112 @@
+# benchmarks/run_queries.py
+"""Time the 25 SQL Analytics queries against a database and write JSON.
+
+For every query this records latency (min/median/p95 over --repeat runs),
+rows returned, SQLite VM steps, peak Python memory while fetching, and the
+query plan. rows_scanned_est adds up the row counts of every table the plan
+reads with a full SCAN; SQLite does not report exact rows visited.
+
+    python benchmarks/generate_data.py --rows 1000000 --db bench_1e6.db
+    python benchmarks/run_queries.py --db bench_1e6.db --out results_1e6.json
+"""
+import argparse
+import json
+import os
+import sqlite3
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.queries import QUERIES
+from utils.sql_guard import full_scans, query_plan
+
+# The progress handler fires once per this many VM instructions
+STEP_GRANULARITY = 1000
+
+
+def table_counts(conn):
+    tables = [r[0] for r in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'")]
+    return {t: conn.execute(f'SELECT COUNT(*) FROM "{t}"').fetchone()[0] for t in tables}
+
+
+def run_once(conn, sql):
+    """Execute sql once; returns (seconds, rows, vm_steps, peak_bytes)"""
+    steps = [0]
+
+    def count_steps():
+        steps[0] += STEP_GRANULARITY
+        return 0
+
+    conn.set_progress_handler(count_steps, STEP_GRANULARITY)
+    tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        rows = conn.execute(sql).fetchall()
+        elapsed = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        conn.set_progress_handler(None, 0)
+    return elapsed, len(rows), steps[0], peak
+
+
+def benchmark(db_path, repeat=5, only=None):
+    conn = sqlite3.connect(db_path)
+    counts = table_counts(conn)
+    results = {}
+    for name, sql in QUERIES.items():
+        if only and not any(name.startswith(f"{q}.") for q in only):
+            continue
+        sql = sql.strip().rstrip(";")
+        try:
+            plan = query_plan(conn, sql)
+            runs = [run_once(conn, sql) for _ in range(repeat)]
+        except sqlite3.Error as e:
+            results[name] = {"error": str(e)}
+            continue
+        latencies = sorted(r[0] for r in runs)
+        scans = full_scans(plan, sql)
+        results[name] = {
+            "latency_ms": {
+                "min": round(latencies[0] * 1000, 3),
+                "median": round(statistics.median(latencies) * 1000, 3),
+                "p95": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000, 3),
+            },
+            "rows_returned": runs[0][1],
+            "vm_steps": runs[0][2],
+            "peak_memory_bytes": max(r[3] for r in runs),
+            "full_scans": scans,
+            "rows_scanned_est": sum(counts.get(t, 0) for t in scans),
+            "plan": plan,
+        }
+    conn.close()
+    return {
+        "db": os.path.abspath(db_path),
+        "sqlite_version": sqlite3.sqlite_version,
+        "table_rows": counts,
+        "repeat": repeat,
+        "queries": results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the SQL Analytics queries")
+    parser.add_argument("--db", default="bench.db")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--only", nargs="*", help="query numbers to run, e.g. Q6 Q14")
+    parser.add_argument("--out", help="write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    report = benchmark(args.db, args.repeat, args.only)
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text)
+        total = sum(q.get("latency_ms", {}).get("median", 0) for q in report["queries"].values())
+        print(f"✅ Wrote {args.out}: {len(report['queries'])} queries, {total:.1f} ms total (median)")
+    else:
+        print(text)
@@ -0,0 +1,157 @@
+# benchmarks/startup_report.py
+"""Report how long main.py and each page take to start, and where the time goes.
+
+For every script this measures, each in a fresh interpreter so nothing is
+already imported:
+
+  import_s   the script's top-level imports under python -X importtime,
+             with the slowest top-level modules (cumulative) listed
+  render_s   time to first render: AppTest running the script once, cold
+
+Imports done lazily inside functions or branches are not in import_s; they
+show up in render_s only if the first render reaches them. Pages that call
+the API should be pointed at stub_server.py so network time does not swamp
+the numbers:
+
+    python stub_server.py --port 8765 &
+    CRICBUZZ_BASE_URL=http://127.0.0.1:8765 python benchmarks/startup_report.py --out startup.json
+    python benchmarks/startup_report.py --baseline startup.json   # exits 1 on a regression
+"""
+import argparse
+import ast
+import glob
+import json
+import os
+import re
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TOP_MODULES = 5
+RENDER_TIMEOUT = 60          # seconds AppTest may spend on one script
+REGRESSION_RATIO = 1.25      # slower than baseline by this factor ...
+REGRESSION_MIN_S = 0.05      # ... and by at least this many seconds
+
+IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+RENDER_CHILD = """
+import json, sys, time
+started = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+ready = time.perf_counter()
+at = AppTest.from_file(sys.argv[1], default_timeout=float(sys.argv[2])).run()
+print(json.dumps({"render_s": time.perf_counter() - ready, "harness_s": ready - started,
+                  "exceptions": [e.message for e in at.exception]}))
+"""
+
+
+def scripts():
+    return ["main.py"] + sorted(os.path.relpath(p, PROJECT_ROOT)
+                                for p in glob.glob(os.path.join(PROJECT_ROOT, "pages", "*.py")))
+
+
+def top_level_imports(script):
+    """Source of the script's module-level import statements"""
+    with open(os.path.join(PROJECT_ROOT, script), encoding="utf-8") as f:
+        source = f.read()
+    tree = ast.parse(source)
+    return "\n".join(ast.get_source_segment(source, node) for node in tree.body
+                     if isinstance(node, (ast.Import, ast.ImportFrom)))
+
+
+def import_times(code):
+    """(total seconds, [(module, cumulative seconds)] slowest first) for running code under -X importtime"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=PROJECT_ROOT,
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    total_us, top = 0, []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_RE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        total_us += int(self_us)
+        if len(indent) == 1:  # imported directly by the script, not by another module
+            top.append((module, int(cumulative_us) / 1e6))
+    top.sort(key=lambda item: item[1], reverse=True)
+    return total_us / 1e6, top
+
+
+def first_render(script):
+    result = subprocess.run([sys.executable, "-c", RENDER_CHILD, script, str(RENDER_TIMEOUT)],
+                            cwd=PROJECT_ROOT, capture_output=True, text=True, timeout=RENDER_TIMEOUT * 2)
+    lines = result.stdout.strip().splitlines()
+    if result.returncode != 0 or not lines:
+        raise RuntimeError((result.stderr.strip().splitlines() or ["no output"])[-1])
+    return json.loads(lines[-1])
+
+
+def report(only=None):
+    results = {}
+    for script in scripts():
+        if only and script not in only:
+            continue
+        entry = {}
+        try:
+            entry["import_s"], top = import_times(top_level_imports(script))
+            entry["slowest_imports"] = top[:TOP_MODULES]
+        except RuntimeError as e:
+            entry["import_error"] = str(e)
+        try:
+            entry.update(first_render(script))
+        except (RuntimeError, subprocess.TimeoutExpired) as e:
+            entry["render_error"] = str(e)
+        results[script] = entry
+    return results
+
+
+def regressions(results, baseline):
+    """[(script, metric, old, new)] for times that grew past the tolerance"""
+    found = []
+    for script, entry in results.items():
+        for metric in ("import_s", "render_s"):
+            old, new = baseline.get(script, {}).get(metric), entry.get(metric)
+            if old is None or new is None:
+                continue
+            if new > old * REGRESSION_RATIO and new - old > REGRESSION_MIN_S:
+                found.append((script, metric, old, new))
+    return found
+
+
+def print_report(results):
+    print(f"{'script':<28}{'import':>9}{'render':>9}  slowest imports")
+    for script, entry in results.items():
+        imports = f"{entry['import_s']:.3f}s" if "import_s" in entry else "error"
+        render = f"{entry['render_s']:.3f}s" if "render_s" in entry else "error"
+        slowest = ", ".join(f"{m} {s:.3f}s" for m, s in entry.get("slowest_imports", []))
+        print(f"{script:<28}{imports:>9}{render:>9}  {slowest}")
+        for key in ("import_error", "render_error"):
+            if key in entry:
+                print(f"    ❌ {key}: {entry[key]}")
+        for message in entry.get("exceptions", []):
+            print(f"    ❌ page raised: {message}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import-time and first-render report for the Streamlit app")
+    parser.add_argument("scripts", nargs="*", help="only these scripts, e.g. pages/4_SQL_Analytics.py")
+    parser.add_argument("--out", help="write the results as JSON")
+    parser.add_argument("--baseline", help="earlier --out file to compare against")
+    args = parser.parse_args()
+
+    results = report(set(args.scripts) or None)
+    print_report(results)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"✅ Wrote {args.out}")
+    if args.baseline:
+        with open(args.baseline) as f:
+            found = regressions(results, json.load(f))
+        for script, metric, old, new in found:
+            print(f"❌ {script} {metric}: {old:.3f}s -> {new:.3f}s")
+        if found:
+            sys.exit(1)
+        print("✅ No startup regressions against the baseline")
@@ -0,0 +1,37 @@
+# bulk_io.py
+"""Bulk import/export of players and player_stats from the command line.
+
+    python bulk_io.py import player_stats career_stats.csv
+    python bulk_io.py import players players.parquet
+    python bulk_io.py export player_stats stats.parquet
+"""
+import argparse
+import time
+
+from utils.bulk_io import NATURAL_KEYS, BulkLoadError, export_rows, import_rows
+from utils.db_connection import DB_PATH
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk load or dump players / player_stats")
+    parser.add_argument("action", choices=["import", "export"])
+    parser.add_argument("table", choices=list(NATURAL_KEYS))
+    parser.add_argument("path", help=".csv or .parquet file")
+    parser.add_argument("--format", choices=["csv", "parquet"], help="default: from the file extension")
+    parser.add_argument("--db", default=DB_PATH, help="SQLite database path")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    try:
+        if args.action == "import":
+            result = import_rows(args.table, args.path, args.format, args.db)
+            print(f"✅ {args.table}: {result['inserted']} inserted, {result['updated']} updated, "
+                  f"{result['rejected']} rejected in {time.perf_counter() - started:.1f}s")
+            for line_no, reason in result["rejects"]:
+                print(f"❌ line {line_no}: {reason}")
+        else:
+            fmt = args.format or ("parquet" if args.path.lower().endswith((".parquet", ".pq")) else "csv")
+            written = export_rows(args.table, args.path, fmt, args.db)
+            print(f"✅ Exported {written} {args.table} rows to {args.path} in {time.perf_counter() - started:.1f}s")
+    except (BulkLoadError, OSError) as e:
+        print(f"❌ {e}")
+        raise SystemExit(1)
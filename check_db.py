@@ -1,6 +1,8 @@
 import sqlite3
 
-conn = sqlite3.connect("cricbuzz.db")
+from utils.db_connection import DB_PATH
+
+conn = sqlite3.connect(DB_PATH)
 cursor = conn.cursor()
 
 cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
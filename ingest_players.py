@@ -0,0 +1,131 @@
+# ingest_players.py
+"""Refresh player profiles and career stats from the Cricbuzz API.
+
+Fetches the batting and bowling career of each player (plus the profile for
+players not yet in the database) concurrently at background priority, so
+the quota scheduler paces the run and keeps the reserve for live viewers.
+Players refreshed within --max-age hours are not fetched at all, and
+players whose career tables have not changed are not rewritten.
+
+    python ingest_players.py 1413 8733 576      # these Cricbuzz player ids
+    python ingest_players.py --file ids.txt     # one id per line
+    python ingest_players.py --all              # every linked player, oldest first (nightly cron)
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from utils.api_handler import PRIORITY_LOW, fetch_player_career, fetch_player_stats, get_quota_status
+from utils.db_connection import DB_PATH, open_connection
+from utils.migrations import ensure_migrated
+from utils.player_store import (
+    career_hash, linked_player_ids, mark_refreshed, parse_career, parse_profile, refresh_state, save_player,
+)
+from utils.quota import LOW_PRIORITY_RESERVE
+
+MAX_AGE_HOURS = 20    # skip players refreshed more recently than this
+MAX_WORKERS = 8
+
+
+def fetch_player(cricbuzz_id, need_profile):
+    """Fetch one player's payloads; returns (profile, batting, bowling), any of which may be None"""
+    profile = fetch_player_stats(cricbuzz_id, PRIORITY_LOW) if need_profile else None
+    batting = fetch_player_career(cricbuzz_id, "batting", PRIORITY_LOW)
+    bowling = fetch_player_career(cricbuzz_id, "bowling", PRIORITY_LOW)
+    return profile, batting, bowling
+
+
+def _budget_limit(due, state):
+    """Trim due to the players the remaining low-priority monthly budget can pay for"""
+    quota = get_quota_status()
+    calls_left = quota["remaining"] - int(quota["per_month"] * LOW_PRIORITY_RESERVE)
+    kept, calls = [], 0
+    for cricbuzz_id in due:
+        cost = 2 if cricbuzz_id in state else 3
+        if calls + cost > calls_left:
+            break
+        kept.append(cricbuzz_id)
+        calls += cost
+    return kept
+
+
+def ingest(cricbuzz_ids, db_path=DB_PATH, max_age_hours=MAX_AGE_HOURS, max_workers=MAX_WORKERS):
+    """Refresh the given players; returns counts of updated / unchanged / skipped / failed"""
+    ensure_migrated(db_path)
+    conn = open_connection(db_path)
+    counts = {"updated": 0, "unchanged": 0, "skipped": 0, "failed": 0}
+    try:
+        cricbuzz_ids = list(dict.fromkeys(int(i) for i in cricbuzz_ids))
+        state = refresh_state(conn, cricbuzz_ids)
+        fresh_after = time.time() - max_age_hours * 3600
+        due = [i for i in cricbuzz_ids if i not in state or state[i][1] < fresh_after]
+        due.sort(key=lambda i: state[i][1] if i in state else 0.0)
+        counts["skipped"] = len(cricbuzz_ids) - len(due)
+
+        affordable = _budget_limit(due, state)
+        if len(affordable) < len(due):
+            print(f"❌ API budget covers {len(affordable)} of {len(due)} due players; the rest wait for the next run")
+            counts["skipped"] += len(due) - len(affordable)
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="player-ingest") as executor:
+            futures = {executor.submit(fetch_player, i, i not in state): i for i in affordable}
+            # Fetches run concurrently; writes stay on this thread, one transaction per player
+            for future in as_completed(futures):
+                cricbuzz_id = futures[future]
+                profile, batting, bowling = future.result()
+                if batting is None or bowling is None:
+                    # A partial career would be stamped refreshed and then skipped for max_age_hours
+                    counts["failed"] += 1
+                    continue
+                content_hash = career_hash(batting, bowling)
+                known = state.get(cricbuzz_id)
+                try:
+                    if known is not None and known[2] == content_hash:
+                        with conn:
+                            mark_refreshed(conn, cricbuzz_id, known[0], content_hash)
+                        counts["unchanged"] += 1
+                        continue
+                    save_player(conn, cricbuzz_id, parse_profile(profile) if profile else None,
+                                parse_career(batting, bowling), content_hash)
+                    counts["updated"] += 1
+                except ValueError as e:
+                    print(f"❌ Player {cricbuzz_id}: {e}")
+                    counts["failed"] += 1
+    finally:
+        conn.close()
+    return counts
+
+
+def _read_ids(path):
+    with open(path) as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ingest Cricbuzz player profiles into player_stats")
+    parser.add_argument("ids", nargs="*", help="Cricbuzz player ids")
+    parser.add_argument("--file", help="file with one Cricbuzz player id per line")
+    parser.add_argument("--all", action="store_true", help="refresh every player already linked to Cricbuzz")
+    parser.add_argument("--max-age", type=float, default=MAX_AGE_HOURS,
+                        help="hours before a refreshed player is fetched again")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS)
+    parser.add_argument("--db", default=DB_PATH, help="SQLite database path")
+    args = parser.parse_args()
+
+    ids = list(args.ids)
+    if args.file:
+        ids += _read_ids(args.file)
+    if args.all:
+        ensure_migrated(args.db)
+        conn = open_connection(args.db)
+        try:
+            ids += linked_player_ids(conn)
+        finally:
+            conn.close()
+    if not ids:
+        parser.error("give player ids, --file or --all")
+
+    started = time.perf_counter()
+    counts = ingest(ids, args.db, args.max_age, args.workers)
+    print(f"✅ Players: {counts['updated']} updated, {counts['unchanged']} unchanged, "
+          f"{counts['skipped']} skipped, {counts['failed']} failed in {time.perf_counter() - started:.1f}s")
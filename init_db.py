@@ -1,28 +1,20 @@
-import sqlite3
-import os
+import sys
 
-DB_PATH = "cricbuzz.db"
-SCHEMA_FILE = "schema.sql"
-
-def init_db():
-    if not os.path.exists(SCHEMA_FILE):
-        print(f"❌ Schema file not found: {SCHEMA_FILE}")
-        return
-
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-
-    with open(SCHEMA_FILE, "r") as f:
-        sql_script = f.read()
+from utils.migrations import DB_PATH, migrate
 
+def init_db(db_path=DB_PATH):
+    """Create cricbuzz.db or upgrade it to the latest schema, keeping existing data"""
     try:
-        cursor.executescript(sql_script)
-        conn.commit()
-        print(f"✅ Database initialized successfully at {DB_PATH}")
+        applied = migrate(db_path)
     except Exception as e:
-        print(f"❌ Error while creating DB: {e}")
-    finally:
-        conn.close()
+        print(f"❌ Error while migrating DB: {e}")
+        return False
+
+    if applied:
+        print(f"✅ Applied migrations {', '.join(f'{v:04d}' for v in applied)} to {db_path}")
+    else:
+        print(f"✅ Database at {db_path} is already up to date")
+    return True
 
 if __name__ == "__main__":
-    init_db()
+    init_db(sys.argv[1] if len(sys.argv) > 1 else DB_PATH)
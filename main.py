@@ -1,14 +1,27 @@
 # main.py
 import streamlit as st
+from utils import metrics
 from utils.db_connection import test_connection
+from utils.migrations import ensure_migrated
+
+# Seconds a health-check result is reused, so reruns and new sessions skip the round trip
+HEALTH_CHECK_TTL = 60
 
 st.set_page_config(page_title="Cricbuzz LiveStats", layout="wide")
+render_timer = metrics.PageTimer("main")
+
+
+@st.cache_resource(ttl=HEALTH_CHECK_TTL, show_spinner=False)
+def database_ok():
+    """Bring the schema up to date, then test the DB connection (cached across sessions)"""
+    ensure_migrated()
+    return test_connection()
+
 
 st.title("🏏 Cricbuzz LiveStats")
 st.subheader("Real-Time Cricket Analytics Dashboard")
 
-# Test DB connection on app load
-if test_connection():
+if database_ok():
     st.success("✅ Database connected successfully!")
 else:
     st.error("❌ Database connection failed. Check logs.")
@@ -22,4 +35,7 @@ Welcome to **Cricbuzz LiveStats** – a cricket analytics dashboard powered by
 - 🏅 Player Statistics  
 - 🔍 SQL Analytics  
 - 🛠 CRUD Operations  
+- 🩺 Diagnostics  
 """)
+
+render_timer.done()
@@ -1,15 +1,9 @@
--- Cricbuzz Analytics Database Schema (Expanded with Sample Data)
-
-DROP TABLE IF EXISTS players;
-DROP TABLE IF EXISTS player_stats;
-DROP TABLE IF EXISTS matches;
-DROP TABLE IF EXISTS venues;
-DROP TABLE IF EXISTS series;
+-- 0001: Cricbuzz Analytics Database Schema (with Sample Data)
 
 -- ----------------
 -- Players Table
 -- ----------------
-CREATE TABLE players (
+CREATE TABLE IF NOT EXISTS players (
     player_id     INTEGER PRIMARY KEY AUTOINCREMENT,
     full_name     TEXT NOT NULL,
     playing_role  TEXT,
@@ -21,7 +15,7 @@ CREATE TABLE players (
 -- ----------------
 -- Player Stats Table
 -- ----------------
-CREATE TABLE player_stats (
+CREATE TABLE IF NOT EXISTS player_stats (
     stat_id       INTEGER PRIMARY KEY AUTOINCREMENT,
     player_id     INTEGER,
     format        TEXT CHECK(format IN ('Test','ODI','T20')),
@@ -38,7 +32,7 @@ CREATE TABLE player_stats (
 -- ----------------
 -- Venues Table
 -- ----------------
-CREATE TABLE venues (
+CREATE TABLE IF NOT EXISTS venues (
     venue_id   INTEGER PRIMARY KEY AUTOINCREMENT,
     venue_name TEXT NOT NULL,
     city       TEXT,
@@ -49,7 +43,7 @@ CREATE TABLE venues (
 -- ----------------
 -- Series Table
 -- ----------------
-CREATE TABLE series (
+CREATE TABLE IF NOT EXISTS series (
     series_id    INTEGER PRIMARY KEY AUTOINCREMENT,
     series_name  TEXT NOT NULL,
     host_country TEXT,
@@ -62,7 +56,7 @@ CREATE TABLE series (
 -- ----------------
 -- Matches Table
 -- ----------------
-CREATE TABLE matches (
+CREATE TABLE IF NOT EXISTS matches (
     match_id    INTEGER PRIMARY KEY AUTOINCREMENT,
     series_id   INTEGER,
     team1       TEXT NOT NULL,
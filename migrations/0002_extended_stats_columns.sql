@@ -0,0 +1,10 @@
+-- 0002: Columns used by the SQL Analytics queries and the CRUD forms
+
+ALTER TABLE players ADD COLUMN date_of_birth DATE;
+
+ALTER TABLE player_stats ADD COLUMN matches     INTEGER DEFAULT 0;
+ALTER TABLE player_stats ADD COLUMN strike_rate REAL;
+ALTER TABLE player_stats ADD COLUMN fifties     INTEGER DEFAULT 0;
+ALTER TABLE player_stats ADD COLUMN sixes       INTEGER DEFAULT 0;
+ALTER TABLE player_stats ADD COLUMN economy     REAL;
+ALTER TABLE player_stats ADD COLUMN catches     INTEGER DEFAULT 0;
@@ -0,0 +1,57 @@
+-- 0003: Live match snapshots written by poller.py, and the RapidAPI quota ledger
+-- (IF NOT EXISTS: older builds created these tables on the fly)
+
+CREATE TABLE IF NOT EXISTS live_matches (
+    match_id     INTEGER PRIMARY KEY,
+    series_name  TEXT,
+    team1        TEXT NOT NULL,
+    team2        TEXT NOT NULL,
+    match_desc   TEXT,
+    venue        TEXT,
+    match_format TEXT,
+    state        TEXT,
+    status       TEXT,
+    updated_at   REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS live_scorecards (
+    match_id   INTEGER PRIMARY KEY,
+    fetched_at REAL NOT NULL,
+    payload    TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS live_innings (
+    match_id   INTEGER NOT NULL,
+    innings_id INTEGER NOT NULL,
+    bat_team   TEXT,
+    runs       INTEGER,
+    wickets    INTEGER,
+    overs      REAL,
+    fetched_at REAL NOT NULL,
+    PRIMARY KEY (match_id, innings_id)
+);
+
+CREATE TABLE IF NOT EXISTS live_events (
+    event_id    INTEGER PRIMARY KEY,
+    match_id    INTEGER NOT NULL,
+    innings_id  INTEGER NOT NULL,
+    ball        INTEGER NOT NULL,
+    kind        TEXT NOT NULL,
+    player_id   TEXT,
+    player_name TEXT,
+    runs        INTEGER DEFAULT 0,
+    detail      TEXT,
+    recorded_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_live_events_match ON live_events (match_id, event_id);
+
+-- Last counter state per match, so each poll only diffs against the previous one
+CREATE TABLE IF NOT EXISTS live_event_state (
+    match_id INTEGER PRIMARY KEY,
+    state    TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS api_quota_ledger (
+    month TEXT PRIMARY KEY,
+    used  INTEGER NOT NULL DEFAULT 0
+);
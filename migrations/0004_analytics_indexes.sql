@@ -0,0 +1,33 @@
+-- 0004: Secondary indexes for the SQL Analytics access paths and joins
+
+-- Joins and per-player lookups
+CREATE INDEX IF NOT EXISTS idx_player_stats_player_format ON player_stats (player_id, format);
+
+-- Per-format leaderboards (Q6, Q7, Q19, Q20, Q22); player_id makes the join lookup index-only
+CREATE INDEX IF NOT EXISTS idx_player_stats_format_runs    ON player_stats (format, total_runs, player_id);
+CREATE INDEX IF NOT EXISTS idx_player_stats_format_wickets ON player_stats (format, wickets, player_id);
+CREATE INDEX IF NOT EXISTS idx_player_stats_format_sr      ON player_stats (format, strike_rate, player_id);
+CREATE INDEX IF NOT EXISTS idx_player_stats_format_sixes   ON player_stats (format, sixes, player_id);
+
+-- Per-format aggregates answered from the index alone (Q4, Q9, Q12)
+CREATE INDEX IF NOT EXISTS idx_player_stats_format_avg     ON player_stats (format, batting_avg);
+CREATE INDEX IF NOT EXISTS idx_player_stats_format_hs      ON player_stats (format, highest_score);
+CREATE INDEX IF NOT EXISTS idx_player_stats_format_economy ON player_stats (format, economy);
+
+-- Threshold filters and top-N across formats (Q3, Q10, Q11, Q13, Q17)
+CREATE INDEX IF NOT EXISTS idx_player_stats_centuries ON player_stats (centuries);
+CREATE INDEX IF NOT EXISTS idx_player_stats_matches   ON player_stats (matches);
+CREATE INDEX IF NOT EXISTS idx_player_stats_wickets   ON player_stats (wickets);
+CREATE INDEX IF NOT EXISTS idx_player_stats_fifties   ON player_stats (fifties);
+CREATE INDEX IF NOT EXISTS idx_player_stats_catches   ON player_stats (catches);
+
+-- Players by country / role / age (Q2, Q5, Q15, Q16, Q18)
+CREATE INDEX IF NOT EXISTS idx_players_country ON players (country);
+CREATE INDEX IF NOT EXISTS idx_players_role    ON players (playing_role);
+CREATE INDEX IF NOT EXISTS idx_players_dob     ON players (date_of_birth);
+
+-- Foreign keys
+CREATE INDEX IF NOT EXISTS idx_matches_series ON matches (series_id);
+CREATE INDEX IF NOT EXISTS idx_matches_venue  ON matches (venue_id);
+
+ANALYZE;
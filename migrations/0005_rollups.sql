@@ -0,0 +1,166 @@
+-- 0005: Rollup tables for the per-country and per-player aggregates
+-- (Q2, Q14, Q18, Q21, Q23, Q24, Q25), kept current by triggers so the
+-- dashboard reads O(groups) rows instead of re-aggregating player_stats.
+--
+-- player_stats -> player_totals  (one row per player_id, all formats)
+-- player_totals + players -> country_totals
+
+CREATE TABLE player_totals (
+    player_id INTEGER PRIMARY KEY,
+    runs      INTEGER NOT NULL DEFAULT 0,
+    wickets   INTEGER NOT NULL DEFAULT 0,
+    centuries INTEGER NOT NULL DEFAULT 0,
+    matches   INTEGER NOT NULL DEFAULT 0,
+    stat_rows INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX idx_player_totals_runs ON player_totals (runs);
+CREATE INDEX idx_player_totals_all_round ON player_totals (runs + wickets);
+
+CREATE TABLE country_totals (
+    country   TEXT PRIMARY KEY,
+    players   INTEGER NOT NULL DEFAULT 0,
+    runs      INTEGER NOT NULL DEFAULT 0,
+    wickets   INTEGER NOT NULL DEFAULT 0,
+    centuries INTEGER NOT NULL DEFAULT 0,
+    matches   INTEGER NOT NULL DEFAULT 0,
+    stat_rows INTEGER NOT NULL DEFAULT 0
+);
+
+-- ----------------
+-- Backfill
+-- ----------------
+INSERT INTO player_totals (player_id, runs, wickets, centuries, matches, stat_rows)
+SELECT player_id, COALESCE(SUM(total_runs), 0), COALESCE(SUM(wickets), 0),
+       COALESCE(SUM(centuries), 0), COALESCE(SUM(matches), 0), COUNT(*)
+FROM player_stats
+WHERE player_id IS NOT NULL
+GROUP BY player_id;
+
+INSERT OR IGNORE INTO player_totals (player_id) SELECT player_id FROM players;
+
+INSERT INTO country_totals (country, players, runs, wickets, centuries, matches, stat_rows)
+SELECT p.country, COUNT(*), SUM(t.runs), SUM(t.wickets), SUM(t.centuries), SUM(t.matches), SUM(t.stat_rows)
+FROM players p
+JOIN player_totals t ON t.player_id = p.player_id
+GROUP BY p.country;
+
+-- ----------------
+-- player_stats -> player_totals
+-- ----------------
+CREATE TRIGGER trg_player_stats_insert AFTER INSERT ON player_stats
+WHEN NEW.player_id IS NOT NULL
+BEGIN
+    INSERT OR IGNORE INTO player_totals (player_id) VALUES (NEW.player_id);
+    UPDATE player_totals SET
+        runs      = runs + COALESCE(NEW.total_runs, 0),
+        wickets   = wickets + COALESCE(NEW.wickets, 0),
+        centuries = centuries + COALESCE(NEW.centuries, 0),
+        matches   = matches + COALESCE(NEW.matches, 0),
+        stat_rows = stat_rows + 1
+    WHERE player_id = NEW.player_id;
+END;
+
+CREATE TRIGGER trg_player_stats_delete AFTER DELETE ON player_stats
+WHEN OLD.player_id IS NOT NULL
+BEGIN
+    UPDATE player_totals SET
+        runs      = runs - COALESCE(OLD.total_runs, 0),
+        wickets   = wickets - COALESCE(OLD.wickets, 0),
+        centuries = centuries - COALESCE(OLD.centuries, 0),
+        matches   = matches - COALESCE(OLD.matches, 0),
+        stat_rows = stat_rows - 1
+    WHERE player_id = OLD.player_id;
+END;
+
+CREATE TRIGGER trg_player_stats_update_old AFTER UPDATE OF player_id, total_runs, wickets, centuries, matches ON player_stats
+WHEN OLD.player_id IS NOT NULL
+BEGIN
+    UPDATE player_totals SET
+        runs      = runs - COALESCE(OLD.total_runs, 0),
+        wickets   = wickets - COALESCE(OLD.wickets, 0),
+        centuries = centuries - COALESCE(OLD.centuries, 0),
+        matches   = matches - COALESCE(OLD.matches, 0),
+        stat_rows = stat_rows - 1
+    WHERE player_id = OLD.player_id;
+END;
+
+CREATE TRIGGER trg_player_stats_update_new AFTER UPDATE OF player_id, total_runs, wickets, centuries, matches ON player_stats
+WHEN NEW.player_id IS NOT NULL
+BEGIN
+    INSERT OR IGNORE INTO player_totals (player_id) VALUES (NEW.player_id);
+    UPDATE player_totals SET
+        runs      = runs + COALESCE(NEW.total_runs, 0),
+        wickets   = wickets + COALESCE(NEW.wickets, 0),
+        centuries = centuries + COALESCE(NEW.centuries, 0),
+        matches   = matches + COALESCE(NEW.matches, 0),
+        stat_rows = stat_rows + 1
+    WHERE player_id = NEW.player_id;
+END;
+
+-- ----------------
+-- player_totals -> country_totals (stats of players with no players row count nowhere, like the JOIN)
+-- ----------------
+CREATE TRIGGER trg_player_totals_update AFTER UPDATE ON player_totals
+BEGIN
+    UPDATE country_totals SET
+        runs      = runs + NEW.runs - OLD.runs,
+        wickets   = wickets + NEW.wickets - OLD.wickets,
+        centuries = centuries + NEW.centuries - OLD.centuries,
+        matches   = matches + NEW.matches - OLD.matches,
+        stat_rows = stat_rows + NEW.stat_rows - OLD.stat_rows
+    WHERE country = (SELECT country FROM players WHERE player_id = NEW.player_id);
+END;
+
+-- ----------------
+-- players -> country_totals
+-- ----------------
+CREATE TRIGGER trg_players_insert AFTER INSERT ON players
+BEGIN
+    INSERT OR IGNORE INTO player_totals (player_id) VALUES (NEW.player_id);
+    INSERT OR IGNORE INTO country_totals (country) VALUES (NEW.country);
+    UPDATE country_totals SET
+        players   = players + 1,
+        runs      = runs + (SELECT runs FROM player_totals WHERE player_id = NEW.player_id),
+        wickets   = wickets + (SELECT wickets FROM player_totals WHERE player_id = NEW.player_id),
+        centuries = centuries + (SELECT centuries FROM player_totals WHERE player_id = NEW.player_id),
+        matches   = matches + (SELECT matches FROM player_totals WHERE player_id = NEW.player_id),
+        stat_rows = stat_rows + (SELECT stat_rows FROM player_totals WHERE player_id = NEW.player_id)
+    WHERE country = NEW.country;
+END;
+
+CREATE TRIGGER trg_players_delete AFTER DELETE ON players
+BEGIN
+    UPDATE country_totals SET
+        players   = players - 1,
+        runs      = runs - COALESCE((SELECT runs FROM player_totals WHERE player_id = OLD.player_id), 0),
+        wickets   = wickets - COALESCE((SELECT wickets FROM player_totals WHERE player_id = OLD.player_id), 0),
+        centuries = centuries - COALESCE((SELECT centuries FROM player_totals WHERE player_id = OLD.player_id), 0),
+        matches   = matches - COALESCE((SELECT matches FROM player_totals WHERE player_id = OLD.player_id), 0),
+        stat_rows = stat_rows - COALESCE((SELECT stat_rows FROM player_totals WHERE player_id = OLD.player_id), 0)
+    WHERE country = OLD.country;
+END;
+
+CREATE TRIGGER trg_players_update_country AFTER UPDATE OF country ON players
+WHEN OLD.country IS NOT NEW.country
+BEGIN
+    UPDATE country_totals SET
+        players   = players - 1,
+        runs      = runs - COALESCE((SELECT runs FROM player_totals WHERE player_id = OLD.player_id), 0),
+        wickets   = wickets - COALESCE((SELECT wickets FROM player_totals WHERE player_id = OLD.player_id), 0),
+        centuries = centuries - COALESCE((SELECT centuries FROM player_totals WHERE player_id = OLD.player_id), 0),
+        matches   = matches - COALESCE((SELECT matches FROM player_totals WHERE player_id = OLD.player_id), 0),
+        stat_rows = stat_rows - COALESCE((SELECT stat_rows FROM player_totals WHERE player_id = OLD.player_id), 0)
+    WHERE country = OLD.country;
+    INSERT OR IGNORE INTO country_totals (country) VALUES (NEW.country);
+    UPDATE country_totals SET
+        players   = players + 1,
+        runs      = runs + COALESCE((SELECT runs FROM player_totals WHERE player_id = NEW.player_id), 0),
+        wickets   = wickets + COALESCE((SELECT wickets FROM player_totals WHERE player_id = NEW.player_id), 0),
+        centuries = centuries + COALESCE((SELECT centuries FROM player_totals WHERE player_id = NEW.player_id), 0),
+        matches   = matches + COALESCE((SELECT matches FROM player_totals WHERE player_id = NEW.player_id), 0),
+        stat_rows = stat_rows + COALESCE((SELECT stat_rows FROM player_totals WHERE player_id = NEW.player_id), 0)
+    WHERE country = NEW.country;
+END;
+
+ANALYZE player_totals;
+ANALYZE country_totals;
@@ -0,0 +1,5 @@
+-- 0006: Lookup index for the natural key bulk imports upsert players on.
+-- (player_stats is keyed by (player_id, format), already covered by
+-- idx_player_stats_player_format.) Not UNIQUE: existing databases may
+-- already hold duplicates, which an import then updates together.
+CREATE INDEX IF NOT EXISTS idx_players_name_country ON players (full_name, country);
@@ -0,0 +1,13 @@
+-- 0007: Link players to their Cricbuzz profile id and track when each
+-- profile was last ingested (ingest_players.py).
+
+ALTER TABLE players ADD COLUMN cricbuzz_id INTEGER;
+CREATE UNIQUE INDEX IF NOT EXISTS idx_players_cricbuzz_id ON players (cricbuzz_id) WHERE cricbuzz_id IS NOT NULL;
+
+CREATE TABLE IF NOT EXISTS player_refresh (
+    cricbuzz_id  INTEGER PRIMARY KEY,
+    player_id    INTEGER NOT NULL,
+    refreshed_at REAL NOT NULL,   -- unix time of the last successful fetch
+    content_hash TEXT NOT NULL    -- of the career payloads, to skip unchanged players
+);
+CREATE INDEX IF NOT EXISTS idx_player_refresh_age ON player_refresh (refreshed_at);
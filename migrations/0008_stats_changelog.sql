@@ -0,0 +1,43 @@
+-- 0008: Change log of player_stats / players rows, so in-memory copies
+-- (utils/stats_engine.py) can catch up by reloading only what changed.
+-- Readers prune it; a reader that finds its position pruned reloads fully.
+
+CREATE TABLE IF NOT EXISTS stats_changelog (
+    seq        INTEGER PRIMARY KEY AUTOINCREMENT,
+    table_name TEXT NOT NULL,
+    row_id     INTEGER NOT NULL
+);
+
+CREATE TRIGGER trg_changelog_stats_insert AFTER INSERT ON player_stats
+BEGIN
+    INSERT INTO stats_changelog (table_name, row_id) VALUES ('player_stats', NEW.stat_id);
+END;
+
+CREATE TRIGGER trg_changelog_stats_update AFTER UPDATE ON player_stats
+BEGIN
+    INSERT INTO stats_changelog (table_name, row_id) VALUES ('player_stats', OLD.stat_id);
+    INSERT INTO stats_changelog (table_name, row_id)
+    SELECT 'player_stats', NEW.stat_id WHERE NEW.stat_id IS NOT OLD.stat_id;
+END;
+
+CREATE TRIGGER trg_changelog_stats_delete AFTER DELETE ON player_stats
+BEGIN
+    INSERT INTO stats_changelog (table_name, row_id) VALUES ('player_stats', OLD.stat_id);
+END;
+
+CREATE TRIGGER trg_changelog_players_insert AFTER INSERT ON players
+BEGIN
+    INSERT INTO stats_changelog (table_name, row_id) VALUES ('players', NEW.player_id);
+END;
+
+CREATE TRIGGER trg_changelog_players_update AFTER UPDATE OF player_id, full_name, country, playing_role ON players
+BEGIN
+    INSERT INTO stats_changelog (table_name, row_id) VALUES ('players', OLD.player_id);
+    INSERT INTO stats_changelog (table_name, row_id)
+    SELECT 'players', NEW.player_id WHERE NEW.player_id IS NOT OLD.player_id;
+END;
+
+CREATE TRIGGER trg_changelog_players_delete AFTER DELETE ON players
+BEGIN
+    INSERT INTO stats_changelog (table_name, row_id) VALUES ('players', OLD.player_id);
+END;
@@ -0,0 +1,4 @@
+-- 0009: Content hash of each stored scorecard, so readers can tell whether a
+-- snapshot changed without decoding its payload
+
+ALTER TABLE live_scorecards ADD COLUMN fingerprint TEXT;
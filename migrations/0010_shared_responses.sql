@@ -0,0 +1,16 @@
+-- 0010: API responses shared between app processes (utils/response_store.py):
+-- the latest body per cache key, and a short lease naming the one process
+-- currently fetching it
+
+CREATE TABLE IF NOT EXISTS api_responses (
+    cache_key   TEXT PRIMARY KEY,
+    stored_at   REAL NOT NULL,
+    fingerprint TEXT NOT NULL,
+    body        TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS api_leases (
+    cache_key  TEXT PRIMARY KEY,
+    owner      TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
@@ -0,0 +1,8 @@
+-- 0011: API calls per wall-clock minute, shared by every process using the
+-- database (utils/quota.py), so the plan's per-minute limit holds across
+-- Streamlit workers and the poller
+
+CREATE TABLE IF NOT EXISTS api_quota_minute (
+    minute INTEGER PRIMARY KEY,  -- unix time // 60
+    used   INTEGER NOT NULL
+);
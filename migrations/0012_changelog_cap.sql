@@ -0,0 +1,12 @@
+-- 0012: Keep stats_changelog bounded on the writer side, whether or not a
+-- stats engine is running to prune it: every 1000th entry deletes the ones
+-- more than 100000 behind it. An engine whose position was deleted reloads
+-- fully (utils/stats_engine.py). Bulk imports collapse their entries too.
+
+DELETE FROM stats_changelog WHERE seq <= (SELECT MAX(seq) FROM stats_changelog) - 100000;
+
+CREATE TRIGGER trg_changelog_cap AFTER INSERT ON stats_changelog
+WHEN NEW.seq % 1000 = 0
+BEGIN
+    DELETE FROM stats_changelog WHERE seq <= NEW.seq - 100000;
+END;
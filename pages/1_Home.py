@@ -1,5 +1,8 @@
 # pages/1_Home.py
 import streamlit as st
+from utils import metrics
+
+render_timer = metrics.PageTimer("home")
 
 st.title("Home Page")
 st.header("Welcome to Cricbuzz LiveStats")
@@ -23,3 +26,5 @@ Use the sidebar to navigate between pages.
 """)
 
 st.info("This is your Home Page. Other modules (Live Match, Player Stats, SQL Analytics, CRUD) will be added step by step.")
+
+render_timer.done()
@@ -1,10 +1,11 @@
 # pages/2_Live_Match.py
-import sys, os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 import streamlit as st
-import pandas as pd
+from utils import metrics
 from utils.api_handler import get_live_matches, get_match_score
+from utils.helpers import extract_live_matches
+from utils.scorecard_parser import parse_scorecard
+
+render_timer = metrics.PageTimer("player_stats")
 
 st.title("Live Matches")
 
@@ -19,24 +20,7 @@ else:
     if not type_matches:
         st.info("ℹ️ No live matches at the moment.")
     else:
-        # Collect live match list
-        live_match_list = []
-        for category in type_matches:
-            for match in category.get("seriesMatches", []):
-                series = match.get("seriesAdWrapper", {})
-                for m in series.get("matches", []):
-                    match_info = m.get("matchInfo", {})
-                    match_id = match_info.get("matchId")
-                    team1 = match_info.get("team1", {}).get("teamName")
-                    team2 = match_info.get("team2", {}).get("teamName")
-                    match_desc = match_info.get("matchDesc", "Unknown Match")
-                    venue = match_info.get("venueInfo", {}).get("ground", "Unknown Venue")
-
-                    if match_id and team1 and team2:
-                        live_match_list.append({
-                            "id": match_id,
-                            "desc": f"{team1} vs {team2} - {match_desc} @ {venue}"
-                        })
+        live_match_list = extract_live_matches(matches)
 
         if not live_match_list:
             st.info("ℹ️ No live matches available right now.")
@@ -55,73 +39,42 @@ else:
                 if not score_data:
                     st.error("❌ Could not fetch scorecard for this match.")
                 else:
+                    import pandas as pd  # only needed once there is a scorecard to tabulate
+
+                    card = parse_scorecard(score_data)
+
                     # Debug view
                     with st.expander("Raw API Response (Debug Mode)"):
                         st.json(score_data)
 
                     # Match summary
                     st.subheader("Match Summary")
-                    match_header = score_data.get("matchHeader") or score_data.get("matchInfo") or {}
-                    if match_header:
-                        st.write(match_header)
+                    if card.header:
+                        st.write(card.header)
                     else:
                         st.write("No match summary available.")
 
-                    # ✅ Get innings from "scorecard"
-                    innings = score_data.get("scorecard") or []
-
-                    if not innings:
+                    if not card.innings:
                         st.warning("⚠️ Full scorecard not available yet.")
-                        mini = score_data.get("matchInfo") or {}
-                        team1 = mini.get("team1", {}).get("teamName", "Team 1")
-                        team2 = mini.get("team2", {}).get("teamName", "Team 2")
-                        status = mini.get("status", "Status unavailable")
-
-                        st.markdown(f"### 🏏 {team1} vs {team2}")
-                        st.write(f"**Match Status:** {status}")
+                        st.markdown(f"### 🏏 {card.team1} vs {card.team2}")
+                        st.write(f"**Match Status:** {card.status}")
                     else:
                         # ✅ Full scorecard parsing
-                        for inn in innings:
-                            team_name = inn.get("batteamname") or f"Innings {inn.get('inningsid')}"
-                            st.markdown(f"### 🏏 {team_name}")
+                        for inn in card.innings:
+                            st.markdown(f"### 🏏 {inn.title}")
 
                             # Batting table
-                            batsmen = inn.get("batsman", [])
-                            if batsmen:
-                                bat_df = pd.DataFrame(batsmen)
-                                keep_cols = [c for c in ["name", "runs", "balls", "fours", "sixes", "strkrate"] if c in bat_df.columns]
-                                if keep_cols:
-                                    bat_df = bat_df[keep_cols]
-                                    bat_df = bat_df.rename(columns={
-                                        "name": "Batsman",
-                                        "runs": "Runs",
-                                        "balls": "Balls",
-                                        "fours": "4s",
-                                        "sixes": "6s",
-                                        "strkrate": "SR"
-                                    })
-                                    st.table(bat_df)
+                            if inn.batters:
+                                st.table(pd.DataFrame(inn.batting_table))
                             else:
                                 st.write("No batting data available.")
 
                             # ✅ Safe Bowling table
-                            bowlers = inn.get("bowler", [])
-                            if bowlers:
-                                bowl_df = pd.DataFrame(bowlers)
-                                keep_cols = [c for c in ["name", "overs", "runs", "wickets", "economyrate"] if c in bowl_df.columns]
-                                if keep_cols:
-                                    bowl_df = bowl_df[keep_cols]
-                                    bowl_df = bowl_df.rename(columns={
-                                        "name": "Bowler",
-                                        "overs": "Overs",
-                                        "runs": "Runs",
-                                        "wickets": "Wkts",
-                                        "economyrate": "Econ"
-                                    })
-                                    st.table(bowl_df)
-                                else:
-                                    st.write("No bowling stats available.")
+                            if inn.bowlers:
+                                st.table(pd.DataFrame(inn.bowling_table))
                             else:
                                 st.write("No bowling data available.")
 
                             st.markdown("---")
+
+render_timer.done()
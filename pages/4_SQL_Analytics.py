@@ -1,189 +1,53 @@
 # pages/4_SQL_Analytics.py
-import sys, os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 import streamlit as st
 import pandas as pd
-import sqlite3
-import matplotlib.pyplot as plt
+from utils.charts import bar_chart, pie_chart
+from utils import metrics
+from utils.db_connection import DB_PATH, read_sql
+from utils.migrations import ensure_migrated
+from utils.queries import QUERIES
+from utils.query_cache import get_cache
+from utils.sql_guard import MAX_ROWS, QueryRejected, full_scans, run_guarded
+from utils.stats_engine import NUMERIC_COLUMNS, SUMMABLE, get_engine
+
+render_timer = metrics.PageTimer("sql_analytics")
 
 # -------------------------
 # DB Connection
 # -------------------------
-DB_PATH = "cricbuzz.db"
+ensure_migrated(DB_PATH)
+query_cache = get_cache(DB_PATH)
+stats_engine = get_engine(DB_PATH)
 
-def run_query(query: str):
-    """Execute SQL query and return DataFrame"""
+def run_custom_query(query: str, show_plan: bool):
+    """Run user SQL read-only under the time/row budget; returns (DataFrame, plan)"""
     try:
-        conn = sqlite3.connect(DB_PATH)
-        df = pd.read_sql_query(query, conn)
-        conn.close()
-        return df
+        with metrics.timer("cricbuzz_query_seconds", query="custom"):
+            columns, rows, truncated, plan = run_guarded(query, with_plan=show_plan)
+    except QueryRejected as e:
+        metrics.inc("cricbuzz_query_errors_total", query="custom")
+        st.error(f"❌ {e}")
+        return pd.DataFrame(), None
     except Exception as e:
+        metrics.inc("cricbuzz_query_errors_total", query="custom")
         st.error(f"SQL Error: {e}")
-        return pd.DataFrame()
+        return pd.DataFrame(), None
+    if truncated:
+        st.info(f"Showing the first {MAX_ROWS:,} rows; add a LIMIT or narrow the query to see the rest.")
+    return pd.DataFrame.from_records(rows, columns=columns), plan
 
-# -------------------------
-# Predefined Queries (all 25 from Cricbuzz.pdf)
-# -------------------------
-queries = {
-    "Q1. List all players with their country and role": """
-        SELECT full_name, country, playing_role FROM players;
-    """,
-    "Q2. Total number of players per country": """
-        SELECT country, COUNT(*) AS total_players FROM players GROUP BY country ORDER BY total_players DESC;
-    """,
-    "Q3. Find players with more than 50 centuries": """
-        SELECT p.full_name, ps.centuries FROM player_stats ps
-        JOIN players p ON ps.player_id = p.player_id
-        WHERE ps.centuries > 50;
-    """,
-    "Q4. Average runs scored by players in ODI": """
-        SELECT AVG(batting_avg) AS avg_batting_average FROM player_stats WHERE format = 'ODI';
-    """,
-    "Q5. Count of players by role": """
-        SELECT playing_role, COUNT(*) AS player_count FROM players GROUP BY playing_role;
-    """,
-    "Q6. Top 10 ODI run scorers": """
-        SELECT p.full_name, ps.total_runs, ps.batting_avg, ps.centuries
-        FROM player_stats ps
-        JOIN players p ON p.player_id = ps.player_id
-        WHERE ps.format = 'ODI'
-        ORDER BY ps.total_runs DESC
-        LIMIT 10;
-    """,
-    "Q7. Top 10 wicket takers (ODI)": """
-        SELECT p.full_name, ps.wickets, ps.bowling_avg, ps.five_wkts
-        FROM player_stats ps
-        JOIN players p ON p.player_id = ps.player_id
-        WHERE ps.format = 'ODI'
-        ORDER BY ps.wickets DESC
-        LIMIT 10;
-    """,
-    "Q8. Players with strike rate above 150 in T20": """
-        SELECT p.full_name, ps.strike_rate
-        FROM player_stats ps
-        JOIN players p ON p.player_id = ps.player_id
-        WHERE ps.format = 'T20' AND ps.strike_rate > 150;
-    """,
-    "Q9. Highest individual score per format": """
-        SELECT format, MAX(highest_score) AS highest_score
-        FROM player_stats GROUP BY format;
-    """,
-    "Q10. Players who played in more than 200 matches": """
-        SELECT p.full_name, ps.matches
-        FROM player_stats ps
-        JOIN players p ON p.player_id = ps.player_id
-        WHERE ps.matches > 200;
-    """,
-    "Q11. Players with more than 400 wickets": """
-        SELECT p.full_name, ps.wickets
-        FROM player_stats ps
-        JOIN players p ON p.player_id = ps.player_id
-        WHERE ps.wickets > 400;
-    """,
-    "Q12. Average economy rate of bowlers in ODI": """
-        SELECT AVG(economy) AS avg_economy
-        FROM player_stats
-        WHERE format = 'ODI' AND economy IS NOT NULL;
-    """,
-    "Q13. Players with most fifties": """
-        SELECT p.full_name, ps.fifties
-        FROM player_stats ps
-        JOIN players p ON p.player_id = ps.player_id
-        ORDER BY ps.fifties DESC
-        LIMIT 10;
-    """,
-    "Q14. Country with most centuries by players": """
-        SELECT p.country, SUM(ps.centuries) AS total_centuries
-        FROM player_stats ps
-        JOIN players p ON ps.player_id = p.player_id
-        GROUP BY p.country
-        ORDER BY total_centuries DESC
-        LIMIT 5;
-    """,
-    "Q15. Youngest player in database": """
-        SELECT full_name, country, date_of_birth
-        FROM players
-        ORDER BY date_of_birth DESC
-        LIMIT 1;
-    """,
-    "Q16. Oldest player in database": """
-        SELECT full_name, country, date_of_birth
-        FROM players
-        ORDER BY date_of_birth ASC
-        LIMIT 1;
-    """,
-    "Q17. Players with more than 100 catches": """
-        SELECT p.full_name, ps.catches
-        FROM player_stats ps
-        JOIN players p ON ps.player_id = p.player_id
-        WHERE ps.catches > 100;
-    """,
-    "Q18. Countries with most players": """
-        SELECT country, COUNT(*) AS total_players
-        FROM players
-        GROUP BY country
-        ORDER BY total_players DESC
-        LIMIT 10;
-    """,
-    "Q19. Players with highest batting average in ODI (min 1000 runs)": """
-        SELECT p.full_name, ps.batting_avg
-        FROM player_stats ps
-        JOIN players p ON ps.player_id = p.player_id
-        WHERE ps.format = 'ODI' AND ps.total_runs > 1000
-        ORDER BY ps.batting_avg DESC
-        LIMIT 10;
-    """,
-    "Q20. Players with most sixes in T20": """
-        SELECT p.full_name, ps.sixes
-        FROM player_stats ps
-        JOIN players p ON ps.player_id = p.player_id
-        WHERE ps.format = 'T20'
-        ORDER BY ps.sixes DESC
-        LIMIT 10;
-    """,
-    "Q21. Country with highest number of wickets": """
-        SELECT p.country, SUM(ps.wickets) AS total_wickets
-        FROM player_stats ps
-        JOIN players p ON ps.player_id = p.player_id
-        GROUP BY p.country
-        ORDER BY total_wickets DESC
-        LIMIT 5;
-    """,
-    "Q22. Players with highest strike rate in ODI": """
-        SELECT p.full_name, ps.strike_rate
-        FROM player_stats ps
-        JOIN players p ON ps.player_id = p.player_id
-        WHERE ps.format = 'ODI'
-        ORDER BY ps.strike_rate DESC
-        LIMIT 10;
-    """,
-    "Q23. Total matches played by each country": """
-        SELECT p.country, SUM(ps.matches) AS total_matches
-        FROM player_stats ps
-        JOIN players p ON ps.player_id = p.player_id
-        GROUP BY p.country
-        ORDER BY total_matches DESC
-        LIMIT 10;
-    """,
-    "Q24. Players with more than 10,000 runs across formats": """
-        SELECT p.full_name, SUM(ps.total_runs) AS career_runs
-        FROM player_stats ps
-        JOIN players p ON ps.player_id = p.player_id
-        GROUP BY p.full_name
-        HAVING career_runs > 10000
-        ORDER BY career_runs DESC;
-    """,
-    "Q25. Top 10 all-rounders (runs + wickets)": """
-        SELECT p.full_name, SUM(ps.total_runs) AS runs, SUM(ps.wickets) AS wickets
-        FROM player_stats ps
-        JOIN players p ON ps.player_id = p.player_id
-        GROUP BY p.full_name
-        ORDER BY (SUM(ps.total_runs) + SUM(ps.wickets)) DESC
-        LIMIT 10;
-    """
-}
+def run_query(query: str, label: str):
+    """Execute SQL query and return DataFrame (cached until the database changes)"""
+    def execute():
+        with metrics.timer("cricbuzz_query_seconds", query=label):
+            return read_sql(query)
+
+    try:
+        return query_cache.get(query, (), execute)
+    except Exception as e:
+        metrics.inc("cricbuzz_query_errors_total", query=label)
+        st.error(f"SQL Error: {e}")
+        return pd.DataFrame()
 
 # -------------------------
 # Streamlit UI
@@ -191,12 +55,12 @@ queries = {
 st.title("SQL Analytics Dashboard")
 st.markdown("Run **25 Predefined SQL Queries** with **Charts + Tables** automatically.")
 
-query_choice = st.selectbox("Choose a predefined query:", ["-- Select --"] + list(queries.keys()))
+query_choice = st.selectbox("Choose a predefined query:", ["-- Select --"] + list(QUERIES.keys()))
 
 if query_choice != "-- Select --":
-    sql = queries[query_choice]
+    sql = QUERIES[query_choice]
     st.code(sql, language="sql")
-    result = run_query(sql)
+    result = run_query(sql, query_choice.split(".")[0])
 
     if not result.empty:
         st.subheader(" Query Result")
@@ -210,32 +74,66 @@ if query_choice != "-- Select --":
             x = cat_cols[0]
             y = num_cols[0]
             st.subheader("Visualization")
-            fig, ax = plt.subplots()
-            ax.bar(result[x], result[y], color="skyblue")
-            ax.set_ylabel(y)
-            ax.set_xlabel(x)
-            plt.xticks(rotation=45, ha="right")
-            st.pyplot(fig)
+            st.image(bar_chart(result, x, y))
 
         elif len(num_cols) == 1 and len(result) < 20:
             st.subheader("Pie Chart")
-            fig, ax = plt.subplots()
-            ax.pie(result[num_cols[0]], labels=result[cat_cols[0]] if len(cat_cols) > 0 else None, autopct="%1.1f%%")
-            ax.axis("equal")
-            st.pyplot(fig)
+            st.image(pie_chart(result, num_cols[0], cat_cols[0] if len(cat_cols) > 0 else None))
 
     else:
         st.warning("⚠️ No data returned for this query.")
 
 st.markdown("---")
 
+# Interactive Leaderboard (in-memory, no SQL per interaction)
+st.subheader("Interactive Leaderboard")
+snapshot = stats_engine.refresh()
+career = "All formats (career)"
+col1, col2, col3 = st.columns(3)
+board_format = col1.selectbox("Format", ["ODI", "Test", "T20", career])
+metric_options = [m for m in NUMERIC_COLUMNS + ("all_round",) if board_format != career or m in SUMMABLE]
+metric = col2.selectbox("Rank by", metric_options, index=metric_options.index("total_runs"))
+top_n = col3.number_input("Top", min_value=5, max_value=500, value=10, step=5)
+col4, col5, col6 = st.columns(3)
+countries = col4.multiselect("Country", sorted(c for c in snapshot.categories["country"] if c))
+roles = col5.multiselect("Role", sorted(r for r in snapshot.categories["playing_role"] if r))
+min_matches = col6.number_input("Min matches", min_value=0, value=0, step=10)
+
+board = stats_engine.top_k(
+    metric, int(top_n), None if board_format == career else board_format,
+    countries=countries, roles=roles, min_matches=min_matches or None,
+)
+st.dataframe(board, hide_index=True)
+st.caption(f"{len(snapshot):,} stat rows in memory")
+
+if board_format != career and not board.empty:
+    names = dict(zip(board["full_name"], board["player_id"]))
+    picked = st.multiselect("Compare players", list(names), max_selections=6)
+    if picked:
+        # all_round is a ranking of runs + wickets, not a column; compare its parts instead
+        ranked = ["total_runs", "wickets"] if metric == "all_round" else [metric]
+        compare_metrics = st.multiselect("Metrics", list(NUMERIC_COLUMNS),
+                                         default=list(dict.fromkeys(ranked + ["matches"])))
+        if compare_metrics:
+            st.dataframe(stats_engine.compare([names[n] for n in picked], compare_metrics, board_format),
+                         hide_index=True)
+
+st.markdown("---")
+
 # Custom Query
 st.subheader("Run Custom SQL")
 custom_sql = st.text_area("Enter your SQL query here:", height=150)
+show_plan = st.checkbox("Show query plan")
 
 if st.button("Run Custom Query"):
     if custom_sql.strip():
-        result = run_query(custom_sql)
+        result, plan = run_custom_query(custom_sql, show_plan)
+        if plan:
+            st.subheader("Query Plan")
+            st.code("\n".join(plan))
+            scans = full_scans(plan, custom_sql)
+            if scans:
+                st.warning(f"⚠️ Full table scan of: {', '.join(scans)}")
         if not result.empty:
             st.dataframe(result)
 
@@ -246,12 +144,11 @@ if st.button("Run Custom Query"):
                 x = cat_cols[0]
                 y = num_cols[0]
                 st.subheader(" Visualization")
-                fig, ax = plt.subplots()
-                ax.bar(result[x], result[y], color="orange")
-                plt.xticks(rotation=45, ha="right")
-                st.pyplot(fig)
+                st.image(bar_chart(result, x, y, color="orange", labels=False))
 
         else:
             st.warning("⚠️ No data returned for this query.")
     else:
         st.error("❌ Please enter a query before running.")
+
+render_timer.done()
@@ -1,42 +1,152 @@
 # pages/5_CRUD.py
-import sys, os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
+import io
 import streamlit as st
 import pandas as pd
 import sqlite3
+from utils import metrics
+from utils.bulk_io import BulkLoadError, export_rows, import_rows
+from utils.crud_batch import apply_changes, diff_rows
+from utils.db_connection import DB_PATH, connection, execute, read_sql
+from utils.migrations import ensure_migrated
+from utils.query_cache import invalidate
+from utils.table_browser import FILTER_OPS, PAGE_SIZE, browse, describe
+
+render_timer = metrics.PageTimer("crud")
 
-DB_PATH = "cricbuzz.db"
+ensure_migrated(DB_PATH)
 
 # -------------------------
 # Utility Functions
 # -------------------------
 def run_query(query, params=(), fetch=False):
+    # One label per statement kind (crud_insert, crud_update, ...) keeps the metric's series few
+    label = f"crud_{query.split(None, 1)[0].lower()}"
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute(query, params)
-        if fetch:
-            rows = cursor.fetchall()
-            cols = [col[0] for col in cursor.description]
-            conn.close()
-            return pd.DataFrame(rows, columns=cols)
-        else:
-            conn.commit()
-            conn.close()
-            return True
+        with metrics.timer("cricbuzz_query_seconds", query=label):
+            if fetch:
+                return read_sql(query, params)
+            execute(query, params)
+        # Analytics results cached before this write are now stale
+        invalidate(DB_PATH)
+        return True
     except Exception as e:
+        metrics.inc("cricbuzz_query_errors_total", query=label)
         st.error(f"❌ SQL Error: {e}")
         return pd.DataFrame() if fetch else False
 
+def _turn_page(table, step):
+    pages = st.session_state[f"{table}_pages"]
+    if step > 0 and st.session_state.get(f"{table}_next") is not None:
+        pages.append(st.session_state[f"{table}_next"])
+    elif step < 0 and len(pages) > 1:
+        pages.pop()
+
 def view_table(table):
-    df = run_query(f"SELECT * FROM {table} LIMIT 20;", fetch=True)
+    """Browse a table page by page with indexed sorting and filters; returns the page shown"""
+    with connection(DB_PATH) as conn:
+        info = describe(conn, table)
+    c1, c2, c3, c4, c5 = st.columns([2, 1, 2, 1, 2])
+    order_by = c1.selectbox("Sort by", info.sortable, key=f"{table}_order")
+    descending = c2.checkbox("Descending", key=f"{table}_desc")
+    filter_col = c3.selectbox("Filter", ["(none)"] + info.filterable, key=f"{table}_filter_col")
+    filter_op = c4.selectbox("Op", FILTER_OPS, key=f"{table}_filter_op")
+    filter_value = c5.text_input("Value", key=f"{table}_filter_value")
+    filters = [(filter_col, filter_op, filter_value)] if filter_col != "(none)" and filter_value else []
+
+    # Any change of sort or filter starts again from the first page
+    query = (order_by, descending, tuple(filters))
+    if st.session_state.get(f"{table}_query") != query:
+        st.session_state[f"{table}_query"] = query
+        st.session_state[f"{table}_pages"] = [None]
+    pages = st.session_state[f"{table}_pages"]
+
+    try:
+        columns, rows, next_cursor, approx_rows = browse(
+            table, order_by, descending, filters, cursor=pages[-1], page_size=PAGE_SIZE, db_path=DB_PATH)
+    except (ValueError, sqlite3.Error) as e:
+        st.error(f"❌ {e}")
+        return pd.DataFrame()
+    st.session_state[f"{table}_next"] = next_cursor
+
+    df = pd.DataFrame.from_records(rows, columns=columns)
     if not df.empty:
         st.dataframe(df)
     else:
         st.warning("⚠️ No records found.")
+    b1, b2, b3 = st.columns([1, 1, 4])
+    b1.button("◀ Previous", key=f"{table}_prev", disabled=len(pages) == 1, on_click=_turn_page, args=(table, -1))
+    b2.button("Next ▶", key=f"{table}_next_btn", disabled=next_cursor is None, on_click=_turn_page, args=(table, 1))
+    b3.caption(f"Page {len(pages)} · ≈ {approx_rows:,} rows in {table}")
     return df
 
+def batch_edit(table, df):
+    """Edit the current page as a grid; staged changes are previewed, then committed together"""
+    with st.expander("🧮 Batch Edit (current page)"):
+        if df.empty:
+            st.info("Nothing to edit on this page.")
+            return
+        pk = df.columns[0]
+        version = st.session_state.get(f"{table}_edit_version", 0)
+        edited = st.data_editor(df, num_rows="dynamic", disabled=[pk], hide_index=True,
+                                key=f"{table}_editor_{version}")
+        changes = diff_rows(pk, df.to_dict("records"), edited.to_dict("records"))
+        if not len(changes):
+            st.caption("Edit cells, add rows at the bottom or delete rows, then review and apply.")
+            return
+
+        st.markdown(f"**Pending:** {changes.summary()}")
+        if changes.inserts:
+            st.dataframe(pd.DataFrame(changes.inserts), hide_index=True)
+        if changes.updates:
+            st.dataframe(pd.DataFrame(
+                [{pk: row_id, "column": col, "old": str(old), "new": str(new)}
+                 for row_id, cols in changes.updates for col, (old, new) in cols.items()]), hide_index=True)
+        if changes.deletes:
+            st.write(f"Delete {pk}: {', '.join(map(str, changes.deletes))}")
+
+        c1, c2 = st.columns(2)
+        if c1.button(f"Apply {len(changes)} changes", key=f"{table}_apply_btn"):
+            try:
+                apply_changes(table, changes, DB_PATH)
+            except (ValueError, sqlite3.Error) as e:
+                st.error(f"❌ Nothing was saved: {e}")
+            else:
+                invalidate(DB_PATH)
+                st.session_state[f"{table}_edit_version"] = version + 1
+                st.success(f"✅ Applied {changes.summary()}")
+                st.rerun()
+        if c2.button("Discard", key=f"{table}_discard_btn"):
+            st.session_state[f"{table}_edit_version"] = version + 1
+            st.rerun()
+
+def bulk_panel(table):
+    """Import a CSV/Parquet file into table, or download the whole table"""
+    with st.expander("📦 Bulk Import / Export"):
+        upload = st.file_uploader("CSV or Parquet file", type=["csv", "parquet"], key=f"{table}_upload")
+        if upload is not None and st.button("Import", key=f"{table}_import_btn"):
+            try:
+                result = import_rows(table, upload, db_path=DB_PATH)
+            except (BulkLoadError, sqlite3.Error) as e:
+                st.error(f"❌ {e}")
+            else:
+                invalidate(DB_PATH)
+                st.success(f"✅ {result['inserted']} inserted, {result['updated']} updated, "
+                           f"{result['rejected']} rejected")
+                if result["rejects"]:
+                    st.dataframe(pd.DataFrame(result["rejects"], columns=["line", "reason"]))
+
+        fmt = st.radio("Export format", ["csv", "parquet"], horizontal=True, key=f"{table}_export_fmt")
+        if st.button("Prepare Export", key=f"{table}_export_btn"):
+            buffer = io.BytesIO()
+            try:
+                export_rows(table, buffer, fmt, DB_PATH)
+                st.session_state[f"{table}_export"] = (fmt, buffer.getvalue())
+            except BulkLoadError as e:
+                st.error(f"❌ {e}")
+        if f"{table}_export" in st.session_state:
+            fmt, data = st.session_state[f"{table}_export"]
+            st.download_button(f"Download {table}.{fmt}", data, file_name=f"{table}.{fmt}", key=f"{table}_download")
+
 # -------------------------
 # Streamlit UI
 # -------------------------
@@ -51,6 +161,8 @@ tab1, tab2, tab3, tab4, tab5 = st.tabs(
 with tab1:
     st.header(" Manage Players")
     df = view_table("players")
+    batch_edit("players", df)
+    bulk_panel("players")
 
     # Insert
     with st.expander("➕ Add Player"):
@@ -91,6 +203,8 @@ with tab1:
 with tab2:
     st.header("Manage Player Stats")
     df = view_table("player_stats")
+    batch_edit("player_stats", df)
+    bulk_panel("player_stats")
 
     with st.expander("➕ Add Player Stats"):
         player_id = st.number_input("Player ID", min_value=1, step=1, key="stats_player_id")
@@ -115,6 +229,7 @@ with tab2:
 with tab3:
     st.header("Manage Venues")
     df = view_table("venues")
+    batch_edit("venues", df)
 
     with st.expander("➕ Add Venue"):
         ground = st.text_input("Ground", key="venue_ground")
@@ -131,6 +246,7 @@ with tab3:
 with tab4:
     st.header("Manage Matches")
     df = view_table("matches")
+    batch_edit("matches", df)
 
     with st.expander("➕ Add Match"):
         series_id = st.number_input("Series ID", min_value=1, step=1, key="match_series_id")
@@ -152,6 +268,7 @@ with tab4:
 with tab5:
     st.header("Manage Series")
     df = view_table("series")
+    batch_edit("series", df)
 
     with st.expander("➕ Add Series"):
         series_name = st.text_input("Series Name", key="series_name")
@@ -164,3 +281,5 @@ with tab5:
                 (series_name, str(start_date), str(end_date)),
             )
             st.success("✅ Series added!")
+
+render_timer.done()
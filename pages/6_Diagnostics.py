@@ -0,0 +1,69 @@
+# pages/6_Diagnostics.py
+import streamlit as st
+from utils import metrics
+from utils.api_handler import get_fetch_stats, get_quota_status
+from utils.charts import cache_stats as chart_cache_stats
+from utils.db_connection import DB_PATH
+from utils.query_cache import get_cache
+
+render_timer = metrics.PageTimer("diagnostics")
+
+SECTIONS = {
+    "cricbuzz_api_request_seconds": ("API calls", "endpoint"),
+    "cricbuzz_query_seconds": ("SQL queries", "query"),
+    "cricbuzz_page_render_seconds": ("Page renders", "page"),
+}
+
+
+def latency_rows(name, label):
+    """One row per series of a histogram, with latencies in milliseconds"""
+    rows = []
+    for series, labels, count, total, p50, p99 in metrics.registry.histograms():
+        if series == name:
+            rows.append({
+                label: labels.get(label, ""),
+                "count": count,
+                "mean_ms": round(1000 * total / count, 1) if count else None,
+                "p50_ms": round(1000 * p50, 1),
+                "p99_ms": round(1000 * p99, 1),
+            })
+    return rows
+
+
+st.title("Diagnostics")
+st.caption("Metrics for this server process since it started; p50 / p99 are over the most recent "
+           f"{metrics.RECENT_SAMPLES} observations of each series.")
+
+for name, (title, label) in SECTIONS.items():
+    st.subheader(title)
+    rows = latency_rows(name, label)
+    if rows:
+        st.dataframe(rows, hide_index=True)
+    else:
+        st.write("No data yet.")
+
+st.subheader("Counters")
+counters = [{"metric": name, "labels": ", ".join(f"{k}={v}" for k, v in labels.items()), "value": value}
+            for name, labels, value in metrics.registry.counters()]
+if counters:
+    st.dataframe(counters, hide_index=True)
+else:
+    st.write("No data yet.")
+
+st.subheader("Caches and quota")
+c1, c2, c3, c4 = st.columns(4)
+c1.write("Query cache")
+c1.json(get_cache(DB_PATH).stats())
+c2.write("Chart cache")
+c2.json(chart_cache_stats())
+c3.write("API quota")
+c3.json(get_quota_status())
+c4.write("API fetch sharing")
+c4.json(get_fetch_stats())
+
+text = metrics.render()
+with st.expander("Prometheus text"):
+    st.code(text, language="text")
+st.download_button("Download metrics", text, file_name="cricbuzz_metrics.prom", mime="text/plain")
+
+render_timer.done()
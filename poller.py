@@ -0,0 +1,91 @@
+# poller.py
+"""Background ingestion daemon for live matches.
+
+Polls the Cricbuzz API on a schedule and stores the live match list and the
+latest scorecard of every live match in cricbuzz.db, so the Live Match page
+can read them locally instead of calling the API on every rerun.
+
+    python poller.py                 # run forever
+    python poller.py --once          # single poll, e.g. from cron
+"""
+import argparse
+import time
+
+from utils.api_handler import PRIORITY_LOW, fetch_live_matches, get_match_scores
+from utils.helpers import extract_live_matches
+from utils.live_store import (
+    DB_PATH, connect, record_events, save_live_matches, save_scorecard, stored_fingerprints, touch_scorecard,
+)
+
+MATCH_LIST_INTERVAL = 60  # seconds between match list refreshes
+SCORECARD_INTERVAL = 15   # seconds between scorecard refreshes
+
+
+def poll_match_list(conn):
+    """Refresh the live match list; returns it, or None if the API call failed"""
+    data = fetch_live_matches()
+    if data is None:
+        return None
+    live_match_list = extract_live_matches(data)
+    save_live_matches(conn, live_match_list)
+    return live_match_list
+
+
+def poll_scorecards(conn, live_match_list):
+    """Refresh the scorecard snapshot of every live match; returns (stored, unchanged) counts"""
+    results = get_match_scores([m["id"] for m in live_match_list], cached=False, priority=PRIORITY_LOW,
+                               versioned=True)
+    previous = stored_fingerprints(conn)
+    stored = unchanged = 0
+    for match_id, result in results.items():
+        if result is None:
+            continue
+        payload, fingerprint, changed = result
+        # Same scorecard as last poll (or as stored before a restart): only its freshness moves on
+        if (not changed or previous.get(int(match_id)) == fingerprint) and touch_scorecard(conn, match_id):
+            unchanged += 1
+            continue
+        save_scorecard(conn, match_id, payload, fingerprint)
+        record_events(conn, match_id, payload)
+        stored += 1
+    return stored, unchanged
+
+
+def run(db_path=DB_PATH, once=False, match_list_interval=MATCH_LIST_INTERVAL,
+        scorecard_interval=SCORECARD_INTERVAL):
+    conn = connect(db_path)
+
+    live_match_list = []
+    next_list_poll = 0.0
+    try:
+        while True:
+            started = time.monotonic()
+            if started >= next_list_poll:
+                polled = poll_match_list(conn)
+                if polled is not None:
+                    live_match_list = polled
+                next_list_poll = started + match_list_interval
+
+            stored, unchanged = poll_scorecards(conn, live_match_list)
+            print(f"✅ Polled {len(live_match_list)} live matches, stored {stored} scorecards "
+                  f"({unchanged} unchanged)")
+
+            if once:
+                break
+            time.sleep(max(0.0, scorecard_interval - (time.monotonic() - started)))
+    except KeyboardInterrupt:
+        print("Poller stopped")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Poll live matches into cricbuzz.db")
+    parser.add_argument("--db", default=DB_PATH, help="SQLite database path")
+    parser.add_argument("--once", action="store_true", help="poll once and exit")
+    parser.add_argument("--list-interval", type=float, default=MATCH_LIST_INTERVAL,
+                        help="seconds between match list refreshes")
+    parser.add_argument("--scorecard-interval", type=float, default=SCORECARD_INTERVAL,
+                        help="seconds between scorecard refreshes")
+    args = parser.parse_args()
+    run(args.db, args.once, args.list_interval, args.scorecard_interval)
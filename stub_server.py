@@ -0,0 +1,250 @@
+# stub_server.py
+"""Local stand-in for the Cricbuzz RapidAPI, for offline benchmarking.
+
+Serves the recorded JSON in fixtures/ for
+
+    /matches/v1/live                -> live_matches.json
+    /mcenter/v1/{id}/scard          -> scorecard_{id}.json
+    /stats/v1/player/{id}[/profile] -> player_{id}.json
+    /stats/v1/player/{id}/batting   -> player_{id}_batting.json (and bowling)
+
+with optional latency, error injection, ETag / 304 support and match progression: with
+--progress every scorecard request (or every --ball-interval seconds) moves
+the match on by one ball. Recorded frames in fixtures/progression/{id}/*.json
+are replayed in name order; without them balls are simulated from a seeded
+random generator so runs are reproducible.
+
+Point the app at it with
+
+    python stub_server.py --port 8765 --latency 0.15 --progress
+    CRICBUZZ_BASE_URL=http://127.0.0.1:8765 RAPIDAPI_PER_MINUTE=100000 streamlit run main.py
+"""
+import argparse
+import copy
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# (runs, is_wicket) outcomes a simulated ball is drawn from
+BALL_OUTCOMES = [(0, False)] * 8 + [(1, False)] * 6 + [(2, False)] * 2 + [(4, False)] * 2 + [(6, False), (0, True)]
+
+
+def _load_json(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _overs_to_balls(overs):
+    whole, _, part = str(overs or 0).partition(".")
+    return int(whole) * 6 + int(part[:1] or 0)
+
+
+def _balls_to_overs(balls):
+    return f"{balls // 6}.{balls % 6}" if balls % 6 else str(balls // 6)
+
+
+class MatchProgression:
+    """Advances one match's scorecard ball by ball"""
+
+    def __init__(self, match_id, fixtures_dir, seed):
+        self.match_id = match_id
+        frames_dir = os.path.join(fixtures_dir, "progression", str(match_id))
+        if os.path.isdir(frames_dir):
+            names = sorted(n for n in os.listdir(frames_dir) if n.endswith(".json"))
+            self.frames = [_load_json(os.path.join(frames_dir, n)) for n in names]
+        else:
+            self.frames = None
+        self.position = 0
+        self.scorecard = copy.deepcopy(_load_json(os.path.join(fixtures_dir, f"scorecard_{match_id}.json")))
+        self.rng = random.Random(f"{seed}:{match_id}")
+        self.next_batter_id = 900000
+
+    def current(self):
+        if self.frames:
+            return self.frames[min(self.position, len(self.frames) - 1)]
+        return self.scorecard
+
+    def advance(self):
+        self.position += 1
+        if not self.frames:
+            self._simulate_ball()
+
+    def _simulate_ball(self):
+        innings = (self.scorecard.get("scorecard") or [None])[-1]
+        if innings is None or innings.get("wickets", 0) >= 10:
+            return
+        batters = [b for b in innings["batsman"] if b.get("outdec") in ("batting", "not out", "")]
+        if not batters or not innings["bowler"]:
+            return
+        balls = _overs_to_balls(innings["overs"]) + 1
+        striker = batters[0]
+        bowler = innings["bowler"][(balls - 1) // 6 % len(innings["bowler"])]
+        runs, is_wicket = self.rng.choice(BALL_OUTCOMES)
+
+        striker["balls"] += 1
+        striker["runs"] += runs
+        striker["fours"] += runs == 4
+        striker["sixes"] += runs == 6
+        striker["strkrate"] = f"{100 * striker['runs'] / striker['balls']:.2f}"
+
+        bowler_balls = _overs_to_balls(bowler["overs"]) + 1
+        bowler["overs"] = _balls_to_overs(bowler_balls)
+        bowler["runs"] += runs
+        bowler["economy"] = f"{6 * bowler['runs'] / bowler_balls:.2f}"
+
+        innings["score"] += runs
+        innings["overs"] = _balls_to_overs(balls)
+        if is_wicket:
+            striker["outdec"] = f"b {bowler['name']}"
+            bowler["wickets"] += 1
+            innings["wickets"] += 1
+            if innings["wickets"] < 10:
+                self.next_batter_id += 1
+                innings["batsman"].append({
+                    "id": self.next_batter_id, "name": f"Batter {innings['wickets'] + 2}", "runs": 0, "balls": 0,
+                    "fours": 0, "sixes": 0, "strkrate": "0.00", "outdec": "batting",
+                })
+        elif runs % 2 == 1 and len(batters) > 1:
+            # Batters crossed: move the striker behind the non-striker
+            innings["batsman"].remove(striker)
+            innings["batsman"].append(striker)
+        self.scorecard["status"] = f"{innings['batteamname']} {innings['score']}-{innings['wickets']} ({innings['overs']})"
+
+
+class StubState:
+    def __init__(self, args):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.lock = threading.Lock()
+        self.progressions = {}
+        self.last_tick = time.monotonic()
+        self.requests = 0
+
+    def scorecard(self, match_id):
+        path = os.path.join(self.args.fixtures, f"scorecard_{match_id}.json")
+        if not os.path.exists(path):
+            return None
+        if not self.args.progress:
+            return _load_json(path)
+        with self.lock:
+            prog = self.progressions.get(match_id)
+            if prog is None:
+                prog = self.progressions[match_id] = MatchProgression(match_id, self.args.fixtures, self.args.seed)
+            if self.args.ball_interval <= 0:
+                prog.advance()
+            else:
+                now = time.monotonic()
+                while now - self.last_tick >= self.args.ball_interval:
+                    for p in self.progressions.values():
+                        p.advance()
+                    self.last_tick += self.args.ball_interval
+            return copy.deepcopy(prog.current())
+
+
+ROUTES = [
+    (re.compile(r"^/matches/v1/live$"), lambda state, m: _fixture(state, "live_matches.json")),
+    (re.compile(r"^/mcenter/v1/(\d+)/scard$"), lambda state, m: state.scorecard(m.group(1))),
+    (re.compile(r"^/stats/v1/player/(\d+)(?:/profile)?$"), lambda state, m: _fixture(state, f"player_{m.group(1)}.json")),
+    (re.compile(r"^/stats/v1/player/(\d+)/(batting|bowling)$"),
+     lambda state, m: _fixture(state, f"player_{m.group(1)}_{m.group(2)}.json")),
+]
+
+
+def _fixture(state, name):
+    path = os.path.join(state.args.fixtures, name)
+    return _load_json(path) if os.path.exists(path) else None
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+    state = None
+
+    def do_GET(self):
+        state = self.state
+        args = state.args
+        with state.lock:
+            state.requests += 1
+            roll = state.rng.random()
+            delay = max(0.0, args.latency + state.rng.uniform(-args.jitter, args.jitter))
+        if delay:
+            time.sleep(delay)
+
+        if roll < args.error_rate:
+            return self._send(state.rng.choice([429, 500, 503]), {"message": "injected error"})
+
+        path = self.path.split("?", 1)[0]
+        for pattern, handler in ROUTES:
+            match = pattern.match(path)
+            if match:
+                body = handler(state, match)
+                if body is None:
+                    return self._send(404, {"message": "no fixture"})
+                return self._send(200, body)
+        return self._send(404, {"message": f"unknown endpoint {path}"})
+
+    def _send(self, status, body):
+        data = json.dumps(body).encode()
+        etag = None
+        if status == 200 and self.state.args.etag:
+            etag = '"' + hashlib.blake2b(data, digest_size=8).hexdigest() + '"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        if etag:
+            self.send_header("ETag", etag)
+        if status == 429:
+            self.send_header("Retry-After", "1")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        if self.state.args.verbose:
+            super().log_message(format, *args)
+
+
+def make_server(args):
+    handler = type("Handler", (StubHandler,), {"state": StubState(args)})
+    return ThreadingHTTPServer((args.host, args.port), handler)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Serve recorded Cricbuzz API fixtures locally")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fixtures", default=FIXTURES_DIR, help="directory with the recorded JSON")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="± seconds of random latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered 429/5xx")
+    parser.add_argument("--progress", action="store_true", help="advance scorecards ball by ball")
+    parser.add_argument("--ball-interval", type=float, default=0.0,
+                        help="seconds per ball with --progress (0 = one ball per scorecard request)")
+    parser.add_argument("--etag", action="store_true",
+                        help="send ETags and answer matching If-None-Match with 304")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    server = make_server(args)
+    print(f"✅ Cricbuzz stub serving {args.fixtures} on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("Stub server stopped")
+    finally:
+        server.server_close()
@@ -0,0 +1,19 @@
+# tests/conftest.py
+import os
+import sys
+
+import pytest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+
+@pytest.fixture
+def migrated_db(tmp_path):
+    """Path of a fresh database with every migration applied"""
+    from utils.migrations import migrate
+
+    path = str(tmp_path / "test.db")
+    migrate(path)
+    return path
@@ -0,0 +1,65 @@
+# tests/test_ball_events.py
+from utils.ball_events import diff_states, overs_to_balls
+
+
+def state(total, bat=None, bowl=None):
+    return {"1": {"total": list(total), "bat": bat or {}, "bowl": bowl or {}}}
+
+
+def kinds(events, kind):
+    return [e for e in events if e[2] == kind]
+
+
+def test_overs_to_balls():
+    assert overs_to_balls("12.3") == 75
+    assert overs_to_balls(0) == 0
+    assert overs_to_balls(None) == 0
+    assert overs_to_balls("bad") == 0
+
+
+def test_first_poll_numbers_balls_from_one():
+    events = diff_states(None, state([5, 0, 3], bowl={"b1": ["Bowler", 3, 5, 0]}))
+    balls = kinds(events, "ball")
+    assert [e[1] for e in balls] == [1, 2, 3]
+    assert [e[6] for e in balls] == ["bowler ball 1", "bowler ball 2", "bowler ball 3"]
+    assert kinds(events, "extras") == [("1", 3, "extras", None, None, 5, "total")]
+
+
+def test_new_balls_use_the_innings_ball_count():
+    prev = state([70, 2, 78], bat={"a": ["A", 30, 20, 2, 0, ""]}, bowl={"x": ["X", 24, 30, 1]})
+    curr = state([74, 2, 80], bat={"a": ["A", 34, 22, 3, 0, ""]}, bowl={"x": ["X", 26, 34, 1]})
+    events = diff_states(prev, curr)
+    balls = kinds(events, "ball")
+    # Innings balls 79 and 80, which were the bowler's 25th and 26th
+    assert [(e[1], e[6]) for e in balls] == [(79, "bowler ball 25"), (80, "bowler ball 26")]
+    assert kinds(events, "runs") == [("1", 80, "runs", "a", "A", 4, "2b 1x4 0x6")]
+    assert all(e[1] <= 80 for e in events)
+
+
+def test_bowler_change_orders_the_finished_over_first():
+    prev = state([0, 0, 10], bowl={"x": ["X", 10, 0, 0], "y": ["Y", 0, 0, 0]})
+    # x completed the over (12 balls), then y bowled two
+    curr = state([0, 0, 14], bowl={"y": ["Y", 2, 0, 0], "x": ["X", 12, 0, 0]})
+    balls = kinds(diff_states(prev, curr), "ball")
+    assert [(e[1], e[3]) for e in balls] == [(11, "x"), (12, "x"), (13, "y"), (14, "y")]
+
+
+def test_wicket_recorded_once():
+    prev = state([50, 1, 40], bat={"a": ["A", 20, 15, 2, 0, ""]})
+    curr = state([50, 2, 41], bat={"a": ["A", 20, 16, 2, 0, "c B b X"]})
+    events = diff_states(prev, curr)
+    assert kinds(events, "wicket") == [("1", 41, "wicket", "a", "A", 0, "c B b X")]
+    assert kinds(diff_states(curr, curr), "wicket") == []
+
+
+def test_nothing_changed_yields_no_events():
+    s = state([10, 0, 6], bat={"a": ["A", 10, 6, 1, 0, ""]}, bowl={"x": ["X", 6, 10, 0]})
+    assert diff_states(s, s) == []
+
+
+def test_counters_going_backwards_are_corrections():
+    prev = state([20, 0, 12], bat={"a": ["A", 20, 12, 2, 0, ""]}, bowl={"x": ["X", 12, 20, 0]})
+    curr = state([16, 0, 12], bat={"a": ["A", 16, 12, 1, 0, ""]}, bowl={"x": ["X", 12, 16, 0]})
+    corrections = kinds(diff_states(prev, curr), "correction")
+    assert ("1", 12, "correction", "x", "X", -4, "bowler") in corrections
+    assert ("1", 12, "correction", "a", "A", -4, "batter") in corrections
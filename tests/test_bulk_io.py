@@ -0,0 +1,106 @@
+# tests/test_bulk_io.py
+import io
+import sqlite3
+
+import pytest
+
+from utils import bulk_io
+from utils.bulk_io import BulkLoadError, import_rows
+
+
+def csv_file(text):
+    return io.BytesIO(text.strip().encode())
+
+
+def query(db_path, sql, params=()):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+
+
+def indexes(db_path, table):
+    return sorted(query(db_path, "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ?", (table,)))
+
+
+def test_players_upsert_on_name_and_country(migrated_db):
+    result = import_rows("players", csv_file("""
+full_name,country,playing_role
+Virat Kohli,India,Captain
+New Player,Nepal,Bowler
+"""), db_path=migrated_db)
+    assert (result["inserted"], result["updated"], result["rejected"]) == (1, 1, 0)
+    assert query(migrated_db, "SELECT playing_role FROM players WHERE full_name = 'Virat Kohli'") == [("Captain",)]
+    assert query(migrated_db, "SELECT country FROM players WHERE full_name = 'New Player'") == [("Nepal",)]
+
+
+def test_player_stats_upsert_on_player_and_format(migrated_db):
+    before = query(migrated_db, "SELECT COUNT(*) FROM player_stats")[0][0]
+    source = """
+player_id,format,total_runs,batting_avg
+1,ODI,13100,58.5
+1,T20,4000,
+1,T20,4100,52.0
+"""
+    result = import_rows("player_stats", csv_file(source), db_path=migrated_db)
+    # The file repeats (1, T20): the later line wins
+    assert (result["inserted"], result["updated"]) == (1, 1)
+    assert query(migrated_db, "SELECT format, total_runs, batting_avg FROM player_stats WHERE player_id = 1 "
+                              "ORDER BY format") == [("ODI", 13100, 58.5), ("T20", 4100, 52.0)]
+
+    # Importing the same file again only updates
+    result = import_rows("player_stats", csv_file(source), db_path=migrated_db)
+    assert (result["inserted"], result["updated"]) == (0, 2)
+    assert query(migrated_db, "SELECT COUNT(*) FROM player_stats")[0][0] == before + 1
+
+
+def test_bad_rows_are_rejected_with_their_line(migrated_db):
+    result = import_rows("player_stats", csv_file("""
+player_id,format,total_runs,centuries
+2,Test,4000,12.0
+2,ODI,abc,1
+2,T10,10,0
+2,T20,12.7,0
+3,T20,3000
+"""), db_path=migrated_db)
+    assert (result["inserted"], result["updated"], result["rejected"]) == (1, 0, 4)
+    lines = dict(result["rejects"])
+    assert lines[3] == "total_runs: 'abc' is not a valid INTEGER"
+    assert lines[4].startswith("format must be one of")
+    # A fractional value in an INTEGER column is a bad row, not truncated
+    assert lines[5] == "total_runs: '12.7' is not a valid INTEGER"
+    assert lines[6] == "expected 4 values, got 3"
+    assert query(migrated_db, "SELECT centuries FROM player_stats WHERE player_id = 2 AND format = 'Test'") == [(12,)]
+
+
+def test_missing_required_column_loads_nothing(migrated_db):
+    with pytest.raises(BulkLoadError):
+        import_rows("players", csv_file("full_name\nSomeone"), db_path=migrated_db)
+    with pytest.raises(BulkLoadError):
+        import_rows("matches", csv_file("match_id\n1"), db_path=migrated_db)
+    assert query(migrated_db, "SELECT COUNT(*) FROM players WHERE full_name = 'Someone'") == [(0,)]
+
+
+def test_large_load_rebuilds_the_secondary_indexes(migrated_db, monkeypatch):
+    before = indexes(migrated_db, "player_stats")
+    dropped = []
+    drop = bulk_io._drop_secondary_indexes
+
+    def recording_drop(*args):
+        dropped.extend(drop(*args))
+        return dropped
+
+    monkeypatch.setattr(bulk_io, "INDEX_REBUILD_MIN_ROWS", 10)
+    monkeypatch.setattr(bulk_io, "_drop_secondary_indexes", recording_drop)
+
+    rows = "\n".join(f"{player_id},{fmt},{player_id * 100},{player_id % 3}"
+                     for player_id in range(1, 21) for fmt in ("Test", "ODI", "T20"))
+    result = import_rows("player_stats", csv_file("player_id,format,total_runs,wickets\n" + rows),
+                         db_path=migrated_db)
+    assert result["inserted"] + result["updated"] == 60
+    # Every index but the (player_id, format) key lookup was dropped and built again
+    assert dropped and all("idx_player_stats_player_format" not in sql for sql in dropped)
+    assert indexes(migrated_db, "player_stats") == before
+    assert query(migrated_db, "PRAGMA integrity_check") == [("ok",)]
+    assert query(migrated_db, "SELECT total_runs FROM player_stats WHERE player_id = 7 AND format = 'T20'") == [(700,)]
@@ -0,0 +1,89 @@
+# tests/test_crud_batch.py
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from utils.crud_batch import ChangeSet, apply_changes, diff_rows
+
+ORIGINAL = [
+    {"player_id": 1, "full_name": "A", "country": "India", "playing_role": "Batsman"},
+    {"player_id": 2, "full_name": "B", "country": "India", "playing_role": None},
+    {"player_id": 3, "full_name": "C", "country": "Nepal", "playing_role": "Bowler"},
+]
+
+
+def players(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute("SELECT player_id, full_name, country, playing_role FROM players ORDER BY player_id").fetchall()
+    finally:
+        conn.close()
+
+
+def test_diff_detects_inserts_updates_and_deletes():
+    edited = [
+        {"player_id": 1, "full_name": "A", "country": "India", "playing_role": "Captain"},
+        {"player_id": 3, "full_name": "C", "country": "Nepal", "playing_role": "Bowler"},
+        {"player_id": None, "full_name": "D", "country": "Oman", "playing_role": None},
+        {"player_id": None, "full_name": None, "country": None, "playing_role": None},
+    ]
+    changes = diff_rows("player_id", ORIGINAL, edited)
+    assert changes.inserts == [{"full_name": "D", "country": "Oman"}]
+    assert changes.updates == [(1, {"playing_role": ("Batsman", "Captain")})]
+    assert changes.deletes == [2]
+    assert len(changes) == 3
+    assert changes.summary() == "1 inserts, 1 updates, 1 deletes"
+
+
+def test_diff_of_an_edited_grid_ignores_nan_and_float_ids():
+    df = pd.DataFrame(ORIGINAL)
+    edited = pd.concat([df, pd.DataFrame([{"full_name": "D", "country": "Oman"}])], ignore_index=True)
+    # The added row turns player_id into floats and the empty cells into NaN
+    assert edited["player_id"].dtype == float
+    changes = diff_rows("player_id", df.to_dict("records"), edited.to_dict("records"))
+    assert changes.inserts == [{"full_name": "D", "country": "Oman"}]
+    assert changes.updates == [] and changes.deletes == []
+
+
+def test_unchanged_page_has_no_changes():
+    assert len(diff_rows("player_id", ORIGINAL, [dict(row) for row in ORIGINAL])) == 0
+
+
+def test_apply_writes_the_whole_batch(migrated_db):
+    before = players(migrated_db)
+    changes = ChangeSet(
+        inserts=[
+            {"full_name": "New One", "country": "Oman"},
+            {"full_name": "New Two", "country": "Oman", "playing_role": "Bowler"},
+        ],
+        updates=[(1, {"playing_role": ("Batsman", "Captain")}), (2, {"country": ("India", "Bharat")})],
+        deletes=[3],
+    )
+    assert apply_changes("players", changes, migrated_db) == 5
+    after = {row[0]: row for row in players(migrated_db)}
+    assert after[1][3] == "Captain" and after[2][2] == "Bharat"
+    assert 3 not in after
+    assert [row[1:] for row in players(migrated_db) if row[1].startswith("New")] == [
+        ("New One", "Oman", None), ("New Two", "Oman", "Bowler")]
+    assert len(after) == len(before) + 1
+
+
+def test_a_failing_row_rolls_back_the_whole_batch(migrated_db):
+    before = players(migrated_db)
+    changes = ChangeSet(
+        inserts=[{"full_name": "New One", "country": "Oman"}],
+        updates=[(1, {"playing_role": ("Batsman", "Captain")}), (2, {"full_name": ("B", None)})],
+        deletes=[3],
+    )
+    with pytest.raises(sqlite3.IntegrityError):
+        apply_changes("players", changes, migrated_db)
+    assert players(migrated_db) == before
+
+
+def test_unknown_columns_are_refused_before_writing(migrated_db):
+    before = players(migrated_db)
+    changes = ChangeSet(inserts=[{"full_name": "X", "country": "Oman", "nickname": "x"}], deletes=[1])
+    with pytest.raises(ValueError):
+        apply_changes("players", changes, migrated_db)
+    assert players(migrated_db) == before
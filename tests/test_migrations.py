@@ -0,0 +1,76 @@
+# tests/test_migrations.py
+import sqlite3
+
+import pytest
+
+from utils.migrations import MIGRATIONS_DIR, _statements, current_version, list_migrations, migrate
+
+LATEST = list_migrations()[-1][0]
+
+
+def versions(path):
+    with sqlite3.connect(path) as conn:
+        return [v for v, in conn.execute("SELECT version FROM schema_version ORDER BY version")]
+
+
+def columns(path, table):
+    with sqlite3.connect(path) as conn:
+        return {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+
+
+def legacy_db(path):
+    """The tables of migration 0001 without a schema_version table, as the old init_db left them"""
+    with open(f"{MIGRATIONS_DIR}/0001_initial.sql") as f:
+        script = f.read()
+    with sqlite3.connect(path) as conn:
+        for statement in _statements(script):
+            if statement.upper().startswith("CREATE"):
+                conn.execute(statement)
+        conn.execute("INSERT INTO players (full_name, country) VALUES ('Legacy Player', 'India')")
+
+
+def test_fresh_database_reaches_latest(tmp_path):
+    path = str(tmp_path / "fresh.db")
+    applied = migrate(path)
+    assert applied == [v for v, _, _ in list_migrations()]
+    assert versions(path) == applied
+    assert "matches" in columns(path, "player_stats")
+    # A second run has nothing to do
+    assert migrate(path) == []
+
+
+def test_legacy_database_is_baselined_then_upgraded(tmp_path):
+    path = str(tmp_path / "legacy.db")
+    legacy_db(path)
+    with sqlite3.connect(path, isolation_level=None) as conn:
+        assert current_version(conn) == 1
+    applied = migrate(path)
+    assert applied[0] == 2 and applied[-1] == LATEST
+    assert versions(path)[0] == 1
+    with sqlite3.connect(path) as conn:
+        # 0001's sample data was not inserted on top of the existing rows
+        assert conn.execute("SELECT full_name FROM players").fetchall() == [("Legacy Player",)]
+
+
+def test_duplicate_columns_are_tolerated(tmp_path):
+    path = str(tmp_path / "patched.db")
+    legacy_db(path)
+    with sqlite3.connect(path) as conn:
+        conn.execute("ALTER TABLE player_stats ADD COLUMN matches INTEGER DEFAULT 0")
+    migrate(path)
+    assert LATEST in versions(path)
+    assert {"matches", "strike_rate", "catches"} <= columns(path, "player_stats")
+
+
+def test_other_errors_roll_the_migration_back(tmp_path):
+    migrations_dir = tmp_path / "migrations"
+    migrations_dir.mkdir()
+    (migrations_dir / "0001_base.sql").write_text("CREATE TABLE players (player_id INTEGER PRIMARY KEY);\n")
+    (migrations_dir / "0002_broken.sql").write_text(
+        "CREATE TABLE half_done (id INTEGER);\nSELECT * FROM no_such_table;\n")
+    path = str(tmp_path / "broken.db")
+    with pytest.raises(sqlite3.OperationalError):
+        migrate(path, str(migrations_dir))
+    assert versions(path) == [1]
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'half_done'").fetchone() is None
@@ -0,0 +1,105 @@
+# tests/test_quota.py
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from utils import quota
+from utils.quota import PRIORITY_HIGH, PRIORITY_LOW, QuotaExceeded, QuotaScheduler
+
+MINUTE = 29_000_000
+
+
+@pytest.fixture(autouse=True)
+def fixed_minute(monkeypatch):
+    """Keep every claim in one wall-clock minute, so a test cannot straddle a boundary"""
+    monkeypatch.setattr(quota, "_current_minute", lambda: MINUTE)
+
+
+def query(db_path, sql, params=()):
+    conn = sqlite3.connect(db_path)
+    try:
+        return conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+
+
+def test_waiting_calls_are_served_by_priority(migrated_db):
+    # Two tokens a second: plenty of time for both callers to queue before the next one
+    scheduler = QuotaScheduler(per_minute=120, per_month=1000, db_path=migrated_db)
+    scheduler.acquire()  # first claim and ledger read out of the way
+    with scheduler._cond:
+        scheduler._tokens = 0.0
+    order = []
+
+    def call(name, priority):
+        scheduler.acquire(priority, timeout=5)
+        order.append(name)
+
+    low = threading.Thread(target=call, args=("low", PRIORITY_LOW))
+    low.start()
+    while not scheduler.status()["waiting"]:
+        time.sleep(0.001)
+    high = threading.Thread(target=call, args=("high", PRIORITY_HIGH))
+    high.start()
+    low.join()
+    high.join()
+    # low queued first, but the next token went to high
+    assert order == ["high", "low"]
+
+
+def test_minute_limit_is_shared_between_schedulers(migrated_db):
+    conn = sqlite3.connect(migrated_db)
+    with conn:
+        conn.execute("INSERT INTO api_quota_minute (minute, used) VALUES (?, 1)", (MINUTE - 60,))
+    conn.close()
+
+    first = QuotaScheduler(per_minute=5, per_month=1000, db_path=migrated_db)
+    second = QuotaScheduler(per_minute=5, per_month=1000, db_path=migrated_db)
+    for _ in range(3):
+        first.acquire(timeout=1)
+    for _ in range(2):
+        second.acquire(timeout=1)
+    # Each has tokens left in its own bucket, but the minute's five slots are gone
+    for scheduler in (first, second):
+        with pytest.raises(QuotaExceeded):
+            scheduler.acquire(timeout=0.05)
+    assert query(migrated_db, "SELECT minute, used FROM api_quota_minute") == [(MINUTE, 5)]
+
+
+def test_ledger_is_flushed_and_shared(migrated_db, monkeypatch):
+    monkeypatch.setattr(quota, "LEDGER_FLUSH_EVERY", 4)
+    scheduler = QuotaScheduler(per_minute=600, per_month=1000, db_path=migrated_db)
+    for _ in range(5):
+        scheduler.acquire()
+    month = scheduler.status()["month"]
+    # The fourth call flushed; the fifth is still pending
+    assert query(migrated_db, "SELECT used FROM api_quota_ledger WHERE month = ?", (month,)) == [(4,)]
+    scheduler.flush()
+    assert query(migrated_db, "SELECT used FROM api_quota_ledger WHERE month = ?", (month,)) == [(5,)]
+
+    restarted = QuotaScheduler(per_minute=600, per_month=1000, db_path=migrated_db)
+    assert restarted.status()["used"] == 5
+    restarted.acquire()
+    restarted.flush()
+    scheduler.acquire()
+    scheduler.flush()
+    assert scheduler.status()["used"] == 7
+
+
+def test_low_priority_stops_at_the_monthly_reserve(migrated_db):
+    month = quota._current_month()
+    conn = sqlite3.connect(migrated_db)
+    with conn:
+        conn.execute("INSERT INTO api_quota_ledger (month, used) VALUES (?, 8)", (month,))
+    conn.close()
+
+    scheduler = QuotaScheduler(per_minute=600, per_month=10, db_path=migrated_db, low_priority_reserve=0.1)
+    scheduler.acquire(PRIORITY_LOW)
+    with pytest.raises(QuotaExceeded):
+        scheduler.acquire(PRIORITY_LOW)
+    scheduler.acquire(PRIORITY_HIGH)
+    with pytest.raises(QuotaExceeded):
+        scheduler.acquire(PRIORITY_HIGH)
+    assert scheduler.status()["remaining"] == 0
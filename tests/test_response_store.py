@@ -0,0 +1,105 @@
+# tests/test_response_store.py
+import json
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from utils.response_store import Fetched, ResponseStore
+from utils.scorecard_parser import body_fingerprint
+
+KEY = "scorecard:1"
+
+
+def fetched(payload):
+    body = json.dumps(payload).encode()
+    return Fetched(payload, body, body_fingerprint(body))
+
+
+def query(db_path, sql, params=()):
+    conn = sqlite3.connect(db_path)
+    try:
+        with conn:
+            return conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+
+
+def not_called():
+    pytest.fail("fetched upstream although another process had the response")
+
+
+def test_fetch_stores_the_body_and_releases_the_lease(migrated_db):
+    store = ResponseStore(migrated_db)
+    assert store.fetch(KEY, 60, lambda: fetched({"score": 1})) == {"score": 1}
+    assert query(migrated_db, "SELECT * FROM api_leases") == []
+    assert query(migrated_db, "SELECT body FROM api_responses WHERE cache_key = ?", (KEY,)) == [(b'{"score": 1}',)]
+
+    other = ResponseStore(migrated_db)
+    assert other.fetch(KEY, 60, not_called) == {"score": 1}
+    assert (other.stats(), store.stats()) == ({"fetches": 0, "shared_hits": 1}, {"fetches": 1, "shared_hits": 0})
+
+
+def test_failed_fetch_releases_the_lease(migrated_db):
+    store = ResponseStore(migrated_db)
+    assert store.fetch(KEY, 60, lambda: None) is None
+
+    def broken():
+        raise ConnectionError("upstream down")
+
+    with pytest.raises(ConnectionError):
+        store.fetch(KEY, 60, broken)
+    assert query(migrated_db, "SELECT * FROM api_leases") == []
+
+
+def test_waits_for_the_lease_holder_body(migrated_db):
+    holder, waiter = ResponseStore(migrated_db), ResponseStore(migrated_db)
+    assert holder._take_lease(KEY)
+    assert not waiter._take_lease(KEY)
+    result = {}
+    thread = threading.Thread(target=lambda: result.update(payload=waiter.fetch(KEY, 60, not_called)))
+    thread.start()
+    time.sleep(0.2)
+    assert thread.is_alive()
+    holder._store(KEY, fetched({"score": 2}))
+    holder._release_lease(KEY)
+    thread.join(5)
+    assert result == {"payload": {"score": 2}}
+
+
+def test_holder_releasing_without_a_body_is_a_failed_fetch(migrated_db):
+    holder, waiter = ResponseStore(migrated_db), ResponseStore(migrated_db)
+    assert holder._take_lease(KEY)
+    threading.Timer(0.2, holder._release_lease, args=(KEY,)).start()
+    assert waiter.fetch(KEY, 60, not_called) is None
+
+
+def test_expired_lease_is_taken_over(migrated_db):
+    query(migrated_db, "INSERT INTO api_leases VALUES (?, 'crashed', ?)", (KEY, time.time() - 1))
+    store = ResponseStore(migrated_db)
+    assert store.fetch(KEY, 60, lambda: fetched({"score": 3})) == {"score": 3}
+    assert query(migrated_db, "SELECT * FROM api_leases") == []
+
+
+def test_lease_expiring_while_waiting_is_taken_over(migrated_db):
+    query(migrated_db, "INSERT INTO api_leases VALUES (?, 'stuck', ?)", (KEY, time.time() + 0.3))
+    store = ResponseStore(migrated_db)
+    started = time.monotonic()
+    assert store.fetch(KEY, 60, lambda: fetched({"score": 4})) == {"score": 4}
+    assert time.monotonic() - started >= 0.3
+    assert store.stats()["fetches"] == 1
+
+
+def test_unchanged_body_only_moves_the_timestamp(migrated_db):
+    store = ResponseStore(migrated_db)
+    store._store(KEY, fetched({"score": 5}))
+    query(migrated_db, "UPDATE api_responses SET stored_at = 0, body = 'kept'")
+    store._store(KEY, fetched({"score": 5}))
+    (stored_at, body), = query(migrated_db, "SELECT stored_at, body FROM api_responses")
+    assert body == "kept" and stored_at > 0
+
+    # A 304 while the row holds another version stores the payload it has
+    store._store(KEY, Fetched({"score": 6}, None, "not-the-stored-one"))
+    assert json.loads(query(migrated_db, "SELECT body FROM api_responses")[0][0]) == {"score": 6}
+    assert ResponseStore(migrated_db).fetch(KEY, 60, not_called) == {"score": 6}
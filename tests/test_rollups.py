@@ -0,0 +1,74 @@
+# tests/test_rollups.py
+"""player_totals / country_totals (migration 0005) against a direct GROUP BY"""
+import random
+import sqlite3
+
+PLAYER_TOTALS_SQL = """
+    SELECT player_id, COALESCE(SUM(total_runs), 0), COALESCE(SUM(wickets), 0),
+           COALESCE(SUM(centuries), 0), COALESCE(SUM(matches), 0), COUNT(*)
+    FROM player_stats WHERE player_id IS NOT NULL GROUP BY player_id ORDER BY player_id
+"""
+COUNTRY_TOTALS_SQL = """
+    SELECT p.country, COUNT(DISTINCT p.player_id),
+           COALESCE(SUM(s.total_runs), 0), COALESCE(SUM(s.wickets), 0),
+           COALESCE(SUM(s.centuries), 0), COALESCE(SUM(s.matches), 0), COUNT(s.stat_id)
+    FROM players p LEFT JOIN player_stats s ON s.player_id = p.player_id
+    GROUP BY p.country ORDER BY p.country
+"""
+
+
+def assert_rollups_match(conn):
+    assert conn.execute(
+        "SELECT player_id, runs, wickets, centuries, matches, stat_rows FROM player_totals "
+        "WHERE stat_rows > 0 ORDER BY player_id"
+    ).fetchall() == conn.execute(PLAYER_TOTALS_SQL).fetchall()
+    assert conn.execute(
+        "SELECT country, players, runs, wickets, centuries, matches, stat_rows FROM country_totals "
+        "WHERE players > 0 ORDER BY country"
+    ).fetchall() == conn.execute(COUNTRY_TOTALS_SQL).fetchall()
+
+
+def test_rollups_follow_inserts_updates_and_deletes(migrated_db):
+    rng = random.Random(7)
+    conn = sqlite3.connect(migrated_db)
+    assert_rollups_match(conn)
+    countries = ["India", "Australia", "England", "Nepal"]
+
+    with conn:
+        for i in range(20):
+            conn.execute("INSERT INTO players (full_name, country) VALUES (?, ?)",
+                         (f"Rollup Player {i}", rng.choice(countries)))
+    player_ids = [p for p, in conn.execute("SELECT player_id FROM players")]
+
+    with conn:
+        for _ in range(200):
+            conn.execute(
+                "INSERT INTO player_stats (player_id, format, total_runs, wickets, centuries, matches) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (rng.choice(player_ids + [None]), rng.choice(["Test", "ODI", "T20"]), rng.randint(0, 5000),
+                 rng.choice([rng.randint(0, 200), None]), rng.randint(0, 20), rng.randint(1, 150)),
+            )
+    assert_rollups_match(conn)
+
+    stat_ids = [s for s, in conn.execute("SELECT stat_id FROM player_stats")]
+    with conn:
+        for stat_id in rng.sample(stat_ids, 60):
+            conn.execute("UPDATE player_stats SET total_runs = ?, wickets = ?, player_id = ? WHERE stat_id = ?",
+                         (rng.randint(0, 9000), rng.randint(0, 300), rng.choice(player_ids + [None]), stat_id))
+        conn.execute("UPDATE player_stats SET matches = matches + 1 WHERE format = 'ODI'")
+    assert_rollups_match(conn)
+
+    with conn:
+        for player_id in rng.sample(player_ids, 5):
+            conn.execute("UPDATE players SET country = ? WHERE player_id = ?", (rng.choice(countries), player_id))
+    assert_rollups_match(conn)
+
+    with conn:
+        for stat_id in rng.sample(stat_ids, 40):
+            conn.execute("DELETE FROM player_stats WHERE stat_id = ?", (stat_id,))
+        gone = rng.sample(player_ids, 4)
+        for player_id in gone:
+            conn.execute("DELETE FROM player_stats WHERE player_id = ?", (player_id,))
+            conn.execute("DELETE FROM players WHERE player_id = ?", (player_id,))
+    assert_rollups_match(conn)
+    conn.close()
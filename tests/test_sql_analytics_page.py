@@ -0,0 +1,56 @@
+# tests/test_sql_analytics_page.py
+"""AppTest runs of pages/4_SQL_Analytics.py against a copy of cricbuzz.db"""
+import os
+import shutil
+import sys
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGE = os.path.join(PROJECT_ROOT, "pages", "4_SQL_Analytics.py")
+
+
+@pytest.fixture
+def db_copy(tmp_path, monkeypatch):
+    """Point the app at a scratch copy of cricbuzz.db, with utils re-imported to pick it up"""
+    path = str(tmp_path / "cricbuzz.db")
+    shutil.copy(os.path.join(PROJECT_ROOT, "cricbuzz.db"), path)
+    monkeypatch.setenv("CRICBUZZ_DB_PATH", path)
+    monkeypatch.setenv("CRICBUZZ_SHARED_CACHE", "0")
+    monkeypatch.syspath_prepend(PROJECT_ROOT)
+    for name in [m for m in sys.modules if m == "utils" or m.startswith("utils.")]:
+        monkeypatch.delitem(sys.modules, name)
+    return path
+
+
+def test_compare_then_custom_query(db_copy):
+    at = AppTest.from_file(PAGE, default_timeout=60).run()
+    assert not at.exception
+
+    compare = next(w for w in at.multiselect if w.label == "Compare players")
+    compare.select(compare.options[0]).run()
+    assert not at.exception
+    assert any(w.label == "Metrics" for w in at.multiselect)
+
+    at.text_area[0].input("SELECT country, COUNT(*) AS players FROM players GROUP BY country").run()
+    next(b for b in at.button if b.label == "Run Custom Query").click().run()
+    assert not at.exception
+    assert not at.error
+    assert len(at.dataframe) >= 3  # leaderboard, comparison, custom result
+
+    from utils import metrics
+    assert any(name == "cricbuzz_query_seconds" and labels == {"query": "custom"}
+               for name, labels, *_ in metrics.registry.histograms())
+
+
+def test_compare_after_ranking_by_all_round(db_copy):
+    at = AppTest.from_file(PAGE, default_timeout=60).run()
+    next(w for w in at.selectbox if w.label == "Rank by").select("all_round").run()
+    assert not at.exception
+
+    compare = next(w for w in at.multiselect if w.label == "Compare players")
+    compare.select(compare.options[0]).run()
+    assert not at.exception
+    picker = next(w for w in at.multiselect if w.label == "Metrics")
+    assert picker.value == ["total_runs", "wickets", "matches"]
@@ -0,0 +1,87 @@
+# tests/test_table_browser.py
+import sqlite3
+
+import pytest
+
+from utils.table_browser import fetch_page
+
+# score repeats and is NULL for every fifth row, so pages split ties and NULLs
+ROWS = [(i, f"p{i % 7}", None if i % 5 == 0 else i % 4, i * 10) for i in range(1, 48)]
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT, score INTEGER, points INTEGER)")
+    conn.execute("CREATE INDEX idx_items_score ON items (score)")
+    conn.execute("CREATE INDEX idx_items_name ON items (name)")
+    conn.execute("CREATE INDEX idx_items_points ON items (points)")
+    conn.executemany("INSERT INTO items VALUES (?, ?, ?, ?)", ROWS)
+    yield conn
+    conn.close()
+
+
+def expected(column, descending):
+    """Python's version of the page order: NULLs last, ties broken by id, both in the chosen direction"""
+    values = [r for r in ROWS if r[column] is not None]
+    nulls = [r for r in ROWS if r[column] is None]
+    values.sort(key=lambda r: (r[column], r[0]), reverse=descending)
+    nulls.sort(key=lambda r: r[0], reverse=descending)
+    return values + nulls
+
+
+def all_pages(conn, order_by, descending=False, filters=(), page_size=6):
+    """Page forward to the end; returns the pages and the cursor each was fetched with"""
+    pages, cursors, cursor = [], [], None
+    while True:
+        _, rows, next_cursor = fetch_page(conn, "items", order_by, descending, filters, cursor, page_size)
+        pages.append(rows)
+        cursors.append(cursor)
+        if next_cursor is None:
+            return pages, cursors
+        cursor = next_cursor
+
+
+@pytest.mark.parametrize("descending", [False, True])
+@pytest.mark.parametrize("order_by, column", [("id", 0), ("score", 2)])
+def test_pages_cover_every_row_in_order(conn, order_by, column, descending):
+    pages, _ = all_pages(conn, order_by, descending)
+    assert all(len(rows) == 6 for rows in pages[:-1])
+    assert [row for rows in pages for row in rows] == expected(column, descending)
+
+
+def test_stacked_cursors_page_back_to_the_same_rows(conn):
+    pages, cursors = all_pages(conn, "score")
+    # Later pages were fetched with NULL cursors, earlier ones with value cursors
+    assert cursors[-1][0] and not cursors[1][0]
+    for rows, cursor in reversed(list(zip(pages, cursors))):
+        assert fetch_page(conn, "items", "score", cursor=cursor, page_size=6)[1] == rows
+
+
+def test_null_cursor_pages_only_the_null_rows(conn):
+    _, rows, next_cursor = fetch_page(conn, "items", "score", cursor=(True, None, 20), page_size=3)
+    assert [r[0] for r in rows] == [25, 30, 35]
+    _, rows, next_cursor = fetch_page(conn, "items", "score", cursor=next_cursor, page_size=3)
+    assert [r[0] for r in rows] == [40, 45]
+    assert next_cursor is None
+
+
+def test_filters_apply_to_every_page(conn):
+    pages, _ = all_pages(conn, "score", filters=[("name", "=", "p3")], page_size=2)
+    assert [row for rows in pages for row in rows] == [r for r in expected(2, False) if r[1] == "p3"]
+
+
+def test_starts_with_on_text_and_integer_columns(conn):
+    _, rows, _ = fetch_page(conn, "items", filters=[("name", "starts with", "p1")])
+    assert [r[0] for r in rows] == [r[0] for r in ROWS if r[1].startswith("p1")]
+    _, rows, _ = fetch_page(conn, "items", filters=[("points", "starts with", "12")])
+    assert [r[0] for r in rows] == [12]
+    _, rows, _ = fetch_page(conn, "items", filters=[("id", "starts with", "4")])
+    assert [r[0] for r in rows] == [4, 40, 41, 42, 43, 44, 45, 46, 47]
+
+
+def test_unindexed_columns_are_refused(conn):
+    with pytest.raises(ValueError):
+        fetch_page(conn, "items", "nope")
+    with pytest.raises(ValueError):
+        fetch_page(conn, "missing")
@@ -1,66 +1,531 @@
  # utils/api_handler.py
 import requests
+import atexit
 import os
+import random
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from requests.adapters import HTTPAdapter
+
+from utils import metrics
+from utils.quota import PRIORITY_HIGH, PRIORITY_LOW, PRIORITY_NORMAL, QuotaScheduler
+from utils.response_store import Fetched, get_store
+from utils.scorecard_parser import body_fingerprint
 
 # You will need your RapidAPI key (get from https://rapidapi.com/cricketapilive/api/cricbuzz-cricket/)
 RAPIDAPI_KEY = os.getenv("RAPIDAPI_KEY", "your_api_key_here")
 
-BASE_URL = "https://cricbuzz-cricket.p.rapidapi.com"
+API_HOST = "cricbuzz-cricket.p.rapidapi.com"
+# Set CRICBUZZ_BASE_URL to point at a stand-in such as stub_server.py
+BASE_URL = os.getenv("CRICBUZZ_BASE_URL", f"https://{API_HOST}").rstrip("/")
 
 HEADERS = {
-    "x-rapidapi-host": "cricbuzz-cricket.p.rapidapi.com",
-    "x-rapidapi-key": RAPIDAPI_KEY
+    "x-rapidapi-host": API_HOST,
+    "x-rapidapi-key": RAPIDAPI_KEY,
 }
 
+# (connect, read) timeouts in seconds, per endpoint
+TIMEOUTS = {
+    "live_matches": (3.05, 10),
+    "scorecard": (3.05, 10),
+    "player": (3.05, 15),
+}
+DEFAULT_TIMEOUT = (3.05, 10)
+
+# Max scorecards fetched at once by get_match_scores; kept within the client's connection pool
+BATCH_MAX_WORKERS = 8
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Sent when a 304 came back with no remembered body, to get the full response
+NO_CACHE_HEADERS = {"Cache-Control": "no-cache"}
+
+# Endpoints polled repeatedly: their last body and validators are kept for conditional requests
+CONDITIONAL_ENDPOINTS = {"live_matches", "scorecard"}
+BODY_MAX_ENTRIES = 128
+
+
+# -------------------------
+# HTTP client
+# -------------------------
+class LastBody:
+    """The last decoded body of one path, with its hash and validators"""
+
+    __slots__ = ("payload", "fingerprint", "etag", "last_modified")
+
+    def __init__(self, payload, fingerprint, etag, last_modified):
+        self.payload = payload
+        self.fingerprint = fingerprint
+        self.etag = etag
+        self.last_modified = last_modified
+
+    def validators(self):
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers or None
+
+
+class CricbuzzClient:
+    """Pooled HTTP client for the Cricbuzz API.
+
+    One requests.Session is shared by every call so TCP/TLS connections are
+    kept alive and reused. 429 and 5xx responses, connection errors and
+    timeouts are retried with jittered exponential backoff. Every attempt,
+    retries included, first takes a slot from the quota scheduler.
+
+    For CONDITIONAL_ENDPOINTS the last body of each path is remembered with
+    its ETag / Last-Modified, which are sent back as If-None-Match /
+    If-Modified-Since. A 304, or a 200 whose bytes hash the same as last
+    time, returns the previously decoded object without decoding again.
+    """
+
+    def __init__(self, base_url=BASE_URL, headers=HEADERS, pool_size=10,
+                 max_retries=3, backoff_base=0.5, backoff_max=8.0, scheduler=None):
+        self.base_url = base_url
+        self.scheduler = scheduler if scheduler is not None else QuotaScheduler()
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._bodies = OrderedDict()  # path -> LastBody
+        self._bodies_lock = threading.Lock()
+
+        self.session = requests.Session()
+        self.session.headers.update(headers)
+        # pool_block keeps the number of open sockets at pool_size under load
+        adapter = HTTPAdapter(pool_connections=2, pool_maxsize=pool_size, pool_block=True, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def get_json(self, endpoint, path, priority=PRIORITY_NORMAL):
+        """GET base_url + path and return the decoded JSON body.
+
+        Raises the last error once retries are exhausted, raises immediately
+        on non-retryable HTTP errors (e.g. 404), and raises QuotaExceeded
+        when the plan limits leave no room for the call.
+        """
+        return self.get_json_versioned(endpoint, path, priority)[0]
+
+    def get_json_versioned(self, endpoint, path, priority=PRIORITY_NORMAL):
+        """Like get_json, but returns (payload, fingerprint, changed).
+
+        fingerprint hashes the raw body; changed is False when upstream
+        answered 304 or sent the same bytes as the previous call for this
+        path, in which case payload is the very object returned last time.
+        """
+        return self._timed_get(endpoint, path, priority)[:3]
+
+    def get_json_body(self, endpoint, path, priority=PRIORITY_NORMAL):
+        """Like get_json, but returns a Fetched with the raw body bytes and their fingerprint.
+
+        body is None after a 304 (fingerprint is then the previous body's);
+        fingerprint is None for endpoints that are not fetched conditionally.
+        """
+        payload, fingerprint, _, body = self._timed_get(endpoint, path, priority)
+        return Fetched(payload, body, fingerprint)
+
+    def _timed_get(self, endpoint, path, priority):
+        with metrics.timer("cricbuzz_api_request_seconds", endpoint=endpoint):
+            try:
+                return self._get_json(endpoint, path, priority)
+            except Exception:
+                metrics.inc("cricbuzz_api_errors_total", endpoint=endpoint)
+                raise
+
+    def _get_json(self, endpoint, path, priority):
+        url = f"{self.base_url}{path}"
+        timeout = TIMEOUTS.get(endpoint, DEFAULT_TIMEOUT)
+        conditional = endpoint in CONDITIONAL_ENDPOINTS
+        last = self._last_body(path) if conditional else None
+        headers = last.validators() if last else None
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            self.scheduler.acquire(priority)
+            try:
+                response = self.session.get(url, timeout=timeout, headers=headers)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                metrics.inc("cricbuzz_api_responses_total", endpoint=endpoint, status="error")
+                error = e
+            else:
+                metrics.inc("cricbuzz_api_responses_total", endpoint=endpoint, status=str(response.status_code))
+                if response.status_code == 304 and last is not None:
+                    metrics.inc("cricbuzz_api_unchanged_total", endpoint=endpoint, reason="not_modified")
+                    return last.payload, last.fingerprint, False, None
+                if response.status_code == 304:
+                    # Nothing remembered to reuse (restart, eviction, or a cache in between
+                    # answering for us): ask once more for the full body, then give up
+                    error = requests.HTTPError(f"304 for {url} but no earlier body to reuse", response=response)
+                    if headers == NO_CACHE_HEADERS:
+                        raise error
+                    headers = NO_CACHE_HEADERS
+                    continue
+                if response.status_code not in RETRY_STATUSES:
+                    response.raise_for_status()
+                    if not conditional:
+                        return response.json(), None, True, response.content
+                    return self._decode(endpoint, path, response, last)
+                error = requests.HTTPError(f"{response.status_code} for {url}", response=response)
+                retry_after = response.headers.get("Retry-After")
+
+            if attempt < self.max_retries:
+                time.sleep(self._backoff(attempt, retry_after))
+        raise error
+
+    def _last_body(self, path):
+        with self._bodies_lock:
+            last = self._bodies.get(path)
+            if last is not None:
+                self._bodies.move_to_end(path)
+            return last
+
+    def _decode(self, endpoint, path, response, last):
+        """Decode a 200 body unless it is byte-identical to the last one; returns (payload, fingerprint, changed, body)"""
+        fingerprint = body_fingerprint(response.content)
+        etag, last_modified = response.headers.get("ETag"), response.headers.get("Last-Modified")
+        if last is not None and last.fingerprint == fingerprint:
+            metrics.inc("cricbuzz_api_unchanged_total", endpoint=endpoint, reason="same_body")
+            payload, changed = last.payload, False
+        else:
+            payload, changed = response.json(), True
+        with self._bodies_lock:
+            self._bodies[path] = LastBody(payload, fingerprint, etag, last_modified)
+            self._bodies.move_to_end(path)
+            while len(self._bodies) > BODY_MAX_ENTRIES:
+                self._bodies.popitem(last=False)
+        return payload, fingerprint, changed, response.content
+
+    def _backoff(self, attempt, retry_after=None):
+        """Full-jitter exponential backoff, honouring Retry-After when sent"""
+        if retry_after is not None:
+            try:
+                return min(float(retry_after), self.backoff_max)
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def close(self):
+        self.scheduler.flush()
+        self.session.close()
+
+
+client = CricbuzzClient()
+atexit.register(client.close)
+
+
+# -------------------------
+# Request coalescing
+# -------------------------
+class SingleFlight:
+    """Concurrent calls for the same key share one execution of fn.
+
+    The first caller runs fn; callers arriving while it runs wait for and
+    receive the same result (or exception).
+    """
+
+    def __init__(self):
+        self._calls = {}  # key -> Future
+        self._lock = threading.Lock()
+        self.shared = 0
+
+    def do(self, key, fn):
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+            else:
+                self.shared += 1
+        if not leader:
+            return future.result()
+        try:
+            future.set_result(fn())
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                del self._calls[key]
+        return future.result()
+
+
+# -------------------------
+# Response cache
+# -------------------------
+# Seconds a cached response is served as fresh, per endpoint
+CACHE_TTLS = {
+    "live_matches": 30,
+    "scorecard": 15,
+    "player": 6 * 60 * 60,
+}
+# Extra seconds an expired response may still be served while it is refreshed
+CACHE_STALE_TTLS = {
+    "live_matches": 120,
+    "scorecard": 60,
+    "player": 24 * 60 * 60,
+}
+CACHE_MAX_ENTRIES = 512
+# After a failed fetch the key is not fetched again for this many seconds,
+# doubling with each consecutive failure up to FAILURE_TTL_MAX
+FAILURE_TTL = 5
+FAILURE_TTL_MAX = 60
+
+
+class ResponseCache:
+    """Process-wide LRU cache of API responses with stale-while-revalidate.
+
+    Entries are keyed by (endpoint, key). A fresh entry is returned as-is, a
+    stale one is returned immediately while a background thread refetches it,
+    and anything older (or missing) is fetched inline. fetch is called with
+    the caller's priority inline and with PRIORITY_LOW for background
+    refreshes, and returns a Fetched (None on failure), so a shared store can
+    keep the raw body without serializing the payload again.
+
+    A failed fetch is remembered as a short negative entry (FAILURE_TTL,
+    backing off to FAILURE_TTL_MAX): until it expires callers get the
+    expired copy or None without another upstream call, so viewers polling
+    a broken scorecard do not spend the quota on retries.
+
+    A hit returns the stored payload itself, not a copy: every session gets
+    the same nested dicts and lists, and the client hands the same object
+    back again for unchanged scorecards, so nothing may modify a payload.
+
+    Fetches are coalesced: concurrent misses for one key in this process
+    share a single call, and with a shared store other processes wait for
+    (or reuse) the one fetching process's response.
+    """
+
+    def __init__(self, ttls, stale_ttls, max_entries=CACHE_MAX_ENTRIES, store=None):
+        self.ttls = ttls
+        self.stale_ttls = stale_ttls
+        self.max_entries = max_entries
+        self.store = store
+        self._flights = SingleFlight()
+        self._entries = OrderedDict()  # (endpoint, key) -> (stored_at, value)
+        self._failures = OrderedDict()  # (endpoint, key) -> (retry_at, consecutive failures)
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    def get(self, endpoint, key, fetch, priority=PRIORITY_NORMAL):
+        """Return the cached response for (endpoint, key), calling fetch(priority) when needed"""
+        cache_key = (endpoint, key)
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None:
+                self._entries.move_to_end(cache_key)
 
-def get_live_matches():
-    """Fetch all live matches"""
-    url = f"{BASE_URL}/matches/v1/live"
+        if entry is not None:
+            stored_at, value = entry
+            age = time.monotonic() - stored_at
+            ttl = self.ttls.get(endpoint, 0)
+            if age < ttl:
+                metrics.inc("cricbuzz_api_cache_total", endpoint=endpoint, result="hit")
+                return value
+            if age < ttl + self.stale_ttls.get(endpoint, 0):
+                metrics.inc("cricbuzz_api_cache_total", endpoint=endpoint, result="stale")
+                self._refresh_in_background(cache_key, fetch)
+                return value
+
+        if self._failed_recently(cache_key):
+            metrics.inc("cricbuzz_api_cache_total", endpoint=endpoint, result="negative")
+            return entry[1] if entry is not None else None
+
+        metrics.inc("cricbuzz_api_cache_total", endpoint=endpoint, result="miss")
+        value = self._fetch(cache_key, fetch, priority)
+        if value is None:
+            # Upstream failed: an expired copy is still better than nothing
+            return entry[1] if entry is not None else None
+        return value
+
+    def _fetch(self, cache_key, fetch, priority):
+        """One fetch per key at a time in this process (and across processes with a store); caches the result"""
+        def run():
+            if self.store is None:
+                fetched = fetch(priority)
+                value = fetched.payload if fetched is not None else None
+            else:
+                endpoint, key = cache_key
+                value = self.store.fetch(f"{endpoint}:{key}", self.ttls.get(endpoint, 0), lambda: fetch(priority))
+            if value is not None:
+                self._store(cache_key, value)
+            else:
+                self._record_failure(cache_key)
+            return value
+
+        return self._flights.do(cache_key, run)
+
+    def _failed_recently(self, cache_key):
+        with self._lock:
+            failure = self._failures.get(cache_key)
+        return failure is not None and time.monotonic() < failure[0]
+
+    def _record_failure(self, cache_key):
+        with self._lock:
+            _, count = self._failures.pop(cache_key, (0, 0))
+            delay = min(FAILURE_TTL * 2 ** count, FAILURE_TTL_MAX)
+            self._failures[cache_key] = (time.monotonic() + delay, count + 1)
+            while len(self._failures) > self.max_entries:
+                self._failures.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._failures.clear()
+
+    def _store(self, cache_key, value):
+        with self._lock:
+            self._entries[cache_key] = (time.monotonic(), value)
+            self._entries.move_to_end(cache_key)
+            self._failures.pop(cache_key, None)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _refresh_in_background(self, cache_key, fetch):
+        with self._lock:
+            if cache_key in self._refreshing:
+                return
+            self._refreshing.add(cache_key)
+
+        def refresh():
+            try:
+                if not self._failed_recently(cache_key):
+                    self._fetch(cache_key, fetch, PRIORITY_LOW)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(cache_key)
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+
+_cache = ResponseCache(CACHE_TTLS, CACHE_STALE_TTLS, store=get_store())
+
+
+def clear_cache():
+    """Drop every cached API response"""
+    _cache.clear()
+
+
+# -------------------------
+# API calls
+# -------------------------
+def get_quota_status():
+    """Remaining RapidAPI budget for this month and the current minute"""
+    return client.scheduler.status()
+
+
+def get_fetch_stats():
+    """How many API fetches were coalesced in this process and served by other processes, for dashboards"""
+    stats = {"coalesced_in_process": _cache._flights.shared}
+    if _cache.store is not None:
+        stats.update(_cache.store.stats())
+    return stats
+
+
+def get_live_matches(priority=PRIORITY_NORMAL):
+    """Fetch all live matches (cached)"""
+    return _cache.get("live_matches", None, lambda p: fetch_live_matches(p, with_body=True), priority)
+
+
+def get_match_score(match_id: str, priority=PRIORITY_HIGH):
+    """Fetch scorecard for a given match (cached); defaults to top priority as it is what a user is watching"""
+    return _cache.get("scorecard", str(match_id), lambda p: fetch_match_score(match_id, p, with_body=True), priority)
+
+
+def get_player_stats(player_id: str, priority=PRIORITY_NORMAL):
+    """Fetch player career stats from Cricbuzz API (cached)"""
+    return _cache.get("player", str(player_id), lambda p: fetch_player_stats(player_id, p, with_body=True), priority)
+
+
+def get_match_scores(match_ids, max_workers=BATCH_MAX_WORKERS, timeout=15, cached=True,
+                     priority=PRIORITY_NORMAL, versioned=False):
+    """Fetch scorecards for many matches concurrently.
+
+    Returns {match_id: scorecard}. Matches whose call failed or did not finish
+    within timeout seconds map to None, so callers always get partial results.
+    Set cached=False to bypass the response cache (e.g. from the poller);
+    versioned=True (uncached only) maps each match to fetch_match_score_versioned's
+    (payload, fingerprint, changed) instead.
+    """
+    match_ids = list(dict.fromkeys(match_ids))
+    results = dict.fromkeys(match_ids)
+    if not match_ids:
+        return results
+
+    if versioned:
+        fetch = fetch_match_score_versioned
+    else:
+        fetch = get_match_score if cached else fetch_match_score
+    executor = ThreadPoolExecutor(max_workers=min(max_workers, len(match_ids)),
+                                  thread_name_prefix="cricbuzz-batch")
     try:
-        response = requests.get(url, headers=HEADERS, timeout=10)
-        response.raise_for_status()
-        return response.json()
+        futures = {executor.submit(fetch, match_id, priority): match_id for match_id in match_ids}
+        done, not_done = wait(futures, timeout=timeout)
+        for future in done:
+            if future.exception() is None:
+                results[futures[future]] = future.result()
+        if not_done:
+            print(f"❌ Timed out fetching {len(not_done)} of {len(match_ids)} scorecards")
+    finally:
+        # Don't block on stragglers; they finish (and fill the cache) in the background
+        executor.shutdown(wait=False, cancel_futures=True)
+    return results
+
+
+def _get(endpoint, path, priority, with_body):
+    get = client.get_json_body if with_body else client.get_json
+    return get(endpoint, path, priority)
+
+
+def fetch_live_matches(priority=PRIORITY_LOW, with_body=False):
+    """Fetch all live matches, bypassing the cache; with_body returns a Fetched instead of the payload"""
+    try:
+        return _get("live_matches", "/matches/v1/live", priority, with_body)
     except Exception as e:
         print("❌ Error fetching live matches:", e)
         return None
 
 
-def get_match_score(match_id: str):
-    """Fetch scorecard for a given match"""
-    url = f"{BASE_URL}/mcenter/v1/{match_id}/scard"
+def fetch_match_score(match_id: str, priority=PRIORITY_LOW, with_body=False):
+    """Fetch scorecard for a given match, bypassing the cache; with_body returns a Fetched instead of the payload"""
     try:
-        response = requests.get(url, headers=HEADERS, timeout=10)
-        response.raise_for_status()
-        return response.json()
+        return _get("scorecard", f"/mcenter/v1/{match_id}/scard", priority, with_body)
     except Exception as e:
         print(f"❌ Error fetching match {match_id} score:", e)
         return None
 
 
-API_HOST = "cricbuzz-cricket.p.rapidapi.com"
-API_KEY = os.getenv("RAPIDAPI_KEY")  # Make sure you set this in your environment!
+def fetch_match_score_versioned(match_id: str, priority=PRIORITY_LOW):
+    """(payload, fingerprint, changed) for a scorecard, bypassing the cache; None if the call failed.
 
-HEADERS = {
-    "x-rapidapi-host": API_HOST,
-    "x-rapidapi-key": API_KEY,
-}
+    changed is False when the scorecard is the same as the previous fetch, so
+    callers can skip everything downstream of it.
+    """
+    try:
+        return client.get_json_versioned("scorecard", f"/mcenter/v1/{match_id}/scard", priority)
+    except Exception as e:
+        print(f"❌ Error fetching match {match_id} score:", e)
+        return None
+
+
+def fetch_player_career(player_id: str, kind: str, priority=PRIORITY_LOW):
+    """Fetch a player's career table per format; kind is "batting" or "bowling". Bypasses the cache"""
+    try:
+        return client.get_json("player", f"/stats/v1/player/{player_id}/{kind}", priority)
+    except Exception as e:
+        print(f"❌ Error fetching {kind} career of player {player_id}:", e)
+        return None
 
-def get_player_stats(player_id: str):
-    """Fetch player career stats from Cricbuzz API"""
-    urls = [
-        f"https://cricbuzz-cricket.p.rapidapi.com/stats/v1/player/{player_id}",
-        f"https://cricbuzz-cricket.p.rapidapi.com/stats/v1/player/{player_id}/profile",
+
+def fetch_player_stats(player_id: str, priority=PRIORITY_LOW, with_body=False):
+    """Fetch player career stats from Cricbuzz API, bypassing the cache; with_body returns a Fetched"""
+    paths = [
+        f"/stats/v1/player/{player_id}",
+        f"/stats/v1/player/{player_id}/profile",
     ]
-    for url in urls:
+    for path in paths:
         try:
-            response = requests.get(url, headers=HEADERS, timeout=10)
-            print("URL:", url)
-            print("STATUS:", response.status_code)
-            print("RAW TEXT:", response.text[:200])
-
-            if response.status_code == 200:
-                return response.json()
+            return _get("player", path, priority, with_body)
         except Exception as e:
-            print(f"❌ Error fetching stats from {url}: {e}")
+            print(f"❌ Error fetching stats from {path}: {e}")
     return None
-
@@ -0,0 +1,86 @@
+# utils/ball_events.py
+"""Turn successive scorecard polls into an append-only list of match events.
+
+A scorecard is reduced to a compact counter state per innings (batter runs,
+balls, boundaries and dismissal; bowler balls, runs and wickets; innings
+totals). Diffing two states yields only what happened in between: deliveries,
+runs, extras and wickets.
+"""
+from utils.scorecard_parser import parse_scorecard
+
+
+def overs_to_balls(overs):
+    """Convert cricket overs notation (e.g. 12.3) to legal balls (75)"""
+    try:
+        whole, _, part = str(overs or 0).partition(".")
+        return int(whole) * 6 + int(part[:1] or 0)
+    except ValueError:
+        return 0
+
+
+def scorecard_state(payload):
+    """Reduce a scorecard payload to {innings_id: counters} using the batsman/bowler arrays"""
+    state = {}
+    for inn in parse_scorecard(payload).innings:
+        state[str(inn.innings_id)] = {
+            "total": [inn.runs, inn.wickets, overs_to_balls(inn.overs)],
+            "bat": {
+                str(b.player_id or b.name): [b.name, b.runs, b.balls, b.fours, b.sixes,
+                                             b.dismissal if b.is_out else ""]
+                for b in inn.batters
+            },
+            "bowl": {
+                str(b.player_id or b.name): [b.name, overs_to_balls(b.overs), b.runs, b.wickets]
+                for b in inn.bowlers
+            },
+        }
+    return state
+
+
+def diff_states(prev, curr):
+    """Return the events between two scorecard states as tuples of
+    (innings_id, ball, kind, player_id, player_name, runs, detail).
+
+    ball is the innings' legal ball count for every kind. kind is one of
+    "ball", "runs", "extras", "wicket" or "correction" (a counter that went
+    backwards, e.g. an umpire's scoring fix).
+    """
+    events = []
+    prev = prev or {}
+    for innings_id, inn in curr.items():
+        before = prev.get(innings_id, {"total": [0, 0, 0], "bat": {}, "bowl": {}})
+        ball = inn["total"][2]
+
+        bowled = []  # (pid, name, bowler's balls before, after)
+        for pid, (name, balls, runs, wkts) in inn["bowl"].items():
+            _, old_balls, old_runs, _ = before["bowl"].get(pid, (name, 0, 0, 0))
+            if balls < old_balls or runs < old_runs:
+                events.append((innings_id, ball, "correction", pid, name, runs - old_runs, "bowler"))
+            if balls > old_balls:
+                bowled.append((pid, name, old_balls, balls))
+        # New deliveries end at the innings' current ball; a bowler who finished an over
+        # bowled before the one now mid-over. detail keeps the bowler's own ball count.
+        bowled.sort(key=lambda b: b[3] % 6 != 0)
+        n = max(ball - sum(after - old for _, _, old, after in bowled), 0)
+        for pid, name, old_balls, balls in bowled:
+            for own in range(old_balls + 1, balls + 1):
+                n += 1
+                events.append((innings_id, n, "ball", pid, name, 0, f"bowler ball {own}"))
+
+        bat_runs = 0
+        for pid, (name, runs, balls, fours, sixes, out) in inn["bat"].items():
+            _, old_runs, old_balls, old_fours, old_sixes, old_out = before["bat"].get(pid, (name, 0, 0, 0, 0, ""))
+            delta = runs - old_runs
+            bat_runs += delta
+            if delta < 0 or balls < old_balls:
+                events.append((innings_id, ball, "correction", pid, name, delta, "batter"))
+            elif delta or balls != old_balls:
+                detail = f"{balls - old_balls}b {fours - old_fours}x4 {sixes - old_sixes}x6"
+                events.append((innings_id, ball, "runs", pid, name, delta, detail))
+            if out and not old_out:
+                events.append((innings_id, ball, "wicket", pid, name, 0, out))
+
+        extras = (inn["total"][0] - before["total"][0]) - bat_runs
+        if extras:
+            events.append((innings_id, ball, "extras" if extras > 0 else "correction", None, None, extras, "total"))
+    return events
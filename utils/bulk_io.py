@@ -0,0 +1,356 @@
+# utils/bulk_io.py
+"""Bulk import and export of players and player_stats as CSV or Parquet.
+
+Imports stream the file, check every row against the table's NOT NULL and
+CHECK(col IN (...)) constraints, and load the good rows with executemany
+into a temporary staging table. One transaction then merges staging into
+the real table: rows whose natural key already exists are updated, the rest
+inserted, so re-importing a file is safe. A large merge leaves a single
+stats_changelog entry rather than one per row, so stats engines reload
+fully. Rejected rows are reported with
+their line number instead of aborting the load.
+
+Natural keys: players by player_id when the file has that column, else by
+(full_name, country); player_stats by (player_id, format).
+
+Exports read the table in chunks with fetchmany, so memory stays flat.
+Parquet needs pyarrow (pip install pyarrow); CSV has no extra dependencies.
+"""
+import csv
+import io
+import re
+
+from utils.db_connection import DB_PATH, open_connection
+from utils.migrations import ensure_migrated
+
+CHUNK_SIZE = 50_000
+MAX_REJECTS_REPORTED = 100
+
+NATURAL_KEYS = {
+    "players": ("full_name", "country"),
+    "player_stats": ("player_id", "format"),
+}
+
+# Loads at least this big (and a quarter of the table) rebuild secondary indexes
+# afterwards instead of updating them row by row
+INDEX_REBUILD_MIN_ROWS = 50_000
+
+CHECK_IN_RE = re.compile(r"CHECK\s*\(\s*(\w+)\s+IN\s*\(([^)]*)\)\s*\)", re.IGNORECASE)
+
+
+class BulkLoadError(Exception):
+    """Raised when a file cannot be loaded at all (unknown table, bad header, missing pyarrow)"""
+
+
+class TableSchema:
+    __slots__ = ("name", "pk", "columns", "types", "not_null", "allowed")
+
+    def __init__(self, conn, table):
+        if table not in NATURAL_KEYS:
+            raise BulkLoadError(f"Bulk load supports {', '.join(NATURAL_KEYS)}, not {table!r}")
+        self.name = table
+        info = conn.execute(f'PRAGMA table_info("{table}")').fetchall()
+        self.pk = next(row[1] for row in info if row[5] == 1)
+        self.columns = [row[1] for row in info]
+        self.types = {row[1]: (row[2] or "").upper() for row in info}
+        self.not_null = {row[1] for row in info if row[3] and row[4] is None and row[1] != self.pk}
+        table_sql = conn.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?",
+                                 (table,)).fetchone()[0]
+        self.allowed = {
+            column: {v.strip().strip("'") for v in values.split(",")}
+            for column, values in CHECK_IN_RE.findall(table_sql)
+        }
+
+    def converter(self, column):
+        """Function converting a file value to the column's type; '' and None become NULL"""
+        column_type = self.types[column]
+        if "INT" in column_type:
+            return _to_int
+        if any(t in column_type for t in ("REAL", "FLOA", "DOUB")):
+            return _to_float
+        return _to_text
+
+    def validator(self, columns):
+        """Function turning one file row into a typed row, raising ValueError naming the bad column"""
+        converters = [self.converter(c) for c in columns]
+        required = [i for i, c in enumerate(columns) if c in self.not_null]
+        checked = [(i, self.allowed[c]) for i, c in enumerate(columns) if c in self.allowed]
+
+        def validate(values):
+            try:
+                row = [convert(value) for convert, value in zip(converters, values)]
+            except (TypeError, ValueError):
+                for column, convert, value in zip(columns, converters, values):
+                    try:
+                        convert(value)
+                    except (TypeError, ValueError):
+                        raise ValueError(f"{column}: {value!r} is not a valid {self.types[column] or 'value'}")
+                raise
+            for i in required:
+                if row[i] is None:
+                    raise ValueError(f"{columns[i]} is required")
+            for i, allowed in checked:
+                if row[i] is not None and row[i] not in allowed:
+                    raise ValueError(f"{columns[i]} must be one of {', '.join(sorted(allowed))}, not {row[i]!r}")
+            return row
+
+        return validate
+
+
+def _to_int(value):
+    if value is None or value == "":
+        return None
+    # "12" and "12.0" (or 12.0 from Parquet) load as 12; "12.7" is a bad row, not 12
+    number = value if isinstance(value, float) else None
+    if number is None:
+        try:
+            return int(value)
+        except ValueError:
+            number = float(value)
+    if not number.is_integer():
+        raise ValueError(f"{value!r} is not a whole number")
+    return int(number)
+
+
+def _to_float(value):
+    if value is None or value == "":
+        return None
+    return float(value)
+
+
+def _to_text(value):
+    if value is None:
+        return None
+    value = value.strip() if isinstance(value, str) else str(value)
+    return value or None
+
+
+# -------------------------
+# Readers: yield (header, iterator of (line_no, values))
+# -------------------------
+def _read_csv(source):
+    text = io.TextIOWrapper(source, encoding="utf-8-sig", newline="") if _is_binary(source) else source
+    reader = csv.reader(text)
+    header = next(reader, None)
+    if header is None:
+        raise BulkLoadError("The file is empty")
+    return [h.strip() for h in header], ((reader.line_num, values) for values in reader)
+
+
+def _read_parquet(source):
+    pq = _pyarrow_parquet()
+    parquet_file = pq.ParquetFile(source)
+    header = parquet_file.schema_arrow.names
+
+    def rows():
+        line_no = 1
+        for batch in parquet_file.iter_batches(batch_size=CHUNK_SIZE):
+            columns = [batch.column(i).to_pylist() for i in range(batch.num_columns)]
+            for values in zip(*columns):
+                line_no += 1
+                yield line_no, values
+
+    return header, rows()
+
+
+def _is_binary(source):
+    return isinstance(source, (io.BufferedIOBase, io.RawIOBase)) or "b" in getattr(source, "mode", "")
+
+
+def _pyarrow_parquet():
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise BulkLoadError("Parquet support needs pyarrow: pip install pyarrow")
+    return pq
+
+
+def _format(path_or_name, fmt):
+    if fmt:
+        return fmt
+    return "parquet" if str(path_or_name).lower().endswith((".parquet", ".pq")) else "csv"
+
+
+# -------------------------
+# Import
+# -------------------------
+def _drop_secondary_indexes(conn, table, key):
+    """Drop the table's indexes except the one the merge looks keys up in; returns their SQL"""
+    dropped = []
+    for name, sql in conn.execute(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL", (table,)
+    ).fetchall():
+        first_column = conn.execute(f'PRAGMA index_info("{name}")').fetchone()[2]
+        if first_column == key[0] or "UNIQUE" in sql.upper():
+            continue
+        conn.execute(f'DROP INDEX "{name}"')
+        dropped.append(sql)
+    return dropped
+
+
+def _merge(conn, schema, columns, staging, staged):
+    """Upsert staging into the table on its natural key; returns (inserted, updated)"""
+    table = schema.name
+    key = (schema.pk,) if schema.pk in columns and table == "players" else NATURAL_KEYS[table]
+    missing = [k for k in key if k not in columns]
+    if missing:
+        raise BulkLoadError(f"{table} files need the column(s) {', '.join(missing)}")
+
+    dropped = []
+    existing = conn.execute(f'SELECT MAX(rowid) FROM "{table}"').fetchone()[0] or 0
+    if staged >= INDEX_REBUILD_MIN_ROWS and staged * 4 >= existing:
+        # Building an index once by sorting beats millions of random b-tree inserts
+        dropped = _drop_secondary_indexes(conn, table, key)
+    data_columns = [c for c in columns if c != schema.pk or key == (schema.pk,)]
+
+    # Later lines win when the file repeats a key
+    group = ", ".join(f'"{k}"' for k in key)
+    conn.execute(f"DELETE FROM {staging} WHERE rowid NOT IN (SELECT MAX(rowid) FROM {staging} GROUP BY {group})")
+
+    match = " AND ".join(f'"{table}"."{k}" = s."{k}"' for k in key)
+    updates = [c for c in data_columns if c not in key]
+    updated = 0
+    if updates:
+        assignments = ", ".join(f'"{c}" = s."{c}"' for c in updates)
+        updated = conn.execute(f'UPDATE "{table}" SET {assignments} FROM {staging} s WHERE {match}').rowcount
+    column_list = ", ".join(f'"{c}"' for c in data_columns)
+    inserted = conn.execute(
+        f'INSERT INTO "{table}" ({column_list}) SELECT {column_list} FROM {staging} s '
+        f'WHERE NOT EXISTS (SELECT 1 FROM "{table}" WHERE {match})'
+    ).rowcount
+    for sql in dropped:
+        conn.execute(sql)
+    if dropped:
+        conn.execute(f'ANALYZE "{table}"')
+    return inserted, updated
+
+
+def import_rows(table, source, fmt=None, db_path=None, chunk_size=CHUNK_SIZE):
+    """Load a CSV/Parquet file (path or file object) into table.
+
+    Returns {"inserted", "updated", "rejected", "rejects"}; rejects lists up to
+    MAX_REJECTS_REPORTED (line_no, reason) pairs. Nothing is written if the
+    merge fails.
+    """
+    # Imported here: stats_engine loads NumPy and pandas, which exports do not need
+    from utils.stats_engine import compact_changelog
+
+    db_path = db_path or DB_PATH
+    ensure_migrated(db_path)
+    fmt = _format(getattr(source, "name", source), fmt)
+    opened = None
+    if isinstance(source, str):
+        source = opened = open(source, "rb")
+
+    conn = open_connection(db_path)
+    try:
+        # Staging for ~10^6 rows is too big for the in-memory temp store
+        conn.execute("PRAGMA temp_store = FILE")
+        schema = TableSchema(conn, table)
+        header, rows = _read_parquet(source) if fmt == "parquet" else _read_csv(source)
+        unknown = [h for h in header if h not in schema.columns]
+        if unknown:
+            raise BulkLoadError(f"Unknown column(s) for {table}: {', '.join(unknown)}")
+        required = [c for c in schema.columns if c in schema.not_null and c not in header]
+        if required:
+            raise BulkLoadError(f"{table} files need the column(s) {', '.join(required)}")
+
+        staging = f"temp.bulk_{table}"
+        conn.execute(f"DROP TABLE IF EXISTS {staging}")
+        conn.execute(f"CREATE TABLE {staging} ({', '.join(f'[{h}]' for h in header)})")
+        insert = f"INSERT INTO {staging} VALUES ({', '.join('?' * len(header))})"
+
+        validate = schema.validator(header)
+        rejected, rejects, chunk, staged = 0, [], [], 0
+        with conn:
+            for line_no, values in rows:
+                if len(values) != len(header):
+                    reason = f"expected {len(header)} values, got {len(values)}"
+                else:
+                    try:
+                        chunk.append(validate(values))
+                        reason = None
+                    except ValueError as e:
+                        reason = str(e)
+                if reason:
+                    rejected += 1
+                    if len(rejects) < MAX_REJECTS_REPORTED:
+                        rejects.append((line_no, reason))
+                if len(chunk) >= chunk_size:
+                    conn.executemany(insert, chunk)
+                    staged += len(chunk)
+                    chunk = []
+            if chunk:
+                conn.executemany(insert, chunk)
+                staged += len(chunk)
+            logged = conn.execute("SELECT MAX(seq) FROM stats_changelog").fetchone()[0] or 0
+            inserted, updated = _merge(conn, schema, header, staging, staged)
+            compact_changelog(conn, logged)
+        conn.execute(f"DROP TABLE IF EXISTS {staging}")
+    finally:
+        conn.close()
+        if opened is not None:
+            opened.close()
+    return {"inserted": inserted, "updated": updated, "rejected": rejected, "rejects": rejects}
+
+
+# -------------------------
+# Export
+# -------------------------
+def _arrow_schema(schema):
+    import pyarrow as pa
+
+    def arrow_type(column_type):
+        if "INT" in column_type:
+            return pa.int64()
+        if any(t in column_type for t in ("REAL", "FLOA", "DOUB")):
+            return pa.float64()
+        return pa.string()
+
+    return pa.schema([(c, arrow_type(schema.types[c])) for c in schema.columns])
+
+
+def export_rows(table, out, fmt="csv", db_path=None, chunk_size=CHUNK_SIZE):
+    """Write every row of table to out (path or binary file object); returns the row count"""
+    db_path = db_path or DB_PATH
+    ensure_migrated(db_path)
+    opened = None
+    if isinstance(out, str):
+        out = opened = open(out, "wb")
+
+    conn = open_connection(db_path)
+    try:
+        schema = TableSchema(conn, table)
+        column_list = ", ".join(f'"{c}"' for c in schema.columns)
+        cursor = conn.execute(f'SELECT {column_list} FROM "{table}" ORDER BY "{schema.pk}"')
+        written = 0
+        if fmt == "parquet":
+            pq = _pyarrow_parquet()
+            import pyarrow as pa
+
+            arrow_schema = _arrow_schema(schema)
+            with pq.ParquetWriter(out, arrow_schema) as writer:
+                while True:
+                    chunk = cursor.fetchmany(chunk_size)
+                    if not chunk:
+                        break
+                    arrays = [pa.array(column, type=field.type) for column, field in zip(zip(*chunk), arrow_schema)]
+                    writer.write_table(pa.Table.from_arrays(arrays, schema=arrow_schema))
+                    written += len(chunk)
+        else:
+            text = io.TextIOWrapper(out, encoding="utf-8", newline="", write_through=True)
+            writer = csv.writer(text)
+            writer.writerow(schema.columns)
+            while True:
+                chunk = cursor.fetchmany(chunk_size)
+                if not chunk:
+                    break
+                writer.writerows(chunk)
+                written += len(chunk)
+            text.flush()
+            text.detach()
+    finally:
+        conn.close()
+        if opened is not None:
+            opened.close()
+    return written
@@ -0,0 +1,109 @@
+# utils/charts.py
+"""Chart images for query results, rendered once per (data, chart spec).
+
+Charts are drawn on a bare matplotlib Figure (never registered with pyplot,
+so nothing accumulates in pyplot's figure manager), saved as PNG, and the
+figure is cleared right away. The PNG bytes are kept in a process-wide LRU
+keyed by a hash of the plotted columns plus the chart spec, so a repeat view
+of the same chart in any session just re-sends the cached image.
+"""
+import hashlib
+import io
+import os
+import threading
+from collections import OrderedDict
+
+CHART_CACHE_MAX_BYTES = int(os.getenv("CRICBUZZ_CHART_CACHE_MB", "16")) * 1024 * 1024
+DPI = 100
+
+
+def data_hash(frame, columns):
+    """Stable digest of the given columns of a DataFrame, values and order included"""
+    import pandas as pd
+
+    digest = hashlib.sha1(repr(list(columns)).encode())
+    subset = frame[list(columns)]
+    digest.update(pd.util.hash_pandas_object(subset, index=False).values.tobytes())
+    return digest.hexdigest()
+
+
+class ChartCache:
+    """LRU of rendered PNG bytes, bounded by max_bytes"""
+
+    def __init__(self, max_bytes=CHART_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> png bytes
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, render):
+        with self._lock:
+            png = self._entries.get(key)
+            if png is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return png
+            self.misses += 1
+        png = render()
+        with self._lock:
+            if key not in self._entries and len(png) <= self.max_bytes:
+                self._entries[key] = png
+                self._bytes += len(png)
+                while self._bytes > self.max_bytes:
+                    _, old = self._entries.popitem(last=False)
+                    self._bytes -= len(old)
+        return png
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._bytes, "hits": self.hits, "misses": self.misses}
+
+
+_cache = ChartCache()
+
+
+def _render(draw, figsize=(6.4, 4.8)):
+    """Run draw(ax) on a fresh Figure and return it as PNG bytes"""
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=figsize, dpi=DPI)
+    try:
+        draw(fig.add_subplot())
+        fig.tight_layout()
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format="png")
+        return buffer.getvalue()
+    finally:
+        fig.clear()
+
+
+def bar_chart(frame, x, y, color="skyblue", labels=True):
+    """PNG of a bar chart of y by x"""
+    def draw(ax):
+        ax.bar(frame[x].astype(str), frame[y], color=color)
+        if labels:
+            ax.set_xlabel(x)
+            ax.set_ylabel(y)
+        ax.tick_params(axis="x", labelrotation=45)
+        for label in ax.get_xticklabels():
+            label.set_horizontalalignment("right")
+
+    key = ("bar", data_hash(frame, [x, y]), color, labels)
+    return _cache.get(key, lambda: _render(draw))
+
+
+def pie_chart(frame, values, labels=None):
+    """PNG of a pie chart of values, optionally labelled by another column"""
+    def draw(ax):
+        ax.pie(frame[values], labels=frame[labels] if labels else None, autopct="%1.1f%%")
+        ax.axis("equal")
+
+    columns = [values, labels] if labels else [values]
+    key = ("pie", data_hash(frame, columns), labels)
+    return _cache.get(key, lambda: _render(draw))
+
+
+def cache_stats():
+    return _cache.stats()
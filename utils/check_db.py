@@ -1,6 +1,12 @@
+import os
 import sqlite3
+import sys
 
-conn = sqlite3.connect("cricbuzz.db")
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.db_connection import DB_PATH
+
+conn = sqlite3.connect(DB_PATH)
 cursor = conn.cursor()
 
 cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
@@ -0,0 +1,100 @@
+# utils/crud_batch.py
+"""Staged multi-row edits for the CRUD page.
+
+diff_rows() compares a page of rows before and after editing in the grid
+and returns the inserts, per-cell updates and deletes; apply_changes()
+writes them with executemany in a single transaction, so a batch of
+hundreds of edits costs one commit (one fsync) and either all of it lands
+or none of it does.
+"""
+from utils.db_connection import connection
+from utils.table_browser import describe
+
+
+class ChangeSet:
+    """inserts: [{col: value}], updates: [(pk, {col: (old, new)})], deletes: [pk]"""
+
+    __slots__ = ("inserts", "updates", "deletes")
+
+    def __init__(self, inserts=None, updates=None, deletes=None):
+        self.inserts = inserts or []
+        self.updates = updates or []
+        self.deletes = deletes or []
+
+    def __len__(self):
+        return len(self.inserts) + len(self.updates) + len(self.deletes)
+
+    def summary(self):
+        return f"{len(self.inserts)} inserts, {len(self.updates)} updates, {len(self.deletes)} deletes"
+
+
+def _clean(value):
+    """Plain Python value, with NaN / pandas NA as None"""
+    if value is None:
+        return None
+    if hasattr(value, "item"):
+        value = value.item()
+    try:
+        if value != value:
+            return None
+    except TypeError:
+        return None
+    return value
+
+
+def _row_id(value):
+    # Adding a row turns the grid's integer id column into floats
+    value = _clean(value)
+    return int(value) if isinstance(value, float) and value.is_integer() else value
+
+
+def diff_rows(pk, original, edited):
+    """Compare two lists of row dicts; rows in edited without a pk are inserts"""
+    before = {_row_id(row[pk]): row for row in original}
+    seen = set()
+    changes = ChangeSet()
+    for row in edited:
+        row_id = _row_id(row.get(pk))
+        values = {col: _clean(value) for col, value in row.items() if col != pk}
+        if row_id is None or row_id not in before:
+            if any(v is not None for v in values.values()):
+                changes.inserts.append({col: v for col, v in values.items() if v is not None})
+            continue
+        seen.add(row_id)
+        old = before[row_id]
+        changed = {col: (_clean(old.get(col)), new) for col, new in values.items() if _clean(old.get(col)) != new}
+        if changed:
+            changes.updates.append((row_id, changed))
+    changes.deletes = [row_id for row_id in before if row_id not in seen]
+    return changes
+
+
+def apply_changes(table, changes, db_path=None):
+    """Apply a ChangeSet to table in one transaction; raises sqlite3.Error (and rolls back) on any failure"""
+    with connection(db_path) as conn:
+        info = describe(conn, table)
+        pk = info.pk
+        unknown = {col for row in changes.inserts for col in row}
+        unknown |= {col for _, cols in changes.updates for col in cols}
+        unknown -= set(info.columns)
+        if unknown:
+            raise ValueError(f"Unknown column(s) for {table}: {', '.join(sorted(unknown))}")
+
+        # Rows touching the same columns share one prepared statement
+        inserts, updates = {}, {}
+        for row in changes.inserts:
+            inserts.setdefault(tuple(row), []).append(tuple(row.values()))
+        for row_id, cols in changes.updates:
+            updates.setdefault(tuple(cols), []).append((*(new for _, new in cols.values()), row_id))
+
+        with conn:
+            for columns, rows in inserts.items():
+                column_list = ", ".join(f'"{c}"' for c in columns)
+                conn.executemany(
+                    f'INSERT INTO "{table}" ({column_list}) VALUES ({", ".join("?" * len(columns))})', rows)
+            for columns, rows in updates.items():
+                assignments = ", ".join(f'"{c}" = ?' for c in columns)
+                conn.executemany(f'UPDATE "{table}" SET {assignments} WHERE "{pk}" = ?', rows)
+            if changes.deletes:
+                conn.executemany(f'DELETE FROM "{table}" WHERE "{pk}" = ?', [(row_id,) for row_id in changes.deletes])
+    return len(changes)
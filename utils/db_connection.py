@@ -1,18 +1,118 @@
 # utils/db_connection.py
-from sqlalchemy import create_engine, text
+"""Shared access to cricbuzz.db for the pages, poller and scripts.
 
-# Create SQLite DB (file = cricbuzz.db in project folder)
-engine = create_engine("sqlite:///cricbuzz.db", echo=True)
+The database path is absolute (CRICBUZZ_DB_PATH, or cricbuzz.db next to the
+project) so it does not depend on the working directory. Connections come
+from one pooled SQLAlchemy engine per database file; every new connection
+is switched to WAL journaling, so readers never block on the poller's
+writes, and gets the pragmas below. A checked-out connection belongs to one
+thread until it is returned.
+"""
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
 
-def test_connection():
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DB_PATH = os.path.abspath(os.getenv("CRICBUZZ_DB_PATH", os.path.join(PROJECT_ROOT, "cricbuzz.db")))
+
+BUSY_TIMEOUT = 10  # seconds to wait on another connection's write lock
+POOL_SIZE = 5
+POOL_MAX_OVERFLOW = 10
+PRAGMAS = {
+    "synchronous": "NORMAL",   # safe with WAL; fsync at checkpoints instead of every commit
+    "cache_size": -65536,      # 64 MiB page cache per connection
+    "mmap_size": 268435456,    # read up to 256 MiB through the OS page cache
+    "temp_store": "MEMORY",    # sorts and temp b-trees for GROUP BY / ORDER BY
+}
+
+_engines = {}
+_engines_lock = threading.Lock()
+
+
+def _apply_pragmas(dbapi_conn, connection_record=None):
+    cursor = dbapi_conn.cursor()
+    try:
+        cursor.execute("PRAGMA journal_mode = WAL")
+        for name, value in PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+    finally:
+        cursor.close()
+
+
+def get_engine(db_path=None):
+    """The pooled engine for db_path (default DB_PATH)"""
+    path = os.path.abspath(db_path or DB_PATH)
+    with _engines_lock:
+        engine = _engines.get(path)
+        if engine is None:
+            # Imported here: SQLAlchemy alone adds ~0.25 s to the import of every page and script
+            from sqlalchemy import create_engine, event
+
+            engine = create_engine(
+                f"sqlite:///{path}",
+                echo=False,
+                pool_size=POOL_SIZE,
+                max_overflow=POOL_MAX_OVERFLOW,
+                connect_args={"timeout": BUSY_TIMEOUT, "check_same_thread": False},
+            )
+            event.listen(engine, "connect", _apply_pragmas)
+            _engines[path] = engine
+        return engine
+
+
+def open_connection(db_path=None):
+    """A dedicated (unpooled) sqlite3 connection with the same pragmas, for long-lived holders"""
+    conn = sqlite3.connect(db_path or DB_PATH, timeout=BUSY_TIMEOUT)
+    _apply_pragmas(conn)
+    return conn
+
+
+@contextmanager
+def connection(db_path=None):
+    """Borrow a pooled sqlite3 connection; uncommitted work is rolled back when it is returned"""
+    pooled = get_engine(db_path).raw_connection()
+    conn = pooled.driver_connection
+    try:
+        yield conn
+    finally:
+        conn.row_factory = None
+        pooled.close()
+
+
+def read_sql(query, params=(), db_path=None):
+    """Run a query and return a DataFrame"""
+    import pandas as pd
+
+    with connection(db_path) as conn:
+        return pd.read_sql_query(query, conn, params=params)
+
+
+def execute(query, params=(), db_path=None):
+    """Run one write statement and commit it; returns the number of rows changed"""
+    with connection(db_path) as conn:
+        with conn:
+            return conn.execute(query, params).rowcount
+
+
+def __getattr__(name):
+    # Module-level `engine` is created on first use rather than at import
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def test_connection(db_path=None):
     """Test if SQLite database connection works"""
     try:
-        with engine.connect() as conn:
-            result = conn.execute(text("SELECT sqlite_version();"))
-            version = result.fetchone()
-            print("✅ Connected to SQLite DB, version:", version[0])
-            return True
+        conn = open_connection(db_path)
+        try:
+            version = conn.execute("SELECT sqlite_version();").fetchone()
+            journal_mode = conn.execute("PRAGMA journal_mode;").fetchone()[0]
+        finally:
+            conn.close()
+        print("✅ Connected to SQLite DB, version:", version[0], "journal:", journal_mode)
+        return True
     except Exception as e:
         print("❌ Database connection failed:", e)
         return False
-
@@ -1 +1,38 @@
- 
+# utils/helpers.py
+
+
+def extract_live_matches(matches):
+    """Flatten a /matches/v1/live response into a list of match dicts.
+
+    Walks typeMatches -> seriesMatches -> seriesAdWrapper -> matches ->
+    matchInfo and keeps only matches that have an id and both team names.
+    """
+    live_match_list = []
+    if not matches:
+        return live_match_list
+
+    for category in matches.get("typeMatches", []):
+        for match in category.get("seriesMatches", []):
+            series = match.get("seriesAdWrapper", {})
+            for m in series.get("matches", []):
+                match_info = m.get("matchInfo", {})
+                match_id = match_info.get("matchId")
+                team1 = match_info.get("team1", {}).get("teamName")
+                team2 = match_info.get("team2", {}).get("teamName")
+                match_desc = match_info.get("matchDesc", "Unknown Match")
+                venue = match_info.get("venueInfo", {}).get("ground", "Unknown Venue")
+
+                if match_id and team1 and team2:
+                    live_match_list.append({
+                        "id": match_id,
+                        "desc": f"{team1} vs {team2} - {match_desc} @ {venue}",
+                        "series_name": series.get("seriesName") or match_info.get("seriesName"),
+                        "team1": team1,
+                        "team2": team2,
+                        "match_desc": match_desc,
+                        "venue": venue,
+                        "match_format": match_info.get("matchFormat"),
+                        "state": match_info.get("state"),
+                        "status": match_info.get("status"),
+                    })
+    return live_match_list
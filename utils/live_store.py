@@ -0,0 +1,178 @@
+# utils/live_store.py
+import json
+import sqlite3
+import time
+
+from utils.ball_events import diff_states, scorecard_state
+from utils.db_connection import DB_PATH, connection, open_connection
+from utils.migrations import ensure_migrated
+from utils.scorecard_parser import parse_scorecard, payload_fingerprint
+
+
+def connect(db_path=DB_PATH):
+    """Open a dedicated connection for the poller, which holds it for its whole run"""
+    ensure_migrated(db_path)
+    return open_connection(db_path)
+
+
+# -------------------------
+# Writes (poller)
+# -------------------------
+def save_live_matches(conn, live_match_list):
+    """Replace the live match list with the latest poll"""
+    now = time.time()
+    with conn:
+        conn.execute("DELETE FROM live_matches")
+        conn.executemany(
+            """INSERT INTO live_matches
+               (match_id, series_name, team1, team2, match_desc, venue, match_format, state, status, updated_at)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            [
+                (m["id"], m["series_name"], m["team1"], m["team2"], m["match_desc"],
+                 m["venue"], m["match_format"], m["state"], m["status"], now)
+                for m in live_match_list
+            ],
+        )
+
+
+def save_scorecard(conn, match_id, payload, fingerprint=None):
+    """Upsert the latest scorecard snapshot and its per-innings summary"""
+    now = time.time()
+    if fingerprint is None:
+        fingerprint = payload_fingerprint(payload)
+    with conn:
+        conn.execute(
+            """INSERT INTO live_scorecards (match_id, fetched_at, payload, fingerprint) VALUES (?, ?, ?, ?)
+               ON CONFLICT(match_id) DO UPDATE SET
+                   fetched_at = excluded.fetched_at, payload = excluded.payload, fingerprint = excluded.fingerprint""",
+            (match_id, now, json.dumps(payload), fingerprint),
+        )
+        conn.executemany(
+            """INSERT INTO live_innings (match_id, innings_id, bat_team, runs, wickets, overs, fetched_at)
+               VALUES (?, ?, ?, ?, ?, ?, ?)
+               ON CONFLICT(match_id, innings_id) DO UPDATE SET
+                   bat_team = excluded.bat_team, runs = excluded.runs, wickets = excluded.wickets,
+                   overs = excluded.overs, fetched_at = excluded.fetched_at""",
+            [(match_id, *row, now) for row in _innings_summary(payload)],
+        )
+
+
+def stored_fingerprints(conn):
+    """{match_id: fingerprint} of the stored scorecard snapshots"""
+    return dict(conn.execute("SELECT match_id, fingerprint FROM live_scorecards"))
+
+
+def touch_scorecard(conn, match_id):
+    """Mark an unchanged snapshot as freshly checked; returns False if there is none to touch"""
+    with conn:
+        return conn.execute(
+            "UPDATE live_scorecards SET fetched_at = ? WHERE match_id = ?", (time.time(), match_id)
+        ).rowcount > 0
+
+
+def record_events(conn, match_id, payload):
+    """Append the events since the previous poll of this match; returns how many were added"""
+    state = scorecard_state(payload)
+    encoded = json.dumps(state, separators=(",", ":"))
+    now = time.time()
+    with conn:
+        row = conn.execute("SELECT state FROM live_event_state WHERE match_id = ?", (match_id,)).fetchone()
+        if row is not None and row[0] == encoded:
+            return 0
+        events = diff_states(json.loads(row[0]) if row else None, state)
+        conn.executemany(
+            """INSERT INTO live_events
+               (match_id, innings_id, ball, kind, player_id, player_name, runs, detail, recorded_at)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            [(match_id, *event, now) for event in events],
+        )
+        conn.execute(
+            """INSERT INTO live_event_state (match_id, state) VALUES (?, ?)
+               ON CONFLICT(match_id) DO UPDATE SET state = excluded.state""",
+            (match_id, encoded),
+        )
+    return len(events)
+
+
+def load_events(match_id, after_event_id=0, db_path=DB_PATH):
+    """Return events of a match newer than after_event_id, oldest first"""
+    ensure_migrated(db_path)
+    with connection(db_path) as conn:
+        conn.row_factory = sqlite3.Row
+        rows = conn.execute(
+            "SELECT * FROM live_events WHERE match_id = ? AND event_id > ? ORDER BY event_id",
+            (match_id, after_event_id),
+        ).fetchall()
+    return [dict(r) for r in rows]
+
+
+def _innings_summary(payload):
+    """Yield (innings_id, bat_team, runs, wickets, overs) for each innings in a scorecard"""
+    for inn in parse_scorecard(payload).innings:
+        yield inn.innings_id, inn.bat_team, inn.runs, inn.wickets, inn.overs
+
+
+# -------------------------
+# Reads (pages)
+# -------------------------
+def load_live_matches(max_age, db_path=DB_PATH):
+    """Return the polled live match list, or None if it is missing or older than max_age seconds"""
+    try:
+        ensure_migrated(db_path)
+        with connection(db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute("SELECT * FROM live_matches ORDER BY match_id").fetchall()
+    except sqlite3.Error:
+        return None
+
+    if not rows or time.time() - rows[0]["updated_at"] > max_age:
+        return None
+    return [
+        {
+            "id": r["match_id"],
+            "desc": f"{r['team1']} vs {r['team2']} - {r['match_desc']} @ {r['venue']}",
+            "series_name": r["series_name"],
+            "team1": r["team1"],
+            "team2": r["team2"],
+            "match_desc": r["match_desc"],
+            "venue": r["venue"],
+            "match_format": r["match_format"],
+            "state": r["state"],
+            "status": r["status"],
+        }
+        for r in rows
+    ]
+
+
+def scorecard_version(match_id, db_path=DB_PATH):
+    """(fetched_at, fingerprint) of the latest snapshot without reading its payload, or (None, None)"""
+    try:
+        ensure_migrated(db_path)
+        with connection(db_path) as conn:
+            row = conn.execute(
+                "SELECT fetched_at, fingerprint FROM live_scorecards WHERE match_id = ?", (match_id,)
+            ).fetchone()
+    except sqlite3.Error:
+        return None, None
+    return row if row else (None, None)
+
+
+def load_scorecard(match_id, max_age, db_path=DB_PATH):
+    """Return (payload, fetched_at) for the latest snapshot, or (None, None) if missing or stale"""
+    return load_scorecard_versioned(match_id, max_age, db_path)[:2]
+
+
+def load_scorecard_versioned(match_id, max_age, db_path=DB_PATH):
+    """Like load_scorecard, but returns (payload, fetched_at, fingerprint); fingerprint may be None"""
+    try:
+        ensure_migrated(db_path)
+        with connection(db_path) as conn:
+            row = conn.execute(
+                "SELECT payload, fetched_at, fingerprint FROM live_scorecards WHERE match_id = ?", (match_id,)
+            ).fetchone()
+    except sqlite3.Error:
+        return None, None, None
+
+    if row is None or time.time() - row[1] > max_age:
+        return None, None, None
+    return json.loads(row[0]), row[1], row[2]
@@ -0,0 +1,238 @@
+# utils/metrics.py
+"""In-process latency histograms and counters, exported in Prometheus text format.
+
+Hooks in the API client, the response and query caches, the SQL Analytics
+queries and the pages record into one process-wide registry:
+
+    cricbuzz_api_request_seconds{endpoint}         one get_json call, retries included
+    cricbuzz_api_responses_total{endpoint,status}  every attempt; status "error" for timeouts / connection errors
+    cricbuzz_api_errors_total{endpoint}            calls that failed after retries
+    cricbuzz_api_cache_total{endpoint,result}      response cache hit / stale / miss / negative
+    cricbuzz_api_unchanged_total{endpoint,reason}  bodies not decoded: not_modified (304) / same_body
+    cricbuzz_query_seconds{query}                  SQL executions (cache misses), Q1..Q25, "custom" or crud_<statement>
+    cricbuzz_query_errors_total{query}
+    cricbuzz_query_cache_total{result}             query cache hit / miss
+    cricbuzz_page_render_seconds{page}             one script run of a page
+
+Histograms use fixed buckets for Prometheus and also keep the most recent
+observations per series, from which the diagnostics page reads p50 / p99.
+Set CRICBUZZ_METRICS_FILE to have the text rewritten every few seconds (for
+node_exporter's textfile collector) and/or CRICBUZZ_METRICS_PORT to serve it
+at http://<host>:<port>/metrics.
+"""
+import math
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import contextmanager
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+RECENT_SAMPLES = 1024      # observations kept per histogram series for quantiles
+FILE_INTERVAL = 15         # seconds between rewrites of CRICBUZZ_METRICS_FILE
+
+METRICS_FILE = os.getenv("CRICBUZZ_METRICS_FILE")
+METRICS_PORT = os.getenv("CRICBUZZ_METRICS_PORT")
+
+HELP = {
+    "cricbuzz_api_request_seconds": ("histogram", "Cricbuzz API call latency, retries included"),
+    "cricbuzz_api_responses_total": ("counter", "Cricbuzz API attempts by HTTP status"),
+    "cricbuzz_api_errors_total": ("counter", "Cricbuzz API calls that failed after retries"),
+    "cricbuzz_api_cache_total": ("counter", "API response cache lookups by result"),
+    "cricbuzz_api_unchanged_total": ("counter", "API responses reused without decoding"),
+    "cricbuzz_query_seconds": ("histogram", "SQL Analytics and CRUD query execution time"),
+    "cricbuzz_query_errors_total": ("counter", "SQL Analytics and CRUD queries that raised"),
+    "cricbuzz_query_cache_total": ("counter", "Query result cache lookups by result"),
+    "cricbuzz_page_render_seconds": ("histogram", "Streamlit page script run time"),
+}
+
+
+class Histogram:
+    __slots__ = ("buckets", "count", "sum", "recent")
+
+    def __init__(self):
+        self.buckets = [0] * len(BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+        self.recent = deque(maxlen=RECENT_SAMPLES)
+
+    def observe(self, value):
+        index = bisect_left(BUCKETS, value)
+        if index < len(BUCKETS):
+            self.buckets[index] += 1
+        self.count += 1
+        self.sum += value
+        self.recent.append(value)
+
+    def quantile(self, q):
+        """q-quantile (0..1) of the recent observations, or NaN when there are none"""
+        if not self.recent:
+            return math.nan
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class Registry:
+    def __init__(self):
+        self._histograms = {}  # (name, labels) -> Histogram
+        self._counters = {}    # (name, labels) -> float
+        self._lock = threading.Lock()
+
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(value)
+
+    def inc(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def histograms(self):
+        """[(name, labels dict, count, sum, p50, p99)]"""
+        with self._lock:
+            return [(name, dict(labels), h.count, h.sum, h.quantile(0.5), h.quantile(0.99))
+                    for (name, labels), h in sorted(self._histograms.items())]
+
+    def counters(self):
+        """[(name, labels dict, value)]"""
+        with self._lock:
+            return [(name, dict(labels), value) for (name, labels), value in sorted(self._counters.items())]
+
+    def clear(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def render(self):
+        """All series in Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            counters = sorted(self._counters.items())
+        for name in sorted({key[0] for key, _ in histograms} | {key[0] for key, _ in counters}):
+            kind, text = HELP.get(name, ("untyped", name))
+            lines.append(f"# HELP {name} {text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for (series, labels), value in counters:
+                if series == name:
+                    lines.append(f"{name}{_labels(labels)} {value}")
+            for (series, labels), h in histograms:
+                if series != name:
+                    continue
+                cumulative = 0
+                for bound, count in zip(BUCKETS, h.buckets):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_labels(labels + (('le', repr(bound)),))} {cumulative}")
+                lines.append(f"{name}_bucket{_labels(labels + (('le', '+Inf'),))} {h.count}")
+                lines.append(f"{name}_sum{_labels(labels)} {h.sum}")
+                lines.append(f"{name}_count{_labels(labels)} {h.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in labels)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(labels, escaped)) + "}"
+
+
+registry = Registry()
+observe = registry.observe
+inc = registry.inc
+render = registry.render
+
+
+@contextmanager
+def timer(name, **labels):
+    """Observe the time spent in the with block, whether or not it raises"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        registry.observe(name, time.perf_counter() - started, **labels)
+
+
+class PageTimer:
+    """Started at the top of a page script; done() at the bottom records the run"""
+
+    __slots__ = ("page", "started")
+
+    def __init__(self, page):
+        self.page = page
+        self.started = time.perf_counter()
+        start_exporters()
+
+    def done(self):
+        registry.observe("cricbuzz_page_render_seconds", time.perf_counter() - self.started, page=self.page)
+
+
+# -------------------------
+# Exporters
+# -------------------------
+_exporters_started = False
+_exporters_lock = threading.Lock()
+
+
+def write_file(path):
+    """Write the current metrics to path atomically"""
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        f.write(render())
+    os.replace(tmp, path)
+
+
+def _file_loop(path):
+    while True:
+        try:
+            write_file(path)
+        except OSError as e:
+            print(f"❌ Could not write metrics to {path}: {e}")
+        time.sleep(FILE_INTERVAL)
+
+
+def serve(port, host="0.0.0.0"):
+    """Serve GET /metrics on a daemon thread; returns the server"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True, name="metrics-http").start()
+    return server
+
+
+def start_exporters():
+    """Start the file writer / HTTP endpoint configured in the environment, once per process"""
+    global _exporters_started
+    if _exporters_started:
+        return
+    with _exporters_lock:
+        if _exporters_started:
+            return
+        _exporters_started = True
+        if METRICS_FILE:
+            threading.Thread(target=_file_loop, args=(METRICS_FILE,), daemon=True, name="metrics-file").start()
+        if METRICS_PORT:
+            try:
+                serve(int(METRICS_PORT))
+                print(f"✅ Metrics at http://0.0.0.0:{METRICS_PORT}/metrics")
+            except OSError as e:
+                print(f"❌ Could not serve metrics on port {METRICS_PORT}: {e}")
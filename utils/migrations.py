@@ -0,0 +1,124 @@
+# utils/migrations.py
+"""Versioned schema migrations for cricbuzz.db.
+
+Migrations live in migrations/NNNN_description.sql and are applied in order,
+each in its own transaction, and recorded in the schema_version table.
+Running migrate() again only applies what is new, so existing data is kept.
+
+Databases created by the old DROP-and-recreate schema.sql have the 0001
+tables but no schema_version; they are baselined at version 1 instead of
+having the sample data inserted a second time.
+"""
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime, timezone
+
+from utils.db_connection import DB_PATH
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "migrations")
+
+MIGRATION_RE = re.compile(r"^(\d{4})_(\w+)\.sql$")
+
+_migrated = set()
+_migrate_lock = threading.Lock()
+
+
+def list_migrations(migrations_dir=MIGRATIONS_DIR):
+    """Return [(version, name, path)] sorted by version"""
+    migrations = []
+    for filename in os.listdir(migrations_dir):
+        match = MIGRATION_RE.match(filename)
+        if match:
+            migrations.append((int(match.group(1)), match.group(2), os.path.join(migrations_dir, filename)))
+    return sorted(migrations)
+
+
+def _statements(sql_script):
+    """Split a script into complete statements (trigger bodies stay whole)"""
+    statement = ""
+    for line in sql_script.splitlines(keepends=True):
+        if not statement and (not line.strip() or line.lstrip().startswith("--")):
+            continue
+        statement += line
+        if sqlite3.complete_statement(statement):
+            yield statement.strip()
+            statement = ""
+    if statement.strip():
+        yield statement.strip()
+
+
+def current_version(conn):
+    conn.execute(
+        """CREATE TABLE IF NOT EXISTS schema_version (
+               version    INTEGER PRIMARY KEY,
+               name       TEXT NOT NULL,
+               applied_at TEXT NOT NULL
+           )"""
+    )
+    version = conn.execute("SELECT MAX(version) FROM schema_version").fetchone()[0]
+    if version is None:
+        legacy = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'players'").fetchone()
+        if legacy:
+            _record(conn, 1, "initial (baselined)")
+            conn.commit()
+            return 1
+        return 0
+    return version
+
+
+def _record(conn, version, name):
+    conn.execute(
+        "INSERT OR IGNORE INTO schema_version (version, name, applied_at) VALUES (?, ?, ?)",
+        (version, name, datetime.now(timezone.utc).isoformat(timespec="seconds")),
+    )
+
+
+def _apply(conn, version, name, path):
+    """Run one migration in a transaction; returns False if another process already applied it"""
+    with open(path, "r") as f:
+        sql_script = f.read()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        if conn.execute("SELECT 1 FROM schema_version WHERE version = ?", (version,)).fetchone():
+            conn.rollback()
+            return False
+        for statement in _statements(sql_script):
+            try:
+                conn.execute(statement)
+            except sqlite3.OperationalError as e:
+                # Columns added by hand (or by an old schema.sql) are fine to keep
+                if "duplicate column name" not in str(e):
+                    raise
+        _record(conn, version, name)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return True
+
+
+def migrate(db_path=DB_PATH, migrations_dir=MIGRATIONS_DIR):
+    """Apply every pending migration; returns the list of versions applied"""
+    conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+    try:
+        applied = []
+        version = current_version(conn)
+        for mig_version, name, path in list_migrations(migrations_dir):
+            if mig_version > version and _apply(conn, mig_version, name, path):
+                applied.append(mig_version)
+        return applied
+    finally:
+        conn.close()
+
+
+def ensure_migrated(db_path=DB_PATH):
+    """migrate() once per process and database; cheap to call from anywhere"""
+    key = os.path.abspath(db_path)
+    if key in _migrated:
+        return
+    with _migrate_lock:
+        if key not in _migrated:
+            migrate(db_path)
+            _migrated.add(key)
@@ -0,0 +1,180 @@
+# utils/player_store.py
+"""Normalize Cricbuzz player profiles and career tables into players / player_stats.
+
+The batting and bowling career endpoints return one column per format
+(Test, ODI, T20, IPL, ...) and one row per statistic; they are folded into
+one player_stats row per format the schema knows. Players are matched on
+cricbuzz_id, then (for players added by hand or by schema seeds) on
+full_name + country, and only inserted when neither matches.
+"""
+import time
+from datetime import datetime
+
+from utils.scorecard_parser import payload_fingerprint
+
+# Career table column -> schema format; league columns like IPL are skipped
+FORMATS = {"Test": "Test", "ODI": "ODI", "T20": "T20", "T20I": "T20"}
+
+BATTING_FIELDS = {
+    "Matches": "matches",
+    "Runs": "total_runs",
+    "Average": "batting_avg",
+    "SR": "strike_rate",
+    "Highest": "highest_score",
+    "100s": "centuries",
+    "50s": "fifties",
+    "Sixes": "sixes",
+}
+BOWLING_FIELDS = {
+    "Wickets": "wickets",
+    "Avg": "bowling_avg",
+    "Eco": "economy",
+    "5w": "five_wkts",
+}
+INTEGER_FIELDS = {"matches", "total_runs", "highest_score", "centuries", "fifties", "sixes", "wickets", "five_wkts"}
+
+
+def _number(value, column):
+    """'254*' -> 254, '46.85' -> 46.85, '-' / '' -> None"""
+    value = str(value).strip().rstrip("*")
+    if value in ("", "-", "--"):
+        return None
+    try:
+        return int(float(value)) if column in INTEGER_FIELDS else float(value)
+    except ValueError:
+        return None
+
+
+def parse_career(batting, bowling):
+    """Return {format: {column: value}} from the batting and bowling career payloads"""
+    stats = {}
+    for payload, fields in ((batting, BATTING_FIELDS), (bowling, BOWLING_FIELDS)):
+        if not payload:
+            continue
+        headers = payload.get("headers") or []
+        for row in payload.get("values") or []:
+            values = row.get("values") or []
+            column = fields.get(values[0]) if values else None
+            if column is None:
+                continue
+            for header, value in zip(headers[1:], values[1:]):
+                fmt = FORMATS.get(header)
+                if fmt is None:
+                    continue
+                number = _number(value, column)
+                if number is not None:
+                    stats.setdefault(fmt, {})[column] = number
+    return stats
+
+
+def parse_profile(profile):
+    """Return the players columns found in a profile payload"""
+    dob = None
+    if profile.get("DoB"):
+        try:
+            dob = datetime.strptime(profile["DoB"].split("(")[0].strip(), "%B %d, %Y").date().isoformat()
+        except ValueError:
+            pass
+    return {
+        "full_name": profile.get("name"),
+        "playing_role": profile.get("role"),
+        "batting_style": profile.get("bat"),
+        "bowling_style": profile.get("bowl"),
+        "country": profile.get("intlTeam"),
+        "date_of_birth": dob,
+    }
+
+
+def career_hash(batting, bowling):
+    return payload_fingerprint({"batting": batting, "bowling": bowling})
+
+
+# -------------------------
+# Reads
+# -------------------------
+def refresh_state(conn, cricbuzz_ids):
+    """{cricbuzz_id: (player_id, refreshed_at, content_hash)} for ids already ingested or linked"""
+    state = {}
+    ids = list(cricbuzz_ids)
+    for start in range(0, len(ids), 500):
+        chunk = ids[start:start + 500]
+        marks = ", ".join("?" * len(chunk))
+        for cricbuzz_id, player_id in conn.execute(
+                f"SELECT cricbuzz_id, player_id FROM players WHERE cricbuzz_id IN ({marks})", chunk):
+            state[cricbuzz_id] = (player_id, 0.0, None)
+        for row in conn.execute(
+                f"SELECT cricbuzz_id, player_id, refreshed_at, content_hash FROM player_refresh "
+                f"WHERE cricbuzz_id IN ({marks})", chunk):
+            state[row[0]] = row[1:]
+    return state
+
+
+def linked_player_ids(conn):
+    """Every cricbuzz_id already linked to a player, least recently refreshed first"""
+    return [row[0] for row in conn.execute(
+        """SELECT p.cricbuzz_id FROM players p
+           LEFT JOIN player_refresh r ON r.cricbuzz_id = p.cricbuzz_id
+           WHERE p.cricbuzz_id IS NOT NULL
+           ORDER BY COALESCE(r.refreshed_at, 0)""")]
+
+
+# -------------------------
+# Writes
+# -------------------------
+def _link_player(conn, cricbuzz_id, profile):
+    """player_id for cricbuzz_id, linking or inserting the player from profile when needed"""
+    row = conn.execute("SELECT player_id FROM players WHERE cricbuzz_id = ?", (cricbuzz_id,)).fetchone()
+    if row is not None:
+        player_id = row[0]
+    elif profile is None or not profile.get("full_name") or not profile.get("country"):
+        raise ValueError(f"No profile to add player {cricbuzz_id}")
+    else:
+        row = conn.execute(
+            "SELECT player_id FROM players WHERE cricbuzz_id IS NULL AND full_name = ? AND country = ? LIMIT 1",
+            (profile["full_name"], profile["country"]),
+        ).fetchone()
+        if row is not None:
+            player_id = row[0]
+            conn.execute("UPDATE players SET cricbuzz_id = ? WHERE player_id = ?", (cricbuzz_id, player_id))
+        else:
+            player_id = conn.execute(
+                "INSERT INTO players (full_name, country, cricbuzz_id) VALUES (?, ?, ?)",
+                (profile["full_name"], profile["country"], cricbuzz_id),
+            ).lastrowid
+
+    if profile is not None:
+        details = {k: v for k, v in profile.items() if v is not None and k not in ("full_name", "country")}
+        if details:
+            assignments = ", ".join(f"{column} = ?" for column in details)
+            conn.execute(f"UPDATE players SET {assignments} WHERE player_id = ?", (*details.values(), player_id))
+    return player_id
+
+
+def save_player(conn, cricbuzz_id, profile, career, content_hash):
+    """Upsert one player's profile and per-format stats and mark it refreshed; returns player_id"""
+    with conn:
+        player_id = _link_player(conn, cricbuzz_id, profile)
+        for fmt, columns in career.items():
+            assignments = ", ".join(f"{column} = ?" for column in columns)
+            updated = conn.execute(
+                f"UPDATE player_stats SET {assignments} WHERE player_id = ? AND format = ?",
+                (*columns.values(), player_id, fmt),
+            ).rowcount
+            if not updated:
+                conn.execute(
+                    f"INSERT INTO player_stats (player_id, format, {', '.join(columns)}) "
+                    f"VALUES (?, ?, {', '.join('?' * len(columns))})",
+                    (player_id, fmt, *columns.values()),
+                )
+        mark_refreshed(conn, cricbuzz_id, player_id, content_hash)
+    return player_id
+
+
+def mark_refreshed(conn, cricbuzz_id, player_id, content_hash):
+    conn.execute(
+        """INSERT INTO player_refresh (cricbuzz_id, player_id, refreshed_at, content_hash) VALUES (?, ?, ?, ?)
+           ON CONFLICT(cricbuzz_id) DO UPDATE SET
+               player_id = excluded.player_id, refreshed_at = excluded.refreshed_at,
+               content_hash = excluded.content_hash""",
+        (cricbuzz_id, player_id, time.time(), content_hash),
+    )
@@ -0,0 +1,162 @@
+# utils/queries.py
+# Predefined analytics queries (all 25 from Cricbuzz.pdf), shared by the
+# SQL Analytics page and benchmarks/run_queries.py.
+# Country and career aggregates read the trigger-maintained rollup tables
+# (country_totals, player_totals) from migration 0005.
+
+QUERIES = {
+    "Q1. List all players with their country and role": """
+        SELECT full_name, country, playing_role FROM players;
+    """,
+    "Q2. Total number of players per country": """
+        SELECT country, players AS total_players FROM country_totals
+        WHERE players > 0
+        ORDER BY total_players DESC;
+    """,
+    "Q3. Find players with more than 50 centuries": """
+        SELECT p.full_name, ps.centuries FROM player_stats ps
+        JOIN players p ON ps.player_id = p.player_id
+        WHERE ps.centuries > 50;
+    """,
+    "Q4. Average runs scored by players in ODI": """
+        SELECT AVG(batting_avg) AS avg_batting_average FROM player_stats WHERE format = 'ODI';
+    """,
+    "Q5. Count of players by role": """
+        SELECT playing_role, COUNT(*) AS player_count FROM players GROUP BY playing_role;
+    """,
+    "Q6. Top 10 ODI run scorers": """
+        SELECT p.full_name, ps.total_runs, ps.batting_avg, ps.centuries
+        FROM player_stats ps
+        JOIN players p ON p.player_id = ps.player_id
+        WHERE ps.format = 'ODI'
+        ORDER BY ps.total_runs DESC
+        LIMIT 10;
+    """,
+    "Q7. Top 10 wicket takers (ODI)": """
+        SELECT p.full_name, ps.wickets, ps.bowling_avg, ps.five_wkts
+        FROM player_stats ps
+        JOIN players p ON p.player_id = ps.player_id
+        WHERE ps.format = 'ODI'
+        ORDER BY ps.wickets DESC
+        LIMIT 10;
+    """,
+    "Q8. Players with strike rate above 150 in T20": """
+        SELECT p.full_name, ps.strike_rate
+        FROM player_stats ps
+        JOIN players p ON p.player_id = ps.player_id
+        WHERE ps.format = 'T20' AND ps.strike_rate > 150;
+    """,
+    "Q9. Highest individual score per format": """
+        SELECT format, MAX(highest_score) AS highest_score
+        FROM player_stats GROUP BY format;
+    """,
+    "Q10. Players who played in more than 200 matches": """
+        SELECT p.full_name, ps.matches
+        FROM player_stats ps
+        JOIN players p ON p.player_id = ps.player_id
+        WHERE ps.matches > 200;
+    """,
+    "Q11. Players with more than 400 wickets": """
+        SELECT p.full_name, ps.wickets
+        FROM player_stats ps
+        JOIN players p ON p.player_id = ps.player_id
+        WHERE ps.wickets > 400;
+    """,
+    "Q12. Average economy rate of bowlers in ODI": """
+        SELECT AVG(economy) AS avg_economy
+        FROM player_stats
+        WHERE format = 'ODI' AND economy IS NOT NULL;
+    """,
+    "Q13. Players with most fifties": """
+        SELECT p.full_name, ps.fifties
+        FROM player_stats ps
+        JOIN players p ON p.player_id = ps.player_id
+        ORDER BY ps.fifties DESC
+        LIMIT 10;
+    """,
+    "Q14. Country with most centuries by players": """
+        SELECT country, centuries AS total_centuries
+        FROM country_totals
+        WHERE stat_rows > 0
+        ORDER BY total_centuries DESC
+        LIMIT 5;
+    """,
+    "Q15. Youngest player in database": """
+        SELECT full_name, country, date_of_birth
+        FROM players
+        ORDER BY date_of_birth DESC
+        LIMIT 1;
+    """,
+    "Q16. Oldest player in database": """
+        SELECT full_name, country, date_of_birth
+        FROM players
+        ORDER BY date_of_birth ASC
+        LIMIT 1;
+    """,
+    "Q17. Players with more than 100 catches": """
+        SELECT p.full_name, ps.catches
+        FROM player_stats ps
+        JOIN players p ON ps.player_id = p.player_id
+        WHERE ps.catches > 100;
+    """,
+    "Q18. Countries with most players": """
+        SELECT country, players AS total_players
+        FROM country_totals
+        WHERE players > 0
+        ORDER BY total_players DESC
+        LIMIT 10;
+    """,
+    "Q19. Players with highest batting average in ODI (min 1000 runs)": """
+        SELECT p.full_name, ps.batting_avg
+        FROM player_stats ps
+        JOIN players p ON ps.player_id = p.player_id
+        WHERE ps.format = 'ODI' AND ps.total_runs > 1000
+        ORDER BY ps.batting_avg DESC
+        LIMIT 10;
+    """,
+    "Q20. Players with most sixes in T20": """
+        SELECT p.full_name, ps.sixes
+        FROM player_stats ps
+        JOIN players p ON ps.player_id = p.player_id
+        WHERE ps.format = 'T20'
+        ORDER BY ps.sixes DESC
+        LIMIT 10;
+    """,
+    "Q21. Country with highest number of wickets": """
+        SELECT country, wickets AS total_wickets
+        FROM country_totals
+        WHERE stat_rows > 0
+        ORDER BY total_wickets DESC
+        LIMIT 5;
+    """,
+    "Q22. Players with highest strike rate in ODI": """
+        SELECT p.full_name, ps.strike_rate
+        FROM player_stats ps
+        JOIN players p ON ps.player_id = p.player_id
+        WHERE ps.format = 'ODI'
+        ORDER BY ps.strike_rate DESC
+        LIMIT 10;
+    """,
+    "Q23. Total matches played by each country": """
+        SELECT country, matches AS total_matches
+        FROM country_totals
+        WHERE stat_rows > 0
+        ORDER BY total_matches DESC
+        LIMIT 10;
+    """,
+    "Q24. Players with more than 10,000 runs across formats": """
+        SELECT p.full_name, t.runs AS career_runs
+        FROM player_totals t
+        JOIN players p ON t.player_id = p.player_id
+        WHERE t.runs > 10000
+        ORDER BY career_runs DESC;
+    """,
+    "Q25. Top 10 all-rounders (runs + wickets)": """
+        SELECT p.full_name, t.runs, t.wickets
+        FROM player_totals t
+        JOIN players p ON t.player_id = p.player_id
+        WHERE t.stat_rows > 0
+        ORDER BY t.runs + t.wickets DESC
+        LIMIT 10;
+    """
+}
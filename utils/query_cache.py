@@ -0,0 +1,139 @@
+# utils/query_cache.py
+"""Process-wide cache of SQL query results, invalidated by database writes.
+
+Results are keyed by normalized SQL text and parameters, plus a data token:
+SQLite's PRAGMA data_version (read on a private watcher connection, so it
+moves whenever any other connection or process commits) and a local write
+sequence that pages bump through invalidate() after their own writes. When
+the token changes every older result is dropped at once, so a write is
+visible on the very next query instead of after a TTL.
+
+Entries are evicted least-recently-used once their estimated size exceeds
+the memory budget. A hit returns the cached DataFrame object itself; a page
+that wants to sort it in place or add columns must copy() it first.
+"""
+import os
+import re
+import sqlite3
+import sys
+import threading
+from collections import OrderedDict
+
+from utils import metrics
+from utils.db_connection import DB_PATH
+
+QUERY_CACHE_MAX_BYTES = int(os.getenv("CRICBUZZ_QUERY_CACHE_MB", "64")) * 1024 * 1024
+
+CACHEABLE_RE = re.compile(r"^\s*(SELECT|WITH)\b", re.IGNORECASE)
+# Quoted strings are kept verbatim; comments and runs of whitespace outside them become one space
+SQL_TOKEN_RE = re.compile(r"('(?:[^']|'')*'|\"(?:[^\"]|\"\")*\")|--[^\n]*|\s+")
+
+
+def normalize_sql(sql):
+    """Collapse comments and whitespace so formatting changes share an entry"""
+    normalized = SQL_TOKEN_RE.sub(lambda m: m.group(1) or " ", sql)
+    return normalized.strip().rstrip("; ")
+
+
+def _frame_bytes(result):
+    try:
+        return int(result.memory_usage(index=True, deep=True).sum())
+    except AttributeError:
+        return sys.getsizeof(result)
+
+
+class QueryCache:
+    """LRU cache of query results for one database file, bounded by max_bytes"""
+
+    def __init__(self, db_path=DB_PATH, max_bytes=QUERY_CACHE_MAX_BYTES):
+        self.db_path = db_path
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # (sql, params) -> (result, size)
+        self._bytes = 0
+        self._token = None
+        self._write_seq = 0
+        self._watcher = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, sql, params, run):
+        """Return the result of sql, calling run() and caching its result on a miss"""
+        normalized = normalize_sql(sql)
+        if not CACHEABLE_RE.match(normalized):
+            return run()
+        cache_key = (normalized, tuple(params or ()))
+        with self._lock:
+            self._check_token()
+            token = self._token
+            entry = self._entries.get(cache_key)
+            if entry is not None:
+                self._entries.move_to_end(cache_key)
+                self.hits += 1
+                metrics.inc("cricbuzz_query_cache_total", result="hit")
+                return entry[0]
+            self.misses += 1
+        metrics.inc("cricbuzz_query_cache_total", result="miss")
+
+        result = run()
+        self._store(cache_key, token, result)
+        return result
+
+    def invalidate(self):
+        """Drop every cached result; call after committing a write"""
+        with self._lock:
+            self._write_seq += 1
+            self._check_token()
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._bytes, "max_bytes": self.max_bytes,
+                    "hits": self.hits, "misses": self.misses}
+
+    def _data_version(self):
+        if self._watcher is None:
+            self._watcher = sqlite3.connect(self.db_path, check_same_thread=False)
+        return self._watcher.execute("PRAGMA data_version").fetchone()[0]
+
+    def _check_token(self):
+        """Clear the cache if the database changed since the last look (lock held)"""
+        token = (self._data_version(), self._write_seq)
+        if token != self._token:
+            self._entries.clear()
+            self._bytes = 0
+            self._token = token
+
+    def _store(self, cache_key, token, result):
+        size = _frame_bytes(result)
+        with self._lock:
+            # A write landed while the query ran: the result may already be stale
+            self._check_token()
+            if token != self._token or size > self.max_bytes:
+                return
+            old = self._entries.pop(cache_key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[cache_key] = (result, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(db_path=DB_PATH):
+    """The shared QueryCache for db_path"""
+    key = os.path.abspath(db_path)
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = _caches[key] = QueryCache(db_path)
+        return cache
+
+
+def invalidate(db_path=DB_PATH):
+    """Drop cached results for db_path after a write"""
+    get_cache(db_path).invalidate()
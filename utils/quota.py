@@ -0,0 +1,248 @@
+# utils/quota.py
+"""Quota-aware scheduling for RapidAPI calls.
+
+Every upstream request takes a token from QuotaScheduler first:
+
+- a token bucket sized from the plan's per-minute limit smooths bursts
+- the per-minute limit itself is enforced across processes: slots are claimed
+  from a per-minute row in SQLite (api_quota_minute), so N Streamlit workers
+  plus the poller together stay within the plan
+- waiting callers are served strictly by priority, so the scorecard a user is
+  looking at goes ahead of background refreshes
+- a monthly ledger in SQLite (api_quota_ledger) survives restarts and is shared by every
+  process using the same database; low-priority calls stop early so the last
+  part of the month's budget is kept for viewers
+"""
+import heapq
+import itertools
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+
+from utils.db_connection import DB_PATH, connection
+from utils.migrations import ensure_migrated
+
+# Plan limits, override to match your RapidAPI subscription
+PER_MINUTE = int(os.getenv("RAPIDAPI_PER_MINUTE", "30"))
+PER_MONTH = int(os.getenv("RAPIDAPI_PER_MONTH", "10000"))
+
+PRIORITY_HIGH = 0    # scorecard of the match a user is viewing
+PRIORITY_NORMAL = 1  # other user-triggered calls
+PRIORITY_LOW = 2     # background refreshes: match list, poller, stale revalidation
+
+# Share of the monthly budget that only HIGH/NORMAL calls may spend
+LOW_PRIORITY_RESERVE = 0.1
+
+# Ledger increments are written in batches of this many calls (or on close)
+LEDGER_FLUSH_EVERY = 10
+
+# Rows of api_quota_minute older than this many minutes are deleted
+MINUTE_ROWS_KEPT = 5
+
+
+class QuotaExceeded(Exception):
+    """Raised when a call cannot be scheduled within the plan limits"""
+
+
+def _current_month():
+    return datetime.now(timezone.utc).strftime("%Y-%m")
+
+
+def _current_minute():
+    return int(time.time() // 60)
+
+
+class QuotaScheduler:
+    def __init__(self, per_minute=PER_MINUTE, per_month=PER_MONTH, db_path=DB_PATH,
+                 low_priority_reserve=LOW_PRIORITY_RESERVE):
+        self.per_minute = per_minute
+        self.per_month = per_month
+        self.db_path = db_path
+        self.low_priority_reserve = low_priority_reserve
+
+        self._rate = per_minute / 60.0
+        self._tokens = float(per_minute)
+        self._last_refill = time.monotonic()
+
+        self._waiting = []  # heap of (priority, seq)
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+
+        # Shared per-minute slots claimed from api_quota_minute and not used yet.
+        # Claimed about a second's worth at a time so a fast plan is not one write per call.
+        self._claim_size = max(1, per_minute // 60)
+        self._minute = None
+        self._slots = 0
+        self._claiming = False
+
+        self._month = _current_month()
+        self._used = None  # loaded from the ledger on first use
+        self._pending = 0
+
+    # -------------------------
+    # Scheduling
+    # -------------------------
+    def acquire(self, priority=PRIORITY_NORMAL, timeout=30.0):
+        """Block until this call may go upstream.
+
+        Raises QuotaExceeded if the monthly budget is spent or no slot frees
+        up within timeout seconds.
+        """
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            self._check_month_budget(priority)
+            ticket = (priority, next(self._seq))
+            heapq.heappush(self._waiting, ticket)
+            try:
+                while True:
+                    self._refill()
+                    wait = None
+                    if self._waiting[0] == ticket and self._tokens >= 1 and not self._claiming:
+                        minute = _current_minute()
+                        if self._minute != minute:
+                            self._minute, self._slots = minute, 0  # unused slots lapse with their minute
+                        if self._slots >= 1:
+                            self._tokens -= 1
+                            self._slots -= 1
+                            flush = self._record_call()
+                            break
+                        if self._claim_slots():
+                            continue
+                        wait = 60 - time.time() % 60  # every process is out of slots until the next minute
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise QuotaExceeded("Rate limit: no request slot available")
+                    if wait is None:
+                        wait = (1 - self._tokens) / self._rate if self._tokens < 1 else remaining
+                    self._cond.wait(min(remaining, max(wait, 0.01)))
+            finally:
+                self._waiting.remove(ticket)
+                heapq.heapify(self._waiting)
+                self._cond.notify_all()
+        if flush:
+            self.flush()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(float(self.per_minute), self._tokens + (now - self._last_refill) * self._rate)
+        self._last_refill = now
+
+    def _check_month_budget(self, priority):
+        self._sync_month()
+        limit = self.per_month
+        if priority >= PRIORITY_LOW:
+            limit -= int(self.per_month * self.low_priority_reserve)
+        if self._used + self._pending >= limit:
+            raise QuotaExceeded(f"Monthly API budget used up ({self._used + self._pending}/{self.per_month})")
+
+    # -------------------------
+    # Shared per-minute slots
+    # -------------------------
+    def _claim_slots(self):
+        """Claim slots for the current minute from api_quota_minute; called holding _cond, which
+        is released during the write. Returns whether any were granted."""
+        minute, want = self._minute, self._claim_size
+        self._claiming = True
+        self._cond.release()
+        try:
+            granted = self._claim_minute(minute, want)
+        finally:
+            self._cond.acquire()
+            self._claiming = False
+            self._cond.notify_all()
+        if self._minute == minute:
+            self._slots += granted
+        return granted > 0
+
+    def _claim_minute(self, minute, want):
+        try:
+            with self._connect() as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                with conn:
+                    row = conn.execute("SELECT used FROM api_quota_minute WHERE minute = ?", (minute,)).fetchone()
+                    used = row[0] if row else 0
+                    granted = max(0, min(want, self.per_minute - used))
+                    if granted:
+                        conn.execute(
+                            """INSERT INTO api_quota_minute (minute, used) VALUES (?, ?)
+                               ON CONFLICT(minute) DO UPDATE SET used = used + excluded.used""",
+                            (minute, granted),
+                        )
+                    if row is None:
+                        conn.execute("DELETE FROM api_quota_minute WHERE minute < ?", (minute - MINUTE_ROWS_KEPT,))
+                return granted
+        except sqlite3.Error as e:
+            print("❌ Could not claim from the shared per-minute quota, limiting this process only:", e)
+            return want
+
+    # -------------------------
+    # Ledger
+    # -------------------------
+    def _sync_month(self):
+        if self._used is not None and self._month == _current_month():
+            return
+        if self._used is not None:
+            self.flush()
+        self._month = _current_month()
+        self._used = self._load_used()
+
+    def _connect(self):
+        ensure_migrated(self.db_path)
+        return connection(self.db_path)
+
+    def _load_used(self):
+        try:
+            with self._connect() as conn:
+                row = conn.execute("SELECT used FROM api_quota_ledger WHERE month = ?", (self._month,)).fetchone()
+        except sqlite3.Error as e:
+            print("❌ Could not read API quota ledger:", e)
+            return 0
+        return row[0] if row else 0
+
+    def _record_call(self):
+        """Count one call; returns whether the ledger is due a flush"""
+        self._pending += 1
+        return self._pending >= LEDGER_FLUSH_EVERY
+
+    def flush(self):
+        """Write pending calls to the ledger and pick up other processes' usage"""
+        with self._cond:
+            month, pending = self._month, self._pending
+            self._pending = 0
+        if not pending:
+            return
+        try:
+            with self._connect() as conn, conn:
+                conn.execute(
+                    """INSERT INTO api_quota_ledger (month, used) VALUES (?, ?)
+                       ON CONFLICT(month) DO UPDATE SET used = used + excluded.used""",
+                    (month, pending),
+                )
+                used = conn.execute("SELECT used FROM api_quota_ledger WHERE month = ?", (month,)).fetchone()[0]
+        except sqlite3.Error as e:
+            print("❌ Could not update API quota ledger:", e)
+            with self._cond:
+                if self._month == month:
+                    self._pending += pending
+            return
+        with self._cond:
+            if self._month == month:
+                self._used = used
+
+    def status(self):
+        """Remaining budget, for dashboards"""
+        with self._cond:
+            self._sync_month()
+            self._refill()
+            used = self._used + self._pending
+            return {
+                "month": self._month,
+                "used": used,
+                "per_month": self.per_month,
+                "remaining": max(self.per_month - used, 0),
+                "per_minute": self.per_minute,
+                "tokens_available": int(self._tokens),
+                "waiting": len(self._waiting),
+            }
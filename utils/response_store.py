@@ -0,0 +1,189 @@
+# utils/response_store.py
+"""API responses shared between processes, with a lease so only one fetches.
+
+Every Streamlit worker (and the poller) using the same database sees one
+api_responses row per cache key. A process that needs a fresh response:
+
+1. uses the stored one if it is younger than the endpoint's TTL
+2. otherwise takes the key's lease in api_leases (one conditional upsert),
+   fetches upstream and stores the body, then releases the lease
+3. or, if another process holds the lease, polls the store until that
+   process has written the body, gives up when it released the lease
+   without one (the upstream call failed), or takes over an expired lease
+
+The body stored is the response's own bytes, with the fingerprint the
+client already took of them, so nothing is serialized again; a body whose
+fingerprint matches the stored row only has its timestamp moved. Decoded
+bodies are remembered per key with their fingerprint, so a process
+re-reading a body it has already decoded gets the same object back.
+Set CRICBUZZ_SHARED_CACHE=0 to fetch independently in every process.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+from utils.db_connection import DB_PATH, connection
+from utils.migrations import ensure_migrated
+from utils.scorecard_parser import body_fingerprint
+
+SHARED_CACHE = os.getenv("CRICBUZZ_SHARED_CACHE", "1") != "0"
+LEASE_SECONDS = 30        # longer than a fetch with retries; a crashed holder blocks others at most this long
+POLL_INTERVAL = 0.05      # seconds between store checks while another process fetches
+KEEP_SECONDS = 2 * 24 * 60 * 60
+
+
+class Fetched:
+    """A decoded response with its raw body; body is None when upstream answered 304"""
+
+    __slots__ = ("payload", "body", "fingerprint")
+
+    def __init__(self, payload, body, fingerprint):
+        self.payload = payload
+        self.body = body
+        self.fingerprint = fingerprint
+
+
+class ResponseStore:
+    def __init__(self, db_path=DB_PATH):
+        self.db_path = db_path
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._decoded = {}  # cache_key -> (fingerprint, payload)
+        self._lock = threading.Lock()
+        self.fetches = 0
+        self.shared_hits = 0
+
+    def _connect(self):
+        ensure_migrated(self.db_path)
+        return connection(self.db_path)
+
+    def fetch(self, cache_key, ttl, fetch):
+        """A response for cache_key no older than ttl seconds, calling fetch() (returning a Fetched or
+        None) in at most one process"""
+        try:
+            payload = self._fresh(cache_key, ttl)
+            if payload is not None:
+                return payload
+            while True:
+                if self._take_lease(cache_key):
+                    try:
+                        # Another process may have stored it between our check and the lease
+                        payload = self._fresh(cache_key, ttl)
+                        if payload is not None:
+                            return payload
+                        fetched = fetch()
+                        self.fetches += 1
+                        if fetched is None:
+                            return None
+                        self._store(cache_key, fetched)
+                        return fetched.payload
+                    finally:
+                        self._release_lease(cache_key)
+                payload, retry = self._wait(cache_key, ttl)
+                if not retry:
+                    return payload
+        except sqlite3.Error as e:
+            print(f"❌ Shared response store unavailable ({e}); fetching directly")
+            fetched = fetch()
+            return fetched.payload if fetched is not None else None
+
+    # -------------------------
+    # Store
+    # -------------------------
+    def _fresh(self, cache_key, ttl):
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT fingerprint, body FROM api_responses WHERE cache_key = ? AND stored_at > ?",
+                (cache_key, time.time() - ttl),
+            ).fetchone()
+        if row is None:
+            return None
+        self.shared_hits += 1
+        return self._decode(cache_key, *row)
+
+    def _decode(self, cache_key, fingerprint, body):
+        with self._lock:
+            known = self._decoded.get(cache_key)
+        if known is not None and known[0] == fingerprint:
+            return known[1]
+        payload = json.loads(body)
+        with self._lock:
+            self._decoded[cache_key] = (fingerprint, payload)
+        return payload
+
+    def _store(self, cache_key, fetched):
+        body, fingerprint = fetched.body, fetched.fingerprint
+        if body is not None and fingerprint is None:
+            fingerprint = body_fingerprint(body)
+        now = time.time()
+        with self._connect() as conn, conn:
+            unchanged = fingerprint is not None and conn.execute(
+                "UPDATE api_responses SET stored_at = ? WHERE cache_key = ? AND fingerprint = ?",
+                (now, cache_key, fingerprint),
+            ).rowcount
+            if not unchanged:
+                if body is None:
+                    # A 304 to this process while the row holds another version: only the payload is at hand
+                    body = json.dumps(fetched.payload, separators=(",", ":")).encode()
+                    fingerprint = body_fingerprint(body)
+                conn.execute(
+                    """INSERT INTO api_responses (cache_key, stored_at, fingerprint, body) VALUES (?, ?, ?, ?)
+                       ON CONFLICT(cache_key) DO UPDATE SET
+                           stored_at = excluded.stored_at, fingerprint = excluded.fingerprint, body = excluded.body""",
+                    (cache_key, now, fingerprint, body),
+                )
+                conn.execute("DELETE FROM api_responses WHERE stored_at < ?", (now - KEEP_SECONDS,))
+        with self._lock:
+            self._decoded[cache_key] = (fingerprint, fetched.payload)
+
+    # -------------------------
+    # Lease
+    # -------------------------
+    def _take_lease(self, cache_key):
+        now = time.time()
+        with self._connect() as conn, conn:
+            return conn.execute(
+                """INSERT INTO api_leases (cache_key, owner, expires_at) VALUES (?, ?, ?)
+                   ON CONFLICT(cache_key) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at
+                   WHERE api_leases.expires_at < ?""",
+                (cache_key, self.owner, now + LEASE_SECONDS, now),
+            ).rowcount > 0
+
+    def _release_lease(self, cache_key):
+        with self._connect() as conn, conn:
+            conn.execute("DELETE FROM api_leases WHERE cache_key = ? AND owner = ?", (cache_key, self.owner))
+
+    def _wait(self, cache_key, ttl):
+        """Wait for the lease holder; returns (payload, retry) where retry means the lease expired"""
+        while True:
+            time.sleep(POLL_INTERVAL)
+            payload = self._fresh(cache_key, ttl)
+            if payload is not None:
+                return payload, False
+            with self._connect() as conn:
+                lease = conn.execute("SELECT expires_at FROM api_leases WHERE cache_key = ?", (cache_key,)).fetchone()
+            if lease is None:
+                # Released: either the body landed just now or the holder's fetch failed
+                return self._fresh(cache_key, ttl), False
+            if lease[0] < time.time():
+                return None, True
+
+    def stats(self):
+        return {"fetches": self.fetches, "shared_hits": self.shared_hits}
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """The process-wide ResponseStore, or None when sharing is switched off"""
+    global _store
+    if not SHARED_CACHE:
+        return None
+    with _store_lock:
+        if _store is None:
+            _store = ResponseStore()
+        return _store
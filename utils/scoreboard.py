@@ -0,0 +1,134 @@
+# utils/scoreboard.py
+"""Render models for the live scoreboard, built once per scorecard version.
+
+A ScoreboardView holds everything the Live Match scoreboard draws (text
+lines and ready-made DataFrames) for one scorecard fingerprint. The page's
+auto-refreshing fragment asks for the current view every few seconds; while
+the poller's snapshot fingerprint (or the cached API response object) is
+unchanged, the same view object comes back without decoding, hashing or
+parsing anything. One view serves every session showing that scorecard, so
+its DataFrames must not be modified in place.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from utils.api_handler import get_match_score
+from utils.live_store import load_scorecard, load_scorecard_versioned, scorecard_version
+from utils.scorecard_parser import parse_scorecard, payload_fingerprint
+
+VIEW_MAX_ENTRIES = 64
+RAW_MAX_ENTRIES = 8         # decoded payloads kept for the debug view
+
+
+class ScoreboardView:
+    """innings: ((title, batting DataFrame or None, bowling DataFrame or None), ...)"""
+
+    __slots__ = ("fingerprint", "header", "title", "venue", "status", "quick_scores", "innings")
+
+    def __init__(self, card):
+        import pandas as pd
+
+        self.fingerprint = card.fingerprint
+        self.header = card.header
+        self.title = f"{card.team1} vs {card.team2} - {card.match_desc}"
+        self.venue = card.venue
+        self.status = card.status
+        self.quick_scores = pd.DataFrame(
+            card.quick_scores, columns=["Team", "Innings", "Runs", "Wickets", "Overs"]) if card.quick_scores else None
+        self.innings = tuple(
+            (inn.title,
+             pd.DataFrame(inn.batting_table) if inn.batters else None,
+             pd.DataFrame(inn.bowling_table) if inn.bowlers else None)
+            for inn in card.innings
+        )
+
+
+class _LRU:
+    """Small thread-safe LRU dict"""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+_views = _LRU(VIEW_MAX_ENTRIES)         # fingerprint -> ScoreboardView
+_api_payloads = _LRU(VIEW_MAX_ENTRIES)  # match_id -> (payload, fingerprint) last seen from the API
+_raw_payloads = _LRU(RAW_MAX_ENTRIES)   # fingerprint -> decoded payload, for the debug view
+
+
+def _view(fingerprint, load):
+    """The view for fingerprint, calling load() for the payload only when it is not cached"""
+    view = _views.get(fingerprint)
+    if view is None:
+        view = ScoreboardView(parse_scorecard(load(), fingerprint))
+        _views.put(fingerprint, view)
+    return view
+
+
+def _api_fingerprint(match_id, payload):
+    # The client hands back the very same object while the scorecard is unchanged
+    known = _api_payloads.get(match_id)
+    if known is not None and known[0] is payload:
+        return known[1]
+    fingerprint = payload_fingerprint(payload)
+    _api_payloads.put(match_id, (payload, fingerprint))
+    return fingerprint
+
+
+def current_view(match_id, max_age):
+    """(view, snapshot age in seconds or None when it came from the API) for a match; (None, None) if unavailable.
+
+    A snapshot stored with a fingerprint costs one indexed lookup while it is
+    unchanged; its payload is only read and parsed when the fingerprint is new.
+    """
+    fetched_at, fingerprint = scorecard_version(match_id)
+    if fetched_at is not None and time.time() - fetched_at <= max_age:
+        if fingerprint is None:
+            payload, fetched_at = load_scorecard(match_id, max_age)
+            if payload is None:
+                return None, None
+            fingerprint = payload_fingerprint(payload)
+            return _view(fingerprint, lambda: payload), time.time() - fetched_at
+        return _view(fingerprint, lambda: load_scorecard(match_id, float("inf"))[0]), time.time() - fetched_at
+
+    payload = get_match_score(match_id)
+    if not payload:
+        return None, None
+    return _view(_api_fingerprint(match_id, payload), lambda: payload), None
+
+
+def raw_payload(match_id, view, max_age):
+    """The decoded scorecard payload for debugging, loaded once per fingerprint.
+
+    Normally the payload behind view; if the scorecard moved on since view was
+    built, the newer payload is returned and cached under its own fingerprint.
+    """
+    payload = _raw_payloads.get(view.fingerprint)
+    if payload is not None:
+        return payload
+    payload, _, fingerprint = load_scorecard_versioned(match_id, max_age)
+    if payload is None:
+        payload = get_match_score(match_id)
+        if not payload:
+            return None
+        fingerprint = _api_fingerprint(match_id, payload)
+    elif fingerprint is None:
+        fingerprint = payload_fingerprint(payload)
+    _raw_payloads.put(fingerprint, payload)
+    return payload
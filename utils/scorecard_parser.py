@@ -0,0 +1,221 @@
+# utils/scorecard_parser.py
+"""One parser for Cricbuzz scorecard payloads.
+
+The API has served two shapes over time:
+
+- "scorecard": [{inningsid, batteamname, score, wickets, overs,
+                 batsman: [...], bowler: [...]}]
+- "scoreCard": [{inningsId, scoreDetails, batTeamDetails: {batsmenData: {...}},
+                 bowlTeamDetails: {bowlersData: {...}}}]
+
+Both are turned into the same compact __slots__ records. Parsed scorecards
+are memoized by a hash of the payload, so repeated reruns over the same
+response do no work at all.
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+MEMO_MAX_ENTRIES = 64
+
+
+class BatterRow:
+    __slots__ = ("player_id", "name", "runs", "balls", "fours", "sixes", "strike_rate", "dismissal")
+
+    def __init__(self, player_id, name, runs, balls, fours, sixes, strike_rate, dismissal):
+        self.player_id = player_id
+        self.name = name
+        self.runs = runs
+        self.balls = balls
+        self.fours = fours
+        self.sixes = sixes
+        self.strike_rate = strike_rate
+        self.dismissal = dismissal
+
+    @property
+    def is_out(self):
+        return bool(self.dismissal) and self.dismissal.strip().lower() not in ("batting", "not out")
+
+
+class BowlerRow:
+    __slots__ = ("player_id", "name", "overs", "maidens", "runs", "wickets", "economy")
+
+    def __init__(self, player_id, name, overs, maidens, runs, wickets, economy):
+        self.player_id = player_id
+        self.name = name
+        self.overs = overs
+        self.maidens = maidens
+        self.runs = runs
+        self.wickets = wickets
+        self.economy = economy
+
+
+class Innings:
+    __slots__ = ("innings_id", "bat_team", "runs", "wickets", "overs", "batters", "bowlers",
+                 "batting_table", "bowling_table")
+
+    def __init__(self, innings_id, bat_team, runs, wickets, overs, batters, bowlers):
+        self.innings_id = innings_id
+        self.bat_team = bat_team
+        self.runs = runs
+        self.wickets = wickets
+        self.overs = overs
+        self.batters = batters
+        self.bowlers = bowlers
+        # Column arrays, ready for pd.DataFrame(...) without another pass over the rows
+        self.batting_table = {
+            "Batsman": [b.name for b in batters],
+            "Runs": [b.runs for b in batters],
+            "Balls": [b.balls for b in batters],
+            "4s": [b.fours for b in batters],
+            "6s": [b.sixes for b in batters],
+            "SR": [b.strike_rate for b in batters],
+        }
+        self.bowling_table = {
+            "Bowler": [b.name for b in bowlers],
+            "Overs": [b.overs for b in bowlers],
+            "Maidens": [b.maidens for b in bowlers],
+            "Runs": [b.runs for b in bowlers],
+            "Wkts": [b.wickets for b in bowlers],
+            "Econ": [b.economy for b in bowlers],
+        }
+
+    @property
+    def title(self):
+        return self.bat_team or f"Innings {self.innings_id}"
+
+
+class Scorecard:
+    __slots__ = ("fingerprint", "header", "team1", "team2", "match_desc", "venue", "status",
+                 "innings", "quick_scores")
+
+    def __init__(self, fingerprint, header, team1, team2, match_desc, venue, status, innings, quick_scores):
+        self.fingerprint = fingerprint
+        self.header = header
+        self.team1 = team1
+        self.team2 = team2
+        self.match_desc = match_desc
+        self.venue = venue
+        self.status = status
+        self.innings = innings
+        # (team, innings, runs, wickets, overs) from "matchScore", used when there is no full scorecard
+        self.quick_scores = quick_scores
+
+
+# -------------------------
+# Parsing
+# -------------------------
+def _int(value):
+    try:
+        return int(value or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _float(value):
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _parse_innings(inn, position):
+    """Parse one innings in the "scorecard" shape"""
+    batters = [
+        BatterRow(b.get("id"), b.get("name"), _int(b.get("runs")), _int(b.get("balls")),
+                  _int(b.get("fours")), _int(b.get("sixes")), _float(b.get("strkrate")), b.get("outdec") or "")
+        for b in inn.get("batsman", [])
+    ]
+    bowlers = [
+        BowlerRow(b.get("id"), b.get("name"), str(b.get("overs") or 0), _int(b.get("maidens")),
+                  _int(b.get("runs")), _int(b.get("wickets")), _float(b.get("economy") or b.get("economyrate")))
+        for b in inn.get("bowler", [])
+    ]
+    return Innings(inn.get("inningsid", position), inn.get("batteamname"), _int(inn.get("score")),
+                   _int(inn.get("wickets")), str(inn.get("overs") or 0), batters, bowlers)
+
+
+def _parse_legacy_innings(inn, position):
+    """Parse one innings in the older "scoreCard" shape"""
+    bat_team = inn.get("batTeamDetails", {})
+    batters = [
+        BatterRow(b.get("batId"), b.get("batName"), _int(b.get("runs")), _int(b.get("balls")),
+                  _int(b.get("fours")), _int(b.get("sixes")), _float(b.get("strikeRate")), b.get("outDesc") or "")
+        for b in bat_team.get("batsmenData", {}).values()
+    ]
+    bowlers = [
+        BowlerRow(b.get("bowlerId"), b.get("bowlName"), str(b.get("overs") or 0), _int(b.get("maidens")),
+                  _int(b.get("runs")), _int(b.get("wickets")), _float(b.get("economy")))
+        for b in inn.get("bowlTeamDetails", {}).get("bowlersData", {}).values()
+    ]
+    details = inn.get("scoreDetails", {})
+    return Innings(inn.get("inningsId", position), bat_team.get("batTeamName"), _int(details.get("runs")),
+                   _int(details.get("wickets")), str(details.get("overs") or 0), batters, bowlers)
+
+
+def _parse(payload, fingerprint):
+    innings = [_parse_innings(inn, i) for i, inn in enumerate(payload.get("scorecard") or [], start=1)]
+    innings += [_parse_legacy_innings(inn, i) for i, inn in enumerate(payload.get("scoreCard") or [], start=1)]
+
+    header = payload.get("matchHeader") or payload.get("matchInfo") or {}
+    info = payload.get("matchInfo") or header
+    quick_scores = []
+    for team_key in ("team1Score", "team2Score"):
+        for inng, details in (payload.get("matchScore") or {}).get(team_key, {}).items():
+            quick_scores.append((team_key.replace("Score", "").capitalize(), inng,
+                                 _int(details.get("runs")), _int(details.get("wickets")),
+                                 str(details.get("overs", "0.0"))))
+
+    return Scorecard(
+        fingerprint,
+        header,
+        info.get("team1", {}).get("teamName", "Team 1"),
+        info.get("team2", {}).get("teamName", "Team 2"),
+        info.get("matchDesc", "Unknown Match"),
+        info.get("venueInfo", {}).get("ground", "Unknown Venue"),
+        info.get("status", "Status unavailable"),
+        tuple(innings),
+        tuple(quick_scores),
+    )
+
+
+# -------------------------
+# Memoized entry point
+# -------------------------
+_memo = OrderedDict()
+_memo_lock = threading.Lock()
+
+
+def payload_fingerprint(payload):
+    """Content hash of a decoded payload"""
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":")).encode()
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+def body_fingerprint(body):
+    """Content hash of a raw response body (bytes), taken before any JSON decoding"""
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+def parse_scorecard(payload, fingerprint=None):
+    """Parse a scorecard payload into a Scorecard, reusing the result for identical payloads.
+
+    Pass fingerprint when the caller already has a hash of the raw response
+    (body_fingerprint, or one stored with a snapshot) to skip hashing the
+    decoded payload.
+    """
+    if fingerprint is None:
+        fingerprint = payload_fingerprint(payload)
+    with _memo_lock:
+        card = _memo.get(fingerprint)
+        if card is not None:
+            _memo.move_to_end(fingerprint)
+            return card
+
+    card = _parse(payload, fingerprint)
+    with _memo_lock:
+        _memo[fingerprint] = card
+        while len(_memo) > MEMO_MAX_ENTRIES:
+            _memo.popitem(last=False)
+    return card
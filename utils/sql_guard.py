@@ -0,0 +1,123 @@
+# utils/sql_guard.py
+"""Guarded execution of user-typed SQL.
+
+Custom queries run on their own read-only connection (never a pooled one)
+under a wall-clock and VM-step budget enforced by sqlite3's progress
+handler, and rows are fetched in chunks up to a hard cap, so an accidental
+cross join is interrupted instead of pinning a worker or filling memory.
+Only a few run at once; the rest are turned away rather than queued.
+"""
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from utils.db_connection import BUSY_TIMEOUT, DB_PATH
+
+MAX_ROWS = 10_000
+FETCH_CHUNK = 500
+TIME_LIMIT = 5.0           # seconds
+MAX_VM_STEPS = 50_000_000
+MAX_CONCURRENT = 2
+PROGRESS_EVERY = 10_000    # VM instructions between budget checks
+
+SCAN_RE = re.compile(r"^SCAN (\w+)(.*)$")
+TABLE_REF_RE = re.compile(r"\b(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?", re.IGNORECASE)
+SQL_KEYWORDS = {"where", "join", "inner", "left", "cross", "on", "group", "order", "limit", "having", "using"}
+
+_slots = threading.BoundedSemaphore(MAX_CONCURRENT)
+
+
+class QueryRejected(Exception):
+    """Raised when a custom query exceeds its budget or cannot be run"""
+
+
+def table_aliases(sql):
+    """Map every alias (and table name) used in sql to its table"""
+    aliases = {}
+    for table, alias in TABLE_REF_RE.findall(sql):
+        aliases[table] = table
+        if alias and alias.lower() not in SQL_KEYWORDS:
+            aliases[alias] = table
+    return aliases
+
+
+def full_scans(plan, sql):
+    """Tables read with a full table scan (not via an index)"""
+    aliases = table_aliases(sql)
+    scans = []
+    for detail in plan:
+        match = SCAN_RE.match(detail)
+        if match and "USING" not in match.group(2) and match.group(1) != "CONSTANT":
+            scans.append(aliases.get(match.group(1), match.group(1)))
+    return scans
+
+
+def read_only_connection(db_path=None):
+    uri = Path(db_path or DB_PATH).resolve().as_uri() + "?mode=ro"
+    conn = sqlite3.connect(uri, uri=True, timeout=BUSY_TIMEOUT, check_same_thread=False)
+    conn.execute("PRAGMA query_only = ON")
+    return conn
+
+
+def query_plan(conn, sql, params=()):
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+
+def _set_budget(conn, time_limit, max_steps):
+    deadline = time.monotonic() + time_limit
+    steps = [0]
+    reason = [None]
+
+    def check():
+        steps[0] += PROGRESS_EVERY
+        if steps[0] > max_steps:
+            reason[0] = f"used more than {max_steps:,} VM steps"
+        elif time.monotonic() > deadline:
+            reason[0] = f"ran longer than {time_limit:g}s"
+        return 1 if reason[0] else 0
+
+    conn.set_progress_handler(check, PROGRESS_EVERY)
+    return reason
+
+
+def run_guarded(sql, params=(), db_path=None, max_rows=MAX_ROWS, time_limit=TIME_LIMIT,
+                max_steps=MAX_VM_STEPS, with_plan=False):
+    """Run one read-only statement; returns (columns, rows, truncated, plan)
+
+    plan is the EXPLAIN QUERY PLAN detail list when with_plan is set, else None.
+    Raises QueryRejected when the query is too expensive or the server is busy,
+    and sqlite3.Error for invalid SQL or attempted writes.
+    """
+    sql = sql.strip().rstrip(";")
+    if not _slots.acquire(timeout=1):
+        raise QueryRejected("Too many custom queries running, try again in a moment")
+    try:
+        conn = read_only_connection(db_path)
+        try:
+            plan = query_plan(conn, sql, params) if with_plan else None
+            reason = _set_budget(conn, time_limit, max_steps)
+            try:
+                cursor = conn.execute(sql, params)
+                columns = [col[0] for col in cursor.description or ()]
+                rows = []
+                truncated = False
+                while cursor.description is not None:
+                    chunk = cursor.fetchmany(FETCH_CHUNK)
+                    if not chunk:
+                        break
+                    rows.extend(chunk)
+                    if len(rows) > max_rows:
+                        del rows[max_rows:]
+                        truncated = True
+                        break
+            except sqlite3.OperationalError as e:
+                if reason[0]:
+                    raise QueryRejected(f"Query stopped: it {reason[0]}") from e
+                raise
+            return columns, rows, truncated, plan
+        finally:
+            conn.close()
+    finally:
+        _slots.release()
@@ -0,0 +1,334 @@
+# utils/stats_engine.py
+"""In-memory columnar copy of player_stats joined with players.
+
+Every stat row is one position in a set of NumPy arrays: float64 for the
+numeric columns (NaN for NULL) and small integer codes for country, role
+and format. Leaderboards, percentile ranks and comparisons are computed
+with vectorized masks and argpartition on those arrays, with no SQL.
+
+The copy follows the database through PRAGMA data_version (checked on a
+private connection) and the stats_changelog table from migration 0008:
+when the data changes, only the logged stat rows and players are reloaded
+and patched in. Large batches, or a log pruned past our position, trigger a
+full reload instead. Writers keep the log bounded: a trigger (migration
+0012) drops entries far behind the newest, and bulk imports collapse theirs
+with compact_changelog().
+"""
+import sqlite3
+import threading
+
+import numpy as np
+import pandas as pd
+
+from utils.db_connection import DB_PATH
+
+NUMERIC_COLUMNS = (
+    "matches", "total_runs", "batting_avg", "strike_rate", "centuries", "fifties", "highest_score",
+    "sixes", "wickets", "bowling_avg", "economy", "five_wkts", "catches",
+)
+CATEGORY_COLUMNS = ("country", "playing_role", "format")
+# Metrics that add up across formats, so they can rank whole careers
+SUMMABLE = {"matches", "total_runs", "centuries", "fifties", "sixes", "wickets", "five_wkts", "catches", "all_round"}
+# Where lower is better
+ASCENDING_METRICS = {"bowling_avg", "economy"}
+
+FULL_RELOAD_RATIO = 0.2       # reload everything when this share of rows changed
+FULL_RELOAD_MIN = 1000        # ... or at least this many
+
+LOAD_SQL = f"""
+    SELECT ps.stat_id, ps.player_id, p.player_id IS NOT NULL, p.full_name, p.country, p.playing_role, ps.format,
+           {", ".join(f"ps.{c}" for c in NUMERIC_COLUMNS)}
+    FROM player_stats ps
+    LEFT JOIN players p ON p.player_id = ps.player_id
+"""
+
+
+class Snapshot:
+    """Column arrays for every stat row; alive is False for rows deleted since the last full load"""
+
+    __slots__ = ("stat_id", "player_id", "has_player", "name", "codes", "categories", "values", "alive",
+                 "positions")
+
+    def __init__(self, rows):
+        self.categories = {c: [] for c in CATEGORY_COLUMNS}
+        self._set(rows)
+
+    def _set(self, rows):
+        columns = list(zip(*rows)) if rows else [()] * (6 + 1 + len(NUMERIC_COLUMNS))
+        self.stat_id = np.array(columns[0], dtype=np.int64)
+        self.player_id = np.array([-1 if v is None else v for v in columns[1]], dtype=np.int64)
+        self.has_player = np.array(columns[2], dtype=bool)
+        self.name = np.array(columns[3], dtype=object)
+        self.codes = {c: self._encode(c, columns[4 + i]) for i, c in enumerate(CATEGORY_COLUMNS)}
+        self.values = {c: np.array(columns[7 + i], dtype=np.float64) for i, c in enumerate(NUMERIC_COLUMNS)}
+        self.alive = np.ones(len(self.stat_id), dtype=bool)
+        self.positions = {int(s): i for i, s in enumerate(self.stat_id)}
+
+    def _encode(self, column, values):
+        categories = self.categories[column]
+        lookup = {v: i for i, v in enumerate(categories)}
+        codes = np.empty(len(values), dtype=np.int16)
+        for i, value in enumerate(values):
+            code = lookup.get(value)
+            if code is None:
+                code = lookup[value] = len(categories)
+                categories.append(value)
+            codes[i] = code
+        return codes
+
+    def code(self, column, value):
+        try:
+            return self.categories[column].index(value)
+        except ValueError:
+            return -1
+
+    def __len__(self):
+        return int(self.alive.sum())
+
+    def patch(self, rows, deleted_stat_ids):
+        """Overwrite changed rows in place, append new ones and mark deleted ones dead"""
+        for stat_id in deleted_stat_ids:
+            position = self.positions.get(stat_id)
+            if position is not None:
+                self.alive[position] = False
+        new_rows = []
+        for row in rows:
+            position = self.positions.get(row[0])
+            if position is None:
+                new_rows.append(row)
+                continue
+            self.player_id[position] = -1 if row[1] is None else row[1]
+            self.has_player[position] = row[2]
+            self.name[position] = row[3]
+            for i, column in enumerate(CATEGORY_COLUMNS):
+                self.codes[column][position] = self._encode(column, [row[4 + i]])[0]
+            for i, column in enumerate(NUMERIC_COLUMNS):
+                self.values[column][position] = np.nan if row[7 + i] is None else row[7 + i]
+            self.alive[position] = True
+        if new_rows:
+            added = Snapshot.__new__(Snapshot)
+            added.categories = self.categories
+            added._set(new_rows)
+            offset = len(self.stat_id)
+            self.stat_id = np.concatenate([self.stat_id, added.stat_id])
+            self.player_id = np.concatenate([self.player_id, added.player_id])
+            self.has_player = np.concatenate([self.has_player, added.has_player])
+            self.name = np.concatenate([self.name, added.name])
+            self.codes = {c: np.concatenate([self.codes[c], added.codes[c]]) for c in CATEGORY_COLUMNS}
+            self.values = {c: np.concatenate([self.values[c], added.values[c]]) for c in NUMERIC_COLUMNS}
+            self.alive = np.concatenate([self.alive, added.alive])
+            self.positions.update({s: offset + i for s, i in added.positions.items()})
+
+
+class StatsEngine:
+    def __init__(self, db_path=DB_PATH):
+        self.db_path = db_path
+        self.snapshot = None
+        self.seq = 0
+        self._data_version = None
+        self._conn = None
+        self._lock = threading.RLock()
+        self.full_loads = 0
+        self.patches = 0
+
+    # -------------------------
+    # Keeping up with the database
+    # -------------------------
+    def _connection(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        return self._conn
+
+    def refresh(self):
+        """Bring the snapshot up to date; cheap when nothing changed"""
+        with self._lock:
+            conn = self._connection()
+            data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+            if self.snapshot is not None and data_version == self._data_version:
+                return self.snapshot
+            conn.execute("BEGIN")
+            try:
+                newest, oldest = conn.execute("SELECT MAX(seq), MIN(seq) FROM stats_changelog").fetchone()
+                newest = newest or 0
+                if self.snapshot is None or (oldest is not None and oldest > self.seq + 1):
+                    self._full_load(conn)
+                elif newest > self.seq:
+                    self._apply_changes(conn, newest)
+                self.seq = newest
+            finally:
+                conn.execute("COMMIT")
+            self._data_version = data_version
+            return self.snapshot
+
+    def _full_load(self, conn):
+        self.snapshot = Snapshot(conn.execute(LOAD_SQL).fetchall())
+        self.full_loads += 1
+
+    def _apply_changes(self, conn, newest):
+        changes = conn.execute(
+            "SELECT DISTINCT table_name, row_id FROM stats_changelog WHERE seq > ? AND seq <= ?", (self.seq, newest)
+        ).fetchall()
+        if len(changes) > max(FULL_RELOAD_MIN, FULL_RELOAD_RATIO * len(self.snapshot.stat_id)):
+            self._full_load(conn)
+            return
+        stat_ids = {row_id for table, row_id in changes if table == "player_stats"}
+        player_ids = [row_id for table, row_id in changes if table == "players"]
+        if player_ids:
+            # A renamed, moved or deleted player changes every one of its stat rows
+            affected = self.snapshot.stat_id[np.isin(self.snapshot.player_id, player_ids)]
+            stat_ids.update(int(s) for s in affected)
+            stat_ids.update(r[0] for r in _select_in(
+                conn, "SELECT stat_id FROM player_stats WHERE player_id IN ({})", player_ids))
+        rows = _select_in(conn, LOAD_SQL + " WHERE ps.stat_id IN ({})", list(stat_ids))
+        found = {row[0] for row in rows}
+        self.snapshot.patch(rows, stat_ids - found)
+        self.patches += 1
+
+    # -------------------------
+    # Queries
+    # -------------------------
+    def _mask(self, snap, format=None, countries=None, roles=None, min_matches=None, min_runs=None):
+        mask = snap.alive & snap.has_player
+        if format is not None:
+            mask &= snap.codes["format"] == snap.code("format", format)
+        if countries:
+            mask &= np.isin(snap.codes["country"], [snap.code("country", c) for c in countries])
+        if roles:
+            mask &= np.isin(snap.codes["playing_role"], [snap.code("playing_role", r) for r in roles])
+        if min_matches is not None:
+            mask &= snap.values["matches"] >= min_matches
+        if min_runs is not None:
+            mask &= snap.values["total_runs"] > min_runs
+        return mask
+
+    def filter(self, **conditions):
+        """Stat rows matching format / countries / roles / min_matches / min_runs, as a DataFrame"""
+        with self._lock:
+            snap = self.refresh()
+            return self._frame(snap, np.flatnonzero(self._mask(snap, **conditions)))
+
+    def _metric(self, snap, metric):
+        if metric == "all_round":
+            return np.nan_to_num(snap.values["total_runs"]) + np.nan_to_num(snap.values["wickets"])
+        if metric not in snap.values:
+            raise ValueError(f"Unknown metric {metric!r}")
+        return snap.values[metric]
+
+    def top_k(self, metric, k=10, format=None, countries=None, roles=None, min_matches=None, min_runs=None,
+              ascending=None):
+        """The k best rows by metric; with format=None, whole careers summed over formats"""
+        if ascending is None:
+            ascending = metric in ASCENDING_METRICS
+        with self._lock:
+            snap = self.refresh()
+            mask = self._mask(snap, format, countries, roles, min_matches, min_runs)
+            values = self._metric(snap, metric)
+            if format is None:
+                if metric not in SUMMABLE:
+                    raise ValueError(f"{metric} cannot be summed across formats; pick a format")
+                return self._top_careers(snap, mask, values, metric, k, ascending)
+            candidates = np.flatnonzero(mask & ~np.isnan(values))
+            best = _top_positions(values[candidates], k, ascending)
+            frame = self._frame(snap, candidates[best])
+            if metric == "all_round":
+                frame["all_round"] = values[candidates[best]]
+            return frame
+
+    def _top_careers(self, snap, mask, values, metric, k, ascending):
+        players, inverse = np.unique(snap.player_id[mask], return_inverse=True)
+        totals = np.bincount(inverse, weights=np.nan_to_num(values[mask]), minlength=len(players))
+        best = _top_positions(totals, k, ascending)
+        first_row = np.flatnonzero(mask)[np.unique(inverse, return_index=True)[1]]
+        return pd.DataFrame({
+            "player_id": players[best],
+            "full_name": snap.name[first_row[best]],
+            "country": [snap.categories["country"][c] for c in snap.codes["country"][first_row[best]]],
+            metric: totals[best],
+        })
+
+    def percentile_rank(self, metric, format, player_ids=None):
+        """{player_id: percentile 0..100} of each player's metric among rows of the format (higher = better)"""
+        with self._lock:
+            snap = self.refresh()
+            mask = self._mask(snap, format)
+            values = self._metric(snap, metric)
+            pool = values[mask & ~np.isnan(values)]
+            if metric in ASCENDING_METRICS:
+                pool = -pool
+            pool = np.sort(pool)
+            rows = np.flatnonzero(mask)
+            if player_ids is not None:
+                rows = rows[np.isin(snap.player_id[rows], list(player_ids))]
+            mine = values[rows]
+            if metric in ASCENDING_METRICS:
+                mine = -mine
+            below = np.searchsorted(pool, mine, side="left")
+            equal = np.searchsorted(pool, mine, side="right") - below
+            ranks = np.where(np.isnan(mine), np.nan, 100.0 * (below + 0.5 * equal) / max(len(pool), 1))
+            return dict(zip(snap.player_id[rows].tolist(), ranks.tolist()))
+
+    def compare(self, player_ids, metrics, format):
+        """One row per player with each metric and its percentile within the format"""
+        with self._lock:
+            snap = self.refresh()
+            rows = np.flatnonzero(self._mask(snap, format) & np.isin(snap.player_id, list(player_ids)))
+            frame = self._frame(snap, rows)[["player_id", "full_name", "country"] + list(metrics)]
+            for metric in metrics:
+                ranks = self.percentile_rank(metric, format, player_ids)
+                frame[f"{metric}_pct"] = frame["player_id"].map(ranks).round(1)
+            return frame.reset_index(drop=True)
+
+    def _frame(self, snap, rows):
+        frame = {
+            "stat_id": snap.stat_id[rows],
+            "player_id": snap.player_id[rows],
+            "full_name": snap.name[rows],
+        }
+        for column in CATEGORY_COLUMNS:
+            categories = snap.categories[column]
+            frame[column] = [categories[c] for c in snap.codes[column][rows]]
+        for column in NUMERIC_COLUMNS:
+            frame[column] = snap.values[column][rows]
+        return pd.DataFrame(frame)
+
+
+def _top_positions(values, k, ascending):
+    """Positions of the k best values, best first"""
+    if len(values) == 0:
+        return np.array([], dtype=np.int64)
+    keys = values if ascending else -values
+    k = min(k, len(values))
+    top = np.argpartition(keys, k - 1)[:k]
+    return top[np.argsort(keys[top], kind="stable")]
+
+
+def _select_in(conn, sql, ids, chunk=500):
+    rows = []
+    for start in range(0, len(ids), chunk):
+        part = ids[start:start + chunk]
+        rows += conn.execute(sql.format(", ".join("?" * len(part))), part).fetchall()
+    return rows
+
+
+def compact_changelog(conn, since_seq):
+    """After a bulk write on conn: if the log entries past since_seq are more than an engine
+    would patch in, keep only the newest one. Engines behind it then reload fully instead of
+    reading them all. Returns the number of entries deleted."""
+    newest = conn.execute("SELECT MAX(seq) FROM stats_changelog").fetchone()[0]
+    rows = conn.execute("SELECT MAX(rowid) FROM player_stats").fetchone()[0] or 0
+    if newest is None or newest - since_seq <= max(FULL_RELOAD_MIN, FULL_RELOAD_RATIO * rows):
+        return 0
+    return conn.execute("DELETE FROM stats_changelog WHERE seq < ?", (newest,)).rowcount
+
+
+_engines = {}
+_engines_lock = threading.Lock()
+
+
+def get_engine(db_path=DB_PATH):
+    """The shared StatsEngine for db_path"""
+    with _engines_lock:
+        engine = _engines.get(db_path)
+        if engine is None:
+            engine = _engines[db_path] = StatsEngine(db_path)
+        return engine
@@ -0,0 +1,154 @@
+# utils/table_browser.py
+"""Keyset pagination over the CRUD tables.
+
+Each page is fetched with WHERE (sort_col, pk) > (last_value, last_pk) ...
+LIMIT n instead of OFFSET, so it costs the same on page 1 and page 10,000.
+Rows with a NULL sort value come last in both directions and are paged by
+primary key on their own, which keeps both halves on an index range.
+
+Only indexed columns can be sorted or filtered on, and table and column
+names are checked against the schema before they reach any SQL. "starts
+with" on a non-text column compares the column's text form, which gives up
+the index range and scans.
+"""
+from utils.db_connection import connection
+
+PAGE_SIZE = 20
+FILTER_OPS = ("=", "starts with", ">=", "<=")
+# Largest code point: every string with the prefix sorts below prefix + this
+PREFIX_END = "\U0010ffff"
+
+
+class TableInfo:
+    __slots__ = ("name", "columns", "types", "pk", "sortable", "filterable")
+
+    def __init__(self, name, columns, types, pk, sortable, filterable):
+        self.name = name
+        self.columns = columns
+        self.types = types
+        self.pk = pk
+        self.sortable = sortable
+        self.filterable = filterable
+
+
+def describe(conn, table):
+    """Columns, primary key and indexed columns of table; raises ValueError for unknown tables"""
+    exists = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)).fetchone()
+    if not exists:
+        raise ValueError(f"Unknown table {table!r}")
+    table_info = conn.execute(f'PRAGMA table_info("{table}")').fetchall()
+    columns = [row[1] for row in table_info]
+    types = {row[1]: (row[2] or "").upper() for row in table_info}
+    pk_columns = [row for row in table_info if row[5]]
+    if len(pk_columns) == 1 and pk_columns[0][2].upper() == "INTEGER":
+        pk = pk_columns[0][1]
+    else:
+        # No rowid alias: page on the hidden rowid, selected as an extra first column
+        pk = "rowid"
+        columns.insert(0, "rowid")
+
+    # An index on exactly (col) also orders by rowid, so ORDER BY col, pk is index-only
+    sortable, filterable = [pk], [pk]
+    for index in conn.execute(f'PRAGMA index_list("{table}")').fetchall():
+        index_columns = [row[2] for row in conn.execute(f'PRAGMA index_info("{index[1]}")').fetchall()]
+        if not index_columns or index_columns[0] is None:
+            continue
+        if len(index_columns) == 1 and index_columns[0] not in sortable:
+            sortable.append(index_columns[0])
+        if index_columns[0] not in filterable:
+            filterable.append(index_columns[0])
+    return TableInfo(table, columns, types, pk, sortable, filterable)
+
+
+def approximate_count(conn, table):
+    """Row count estimated from the rowid range: two index lookups instead of a COUNT(*) scan"""
+    low, high = conn.execute(f'SELECT MIN(rowid), MAX(rowid) FROM "{table}"').fetchone()
+    return 0 if high is None else high - low + 1
+
+
+def _coerce(value, column_type):
+    if "INT" in column_type:
+        return int(value)
+    if any(t in column_type for t in ("REAL", "FLOA", "DOUB")):
+        return float(value)
+    return value
+
+
+def _has_text_affinity(column_type):
+    return any(t in column_type for t in ("CHAR", "CLOB", "TEXT"))
+
+
+def _filter_sql(info, filters):
+    clauses, params = [], []
+    for column, op, value in filters:
+        if column not in info.filterable:
+            raise ValueError(f"{column!r} is not an indexed column of {info.name}")
+        if op not in FILTER_OPS:
+            raise ValueError(f"Unknown filter {op!r}")
+        if op == "starts with":
+            # Numbers always sort below text, so non-text columns are compared as their text form
+            target = f'"{column}"' if _has_text_affinity(info.types.get(column, "")) else f'CAST("{column}" AS TEXT)'
+            clauses.append(f"{target} >= ? AND {target} < ?")
+            params += [str(value), f"{value}{PREFIX_END}"]
+        else:
+            clauses.append(f'"{column}" {op} ?')
+            params.append(_coerce(value, info.types.get(column, "")))
+    return clauses, params
+
+
+def _select(conn, info, clauses, params, order, limit):
+    select_list = "rowid, *" if info.pk == "rowid" else "*"
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    sql = f'SELECT {select_list} FROM "{info.name}" {where} ORDER BY {order} LIMIT ?'
+    return conn.execute(sql, (*params, limit)).fetchall()
+
+
+def fetch_page(conn, table, order_by=None, descending=False, filters=(), cursor=None, page_size=PAGE_SIZE):
+    """Return (columns, rows, next_cursor) for the page after cursor (None = first page)
+
+    next_cursor is None on the last page. Cursors are plain tuples and can be
+    kept in session state to page forward, or stacked to page back.
+    """
+    info = describe(conn, table)
+    pk = info.pk
+    order_by = order_by or pk
+    if order_by not in info.sortable:
+        raise ValueError(f"{order_by!r} is not an indexed column of {table}")
+    clauses, params = _filter_sql(info, filters)
+    direction, op = ("DESC", "<") if descending else ("ASC", ">")
+
+    if order_by == pk:
+        keyset = [] if cursor is None else [f'"{pk}" {op} ?']
+        rows = _select(conn, info, clauses + keyset, params + ([] if cursor is None else [cursor[2]]),
+                       f'"{pk}" {direction}', page_size + 1)
+    else:
+        in_nulls = cursor is not None and cursor[0]
+        rows = []
+        if not in_nulls:
+            keyset = [f'"{order_by}" IS NOT NULL']
+            keyset_params = []
+            if cursor is not None:
+                keyset.append(f'("{order_by}", "{pk}") {op} (?, ?)')
+                keyset_params = [cursor[1], cursor[2]]
+            rows = _select(conn, info, clauses + keyset, params + keyset_params,
+                           f'"{order_by}" {direction}, "{pk}" {direction}', page_size + 1)
+        if len(rows) <= page_size:
+            keyset = [f'"{order_by}" IS NULL'] + ([f'"{pk}" {op} ?'] if in_nulls else [])
+            rows += _select(conn, info, clauses + keyset, params + ([cursor[2]] if in_nulls else []),
+                            f'"{pk}" {direction}', page_size + 1 - len(rows))
+
+    columns = info.columns
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        last = rows[-1]
+        value = last[columns.index(order_by)]
+        next_cursor = (value is None, value, last[columns.index(pk)])
+    return columns, rows, next_cursor
+
+
+def browse(table, order_by=None, descending=False, filters=(), cursor=None, page_size=PAGE_SIZE, db_path=None):
+    """fetch_page on a pooled connection, plus the approximate table size"""
+    with connection(db_path) as conn:
+        columns, rows, next_cursor = fetch_page(conn, table, order_by, descending, filters, cursor, page_size)
+        return columns, rows, next_cursor, approximate_count(conn, table)